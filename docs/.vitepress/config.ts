@@ -1,4 +1,33 @@
+import fs from 'node:fs'
+import path from 'node:path'
+import { fileURLToPath } from 'node:url'
 import { defineConfig } from 'vitepress'
+import generatedSidebar from './generated/sidebar.json'
+
+// 部署配置 - GitHub Pages 子路径
+const base = '/flutter_docs/'
+
+// 图片的 WebP / AVIF 响应式版本清单，由 scripts/image_assets/optimize_images.py 在构建前生成，
+// 键为原图相对 docs 的路径；没有生成时页面中的图片保持原样
+interface ImageSource { url: string; width: number; height: number }
+interface ImageEntry { width: number; height: number; sources: Record<string, ImageSource[]> }
+
+const imageManifestPath = fileURLToPath(new URL('../public/images/manifest.json', import.meta.url))
+const imageManifest: Record<string, ImageEntry> = fs.existsSync(imageManifestPath)
+  ? JSON.parse(fs.readFileSync(imageManifestPath, 'utf-8'))
+  : {}
+
+// AVIF 放在前面，浏览器使用第一个支持的格式
+const imageFormats = ['avif', 'webp']
+
+// 页面中的图片地址 → 清单中的键
+function imageKey(src: string, relativePath: string): string | undefined {
+  if (!src || /^[a-z]+:|^\/\//i.test(src)) return undefined
+  const clean = decodeURI(src.split(/[?#]/)[0])
+  return clean.startsWith('/')
+    ? path.posix.normalize(clean.slice(1))
+    : path.posix.join(path.posix.dirname(relativePath), clean)
+}
 
 // Flutter教程文档站点配置
 export default defineConfig({
@@ -8,7 +37,7 @@ export default defineConfig({
   lang: 'zh-CN',
   
   // 部署配置 - GitHub Pages 子路径
-  base: '/flutter_docs/',
+  base,
   
   // 忽略死链接（开发阶段）
   ignoreDeadLinks: true,
@@ -122,163 +151,8 @@ export default defineConfig({
         }
       ],
       
-      // Widget 大全
-      '/widgets/': [
-        {
-          text: 'Widget 概览',
-          items: [
-            { text: 'Widget 索引', link: '/widgets/' },
-          ]
-        },
-        {
-          text: '基础组件',
-          collapsed: false,
-          items: [
-            { text: 'Text 文本', link: '/widgets/basics/text' },
-            { text: 'Image 图片', link: '/widgets/basics/image' },
-            { text: 'Icon 图标', link: '/widgets/basics/icon' },
-            { text: 'Container 容器', link: '/widgets/basics/container' },
-            { text: 'Padding 内边距', link: '/widgets/basics/padding' },
-            { text: 'Center 居中', link: '/widgets/basics/center' },
-            { text: 'SizedBox 固定尺寸', link: '/widgets/basics/sizedbox' },
-            { text: 'Expanded 扩展', link: '/widgets/basics/expanded' },
-          ]
-        },
-        {
-          text: '布局组件',
-          collapsed: true,
-          items: [
-            { text: 'Row 行布局', link: '/widgets/layout/row' },
-            { text: 'Column 列布局', link: '/widgets/layout/column' },
-            { text: 'Stack 层叠', link: '/widgets/layout/stack' },
-            { text: 'Wrap 流式', link: '/widgets/layout/wrap' },
-            { text: 'LayoutBuilder', link: '/widgets/layout/layoutbuilder' },
-            { text: 'AspectRatio 宽高比', link: '/widgets/layout/aspectratio' },
-          ]
-        },
-        {
-          text: '滚动组件',
-          collapsed: true,
-          items: [
-            { text: 'ListView 列表', link: '/widgets/scrolling/listview' },
-            { text: 'GridView 网格', link: '/widgets/scrolling/gridview' },
-            { text: 'PageView 分页', link: '/widgets/scrolling/pageview' },
-            { text: 'CustomScrollView', link: '/widgets/scrolling/customscrollview' },
-            { text: 'RefreshIndicator', link: '/widgets/scrolling/refreshindicator' },
-            { text: 'NestedScrollView', link: '/widgets/scrolling/nestedscrollview' },
-            { text: 'SliverList/SliverGrid', link: '/widgets/scrolling/sliverlist' },
-          ]
-        },
-        {
-          text: 'Material 组件',
-          collapsed: true,
-          items: [
-            { text: 'Material 概览', link: '/widgets/material/' },
-            { text: 'Scaffold 脚手架', link: '/widgets/material/scaffold' },
-            { text: 'AppBar 应用栏', link: '/widgets/material/appbar' },
-            { text: 'SliverAppBar', link: '/widgets/material/sliverappbar' },
-            { text: 'BottomNavigationBar', link: '/widgets/material/bottomnavigationbar' },
-            { text: 'NavigationBar', link: '/widgets/material/navigationbar' },
-            { text: 'NavigationRail', link: '/widgets/material/navigationrail' },
-            { text: 'Drawer 抽屉', link: '/widgets/material/drawer' },
-            { text: 'TabBar 选项卡', link: '/widgets/material/tabbar' },
-            { text: 'Card 卡片', link: '/widgets/material/card' },
-            { text: 'Chip 芯片', link: '/widgets/material/chip' },
-            { text: 'ListTile 列表项', link: '/widgets/material/listtile' },
-            { text: 'Dialog 对话框', link: '/widgets/material/dialog' },
-            { text: 'BottomSheet 底部面板', link: '/widgets/material/bottomsheet' },
-            { text: 'SnackBar 消息条', link: '/widgets/material/snackbar' },
-            { text: 'ElevatedButton', link: '/widgets/material/elevatedbutton' },
-            { text: 'TextField 输入框', link: '/widgets/material/textfield' },
-          ]
-        },
-        {
-          text: '按钮组件',
-          collapsed: true,
-          items: [
-            { text: 'ElevatedButton', link: '/widgets/buttons/elevatedbutton' },
-            { text: 'FilledButton', link: '/widgets/buttons/filledbutton' },
-            { text: 'OutlinedButton', link: '/widgets/buttons/outlinedbutton' },
-            { text: 'TextButton', link: '/widgets/buttons/textbutton' },
-            { text: 'IconButton', link: '/widgets/buttons/iconbutton' },
-            { text: 'FloatingActionButton', link: '/widgets/buttons/floatingactionbutton' },
-          ]
-        },
-        {
-          text: '输入组件',
-          collapsed: true,
-          items: [
-            { text: 'TextField 输入框', link: '/widgets/input/textfield' },
-            { text: 'Checkbox 复选框', link: '/widgets/input/checkbox' },
-            { text: 'Radio 单选框', link: '/widgets/input/radio' },
-            { text: 'Switch 开关', link: '/widgets/input/switch' },
-            { text: 'Slider 滑块', link: '/widgets/input/slider' },
-          ]
-        },
-        {
-          text: '动画组件',
-          collapsed: true,
-          items: [
-            { text: '动画概览', link: '/widgets/animation/' },
-            { text: 'AnimatedContainer', link: '/widgets/animation/animatedcontainer' },
-            { text: 'AnimatedOpacity', link: '/widgets/animation/animatedopacity' },
-            { text: 'AnimatedPadding', link: '/widgets/animation/animatedpadding' },
-            { text: 'AnimatedDefaultTextStyle', link: '/widgets/animation/animateddefaulttextstyle' },
-            { text: 'AnimatedCrossFade', link: '/widgets/animation/animatedcrossfade' },
-            { text: 'AnimatedSwitcher', link: '/widgets/animation/animatedswitcher' },
-            { text: 'AnimatedPositioned', link: '/widgets/animation/animatedpositioned' },
-            { text: 'AnimatedPhysicalModel', link: '/widgets/animation/animatedphysicalmodel' },
-            { text: 'AnimatedList', link: '/widgets/animation/animatedlist' },
-            { text: 'AnimatedIcon', link: '/widgets/animation/animatedicon' },
-            { text: 'AnimatedBuilder', link: '/widgets/animation/animatedbuilder' },
-            { text: 'TweenAnimationBuilder', link: '/widgets/animation/tweenanimationbuilder' },
-            { text: 'AnimatedFractionallySizedBox', link: '/widgets/animation/animatedfractionallysizedbox' },
-            { text: 'AnimatedModalBarrier', link: '/widgets/animation/animatedmodalbarrier' },
-            { text: 'AnimatedSlide', link: '/widgets/animation/animatedslide' },
-            { text: 'AnimatedRotation', link: '/widgets/animation/animatedrotation' },
-            { text: 'Hero', link: '/widgets/animation/hero' },
-            { text: 'FadeTransition', link: '/widgets/animation/fadetransition' },
-            { text: 'SlideTransition', link: '/widgets/animation/slidetransition' },
-            { text: 'ScaleTransition', link: '/widgets/animation/scaletransition' },
-            { text: 'RotationTransition', link: '/widgets/animation/rotationtransition' },
-          ]
-        },
-        {
-          text: '手势组件',
-          collapsed: true,
-          items: [
-            { text: 'GestureDetector', link: '/widgets/gesture/gesturedetector' },
-            { text: 'InkWell', link: '/widgets/gesture/inkwell' },
-            { text: 'Draggable', link: '/widgets/gesture/draggable' },
-            { text: 'Dismissible', link: '/widgets/gesture/dismissible' },
-          ]
-        },
-        {
-          text: 'Cupertino 组件',
-          collapsed: true,
-          items: [
-            { text: 'Cupertino 概览', link: '/widgets/cupertino/' },
-            { text: 'CupertinoApp', link: '/widgets/cupertino/cupertinoapp' },
-            { text: 'CupertinoNavigationBar', link: '/widgets/cupertino/cupertinonavigationbar' },
-            { text: 'CupertinoTabBar', link: '/widgets/cupertino/cupertinotabbar' },
-            { text: 'CupertinoButton', link: '/widgets/cupertino/cupertinobutton' },
-            { text: 'CupertinoTextField', link: '/widgets/cupertino/cupertinotextfield' },
-            { text: 'CupertinoSwitch', link: '/widgets/cupertino/cupertinoswitch' },
-            { text: 'CupertinoSlider', link: '/widgets/cupertino/cupertinoslider' },
-            { text: 'CupertinoPicker', link: '/widgets/cupertino/cupertinopicker' },
-            { text: 'CupertinoDatePicker', link: '/widgets/cupertino/cupertinodatepicker' },
-            { text: 'CupertinoActionSheet', link: '/widgets/cupertino/cupertinoactionsheet' },
-            { text: 'CupertinoAlertDialog', link: '/widgets/cupertino/cupertinoalertdialog' },
-          ]
-        },
-        {
-          text: '裁剪组件',
-          collapsed: true,
-          items: [
-            { text: 'Clip 系列', link: '/widgets/clip/' },
-          ]
-        },
-      ],
+      // Widget 大全（由 scripts/docs_graph/build_graph.py 按目录结构生成）
+      '/widgets/': generatedSidebar['/widgets/'],
       
       // Web3 全栈开发
       '/web3/': [
@@ -610,30 +484,8 @@ export default defineConfig({
       copyright: 'Copyright © 2024-present Flutter 从零到一'
     },
     
-    // 搜索
-    search: {
-      provider: 'local',
-      options: {
-        locales: {
-          root: {
-            translations: {
-              button: {
-                buttonText: '搜索文档',
-                buttonAriaLabel: '搜索文档'
-              },
-              modal: {
-                noResultsText: '无法找到相关结果',
-                resetButtonTitle: '清除查询条件',
-                footer: {
-                  selectText: '选择',
-                  navigateText: '切换'
-                }
-              }
-            }
-          }
-        }
-      }
-    },
+    // 搜索：不使用内置的本地搜索，导航栏的 IndexSearch 组件（theme/index.ts）按需加载
+    // scripts/search_index 生成的分片索引
     
     // 文章大纲
     outline: {
@@ -669,6 +521,28 @@ export default defineConfig({
     theme: {
       light: 'github-light',
       dark: 'github-dark'
+    },
+    // 清单中有的图片渲染为 <picture>，按格式和宽度提供 srcset，原图作为回退
+    config: (md) => {
+      const renderImage = md.renderer.rules.image!
+      md.renderer.rules.image = (tokens, idx, options, env, self) => {
+        const token = tokens[idx]
+        const entry = imageManifest[imageKey(token.attrGet('src') || '', env.relativePath || '') || '']
+        if (!entry) return renderImage(tokens, idx, options, env, self)
+
+        token.attrSet('width', String(entry.width))
+        token.attrSet('height', String(entry.height))
+        token.attrSet('loading', 'lazy')
+        const sources = imageFormats
+          .filter((format) => entry.sources[format]?.length)
+          .map((format) => {
+            const srcset = entry.sources[format]
+              .map((source) => `${base.replace(/\/$/, '')}${source.url} ${source.width}w`)
+              .join(', ')
+            return `<source type="image/${format}" srcset="${srcset}" sizes="(min-width: 960px) 688px, 100vw">`
+          })
+        return `<picture>${sources.join('')}${renderImage(tokens, idx, options, env, self)}</picture>`
+      }
     }
   },
   
@@ -9,12 +9,17 @@ import DartPad from '../components/DartPad.vue'
 import FlutterPreview from '../components/FlutterPreview.vue'
 import WidgetCard from '../components/WidgetCard.vue'
 import FeatureCard from '../components/FeatureCard.vue'
+import Backlinks from '../components/Backlinks.vue'
+import IndexSearch from '../components/IndexSearch.vue'
 
 export default {
   extends: DefaultTheme,
   Layout: () => {
     return h(DefaultTheme.Layout, null, {
-      // 可以在这里添加自定义插槽
+      // 导航栏搜索框，读取 scripts/search_index 生成的分片索引（docs/public/search-index）
+      'nav-bar-content-before': () => h(IndexSearch),
+      // Widget 页面底部列出引用本页的页面（docs/.vitepress/generated/backlinks.json）
+      'doc-after': () => h(Backlinks)
     })
   },
   enhanceApp({ app, router, siteData }) {
@@ -0,0 +1,5 @@
+"""
+爬虫性能基准 - 在录制的数据上测量解析、清理、生成和端到端抓取的耗时，与 JSON 基线对比
+
+详见 suite.py。
+"""
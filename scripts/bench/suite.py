@@ -0,0 +1,390 @@
+"""
+爬虫性能基准
+
+在 standin/fixtures 和 widget_crawler/fixtures 中的录制数据上测量：
+
+    parse.{后端}            parse_widget_page 解析 api.flutter.dev 类页面（每个页面）
+    clean_html.releases     clean_html 清理大段 Release 说明（每段约 200 KB）
+    generate_markdown       generate_markdown 生成 N 条新闻的页面并写入新文件（每个页面，默认 1000 条）
+    e2e.news                news_crawler.py 对本地替身服务的完整抓取（每次运行）
+    e2e.widgets             widget_crawler/crawler.py 对本地替身服务的完整抓取（每次运行）
+
+每个用例重复运行多次，取单次操作耗时的最小值与基线比较（最小值受机器上其他负载的
+干扰最小），超过阈值（默认慢 20%，端到端用例 30%）视为退化，此时退出码为 1，可以直接用于 CI。
+
+基线按机器保存，不同机器上的结果不可比较。
+
+用法（在 scripts 目录下执行）：
+    # 第一次运行，保存基线
+    python -m bench.suite --save
+    # 与基线比较
+    python -m bench.suite
+    # 只运行部分用例（前缀匹配），调整阈值
+    python -m bench.suite --cases parse,clean_html --threshold 0.1 --threshold parse.lxml=0.05
+    # 端到端用例的模拟延迟
+    python -m bench.suite --cases e2e --latency lognormal:80,0.5
+"""
+
+import atexit
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_RESULTS_PATH = CACHE_DIR / "bench" / "latest.json"
+
+# 单次操作耗时的最小值比基线慢多少视为退化
+DEFAULT_THRESHOLD = 0.2
+E2E_THRESHOLD = 0.3
+
+# generate_markdown 用例的新闻条数
+DEFAULT_MARKDOWN_ITEMS = 1000
+
+# 端到端用例中替身服务每个响应的延迟
+DEFAULT_E2E_LATENCY = "fixed:50"
+
+# clean_html 用例中每段 Release 说明的大小
+RELEASE_BODY_BYTES = 200_000
+
+
+@dataclass
+class Case:
+    """一个基准用例：run() 执行一轮并返回本轮完成的操作数"""
+    name: str
+    unit: str
+    run: Callable[[], int]
+    repeat: int = 5
+    threshold: float = DEFAULT_THRESHOLD
+
+
+def _import_crawler_modules():
+    """导入两个爬虫的模块（它们按各自目录导入同级模块）"""
+    for directory in ("news_crawler", "widget_crawler"):
+        path = str(SCRIPTS_DIR / directory)
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def widget_pages() -> List[tuple]:
+    """用于解析测速的类页面：(类名, 库名, URL, 页面内容)
+
+    与替身服务相同，由 Container 页面替换类名得到每个类的页面。
+    """
+    from standin.server import Fixtures
+    fixtures = Fixtures()
+    pages = []
+    for class_name, library in sorted(fixtures.classes.items()):
+        url = f"https://api.flutter.dev/flutter/{library}/{class_name}-class.html"
+        pages.append((class_name, library, url, fixtures.page(library, class_name).encode("utf-8")))
+    return pages
+
+
+def release_bodies(count: int = 20) -> List[str]:
+    """模拟大版本的 Release 说明：录制的说明加上大量 PR 条目，每段约 RELEASE_BODY_BYTES"""
+    fixtures = json.loads((SCRIPTS_DIR / "standin" / "fixtures" / "github_releases.json").read_text(encoding="utf-8"))
+    intro = "\n".join(release["body"] for release in fixtures)
+    bodies = []
+    for i in range(count):
+        parts = [intro, "<h2>Changes &amp; fixes</h2><ul>"]
+        size = len(intro)
+        pr = 150000 + i * 10000
+        while size < RELEASE_BODY_BYTES:
+            line = (
+                f'<li><a href="https://github.com/flutter/flutter/pull/{pr}">#{pr}</a> '
+                f'[engine] Fix &quot;RenderFlex overflowed&quot; when resizing &lt;Row&gt; '
+                f'on Android &amp; iOS by <a href="https://github.com/dev{pr % 97}">@dev{pr % 97}</a></li>\n'
+            )
+            parts.append(line)
+            size += len(line)
+            pr += 1
+        parts.append("</ul>")
+        bodies.append("".join(parts))
+    return bodies
+
+
+def news_items(count: int) -> list:
+    """generate_markdown 用例的新闻条目，三个分类各占约三分之一"""
+    from news_crawler import NewsItem
+    today = datetime.now()
+    items = []
+    for i in range(count):
+        category = ("blog", "release", "package")[i % 3]
+        date = (today - timedelta(days=i % 6)).strftime("%Y-%m-%d")
+        items.append(NewsItem(
+            title=f"【译】Flutter news item {i}",
+            url=f"https://example.com/news/{i}",
+            date=date,
+            source={"blog": "Flutter Blog", "release": "GitHub Releases", "package": "pub.dev"}[category],
+            summary="Flutter 3.x brings new rendering improvements and tooling updates. " * 3,
+            category=category,
+            guid=f"item-{i}",
+        ))
+    return items
+
+
+def parse_cases() -> List[Case]:
+    _import_crawler_modules()
+    from crawler import parse_widget_page
+    from parsers import PARSERS
+
+    pages = widget_pages()
+    cases = []
+    for backend in PARSERS:
+        def run(backend=backend) -> int:
+            for class_name, library, url, content in pages:
+                parse_widget_page(class_name, library, url, content, parser=backend)
+            return len(pages)
+        cases.append(Case(f"parse.{backend}", "page", run))
+    return cases
+
+
+def clean_html_cases() -> List[Case]:
+    _import_crawler_modules()
+    from news_crawler import clean_html
+
+    bodies = release_bodies()
+
+    def run() -> int:
+        for body in bodies:
+            clean_html(body)
+        return len(bodies)
+
+    return [Case("clean_html.releases", "body", run)]
+
+
+def markdown_cases(items: int) -> List[Case]:
+    _import_crawler_modules()
+    from news_crawler import generate_markdown
+
+    template = news_items(items)
+    output_dir = tempfile.mkdtemp(prefix="bench-markdown-")
+    atexit.register(shutil.rmtree, output_dir, ignore_errors=True)
+    rounds = itertools.count()
+
+    def run() -> int:
+        # OutputWriter 在内容没有变化时跳过写入，每轮写到新的文件，测量的是渲染加写入的完整过程
+        output_path = os.path.join(output_dir, f"news-{next(rounds)}.md")
+        # generate_markdown 会原地排序，每轮使用新的列表
+        with redirect_stdout(io.StringIO()):
+            generate_markdown(list(template), output_path)
+        return 1
+
+    return [Case("generate_markdown", "page", run)]
+
+
+def e2e_cases(latency: str) -> List[Case]:
+    from standin.server import Fixtures, Latency, SERVICES, ServiceProfile, StandinState, create_server
+
+    def crawl(command: List[str]) -> Callable[[], int]:
+        def run() -> int:
+            # 固定随机种子，使每次运行的延迟序列相同
+            random.seed(0)
+            profiles = {service: ServiceProfile(latency=Latency.parse(latency)) for service in SERVICES}
+            server = create_server("127.0.0.1", 0, StandinState(Fixtures(), profiles))
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                with tempfile.TemporaryDirectory(prefix="bench-e2e-") as work_dir:
+                    env = {
+                        **os.environ,
+                        "CRAWLER_STANDIN": f"http://127.0.0.1:{server.server_address[1]}",
+                        # 每次都从空缓存开始
+                        "CRAWLER_CACHE_DIR": os.path.join(work_dir, "cache"),
+                    }
+                    args = [arg.format(work_dir=work_dir) for arg in command]
+                    result = subprocess.run(
+                        [sys.executable, *args], cwd=SCRIPTS_DIR, env=env,
+                        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+                    )
+                    if result.returncode != 0:
+                        raise RuntimeError(f"{' '.join(args)} 退出码 {result.returncode}\n{result.stderr}")
+            finally:
+                server.shutdown()
+                server.server_close()
+            return 1
+        return run
+
+    news = crawl([
+        "news_crawler/news_crawler.py", "-o", "{work_dir}/news.md", "-j", "{work_dir}/news.json",
+        "--metrics-dir", "{work_dir}/metrics",
+    ])
+    widgets = crawl([
+        "widget_crawler/crawler.py", "-o", "{work_dir}/widgets", "--metrics-dir", "{work_dir}/metrics",
+    ])
+    return [
+        Case("e2e.news", "run", news, repeat=1, threshold=E2E_THRESHOLD),
+        Case("e2e.widgets", "run", widgets, repeat=1, threshold=E2E_THRESHOLD),
+    ]
+
+
+def build_cases(markdown_items: int = DEFAULT_MARKDOWN_ITEMS, latency: str = DEFAULT_E2E_LATENCY) -> List[Case]:
+    return [
+        *parse_cases(),
+        *clean_html_cases(),
+        *markdown_cases(markdown_items),
+        *e2e_cases(latency),
+    ]
+
+
+def measure(case: Case, repeat: Optional[int] = None) -> Dict:
+    """运行用例，返回单次操作耗时的中位数和最小值"""
+    per_op = []
+    ops = 0
+    for _ in range(repeat or case.repeat):
+        start = time.perf_counter()
+        ops = case.run()
+        per_op.append((time.perf_counter() - start) / ops)
+    return {
+        "unit": case.unit,
+        "ops": ops,
+        "runs": len(per_op),
+        "median_seconds": statistics.median(per_op),
+        "min_seconds": min(per_op),
+        "ops_per_second": 1 / statistics.median(per_op),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], thresholds: Dict[str, float]) -> List[str]:
+    """逐个用例与基线比较并输出，返回退化的用例名称"""
+    regressions = []
+    # 表头中每个汉字占两列
+    print(f"\n{'用例':<20}{'基线':>10}{'本次':>10}{'变化':>8}  阈值")
+    for name, result in results.items():
+        current = result["min_seconds"]
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<22}{'-':>12}{format_seconds(current):>12}{'':>10}  🆕")
+            continue
+        change = current / base["min_seconds"] - 1
+        threshold = thresholds[name]
+        if change > threshold:
+            regressions.append(name)
+            mark = "❌ 退化"
+        elif change < -threshold:
+            mark = "🚀 提升"
+        else:
+            mark = "✅"
+        print(
+            f"{name:<22}{format_seconds(base['min_seconds']):>12}{format_seconds(current):>12}"
+            f"{change:>+10.1%}  {threshold:.0%} {mark}"
+        )
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}µs"
+
+
+def parse_thresholds(specs: List[str], cases: List[Case]) -> Dict[str, float]:
+    """--threshold 0.1 设置全部用例，--threshold 用例名=0.1 只设置单个用例"""
+    thresholds = {case.name: case.threshold for case in cases}
+    for spec in specs:
+        name, sep, value = spec.rpartition("=")
+        if not sep:
+            thresholds = {case: float(value) for case in thresholds}
+        elif name not in thresholds:
+            raise ValueError(f"未知用例: {name}")
+        else:
+            thresholds[name] = float(value)
+    return thresholds
+
+
+def write_json(path: Path, data: Dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="爬虫性能基准")
+    parser.add_argument("--cases", help="只运行名称以这些前缀开头的用例，逗号分隔")
+    parser.add_argument("--repeat", type=int, help="每个用例的运行次数（默认微基准 5 次，端到端 1 次）")
+    parser.add_argument("--items", type=int, default=DEFAULT_MARKDOWN_ITEMS, help="generate_markdown 的新闻条数")
+    parser.add_argument("--latency", default=DEFAULT_E2E_LATENCY, help="端到端用例的替身服务延迟分布")
+    parser.add_argument("--threshold", action="append", default=[], metavar="[用例=]比例", help="退化阈值")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE_PATH), help="基线文件")
+    parser.add_argument("--save", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--output", default=str(DEFAULT_RESULTS_PATH), help="本次结果的输出文件")
+    args = parser.parse_args()
+
+    cases = build_cases(args.items, args.latency)
+    if args.cases:
+        prefixes = tuple(prefix.strip() for prefix in args.cases.split(","))
+        cases = [case for case in cases if case.name.startswith(prefixes)]
+    try:
+        thresholds = parse_thresholds(args.threshold, cases)
+    except ValueError as e:
+        parser.error(str(e))
+
+    results = {}
+    for case in cases:
+        print(f"运行 {case.name} ...", flush=True)
+        results[case.name] = measure(case, args.repeat)
+        result = results[case.name]
+        print(
+            f"  中位数 {format_seconds(result['median_seconds'])}/{case.unit}"
+            f"  最小 {format_seconds(result['min_seconds'])}/{case.unit}"
+            f"  ({result['ops_per_second']:.1f} {case.unit}/s)"
+        )
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": platform.node(),
+        "python": platform.python_version(),
+        "cases": results,
+    }
+    write_json(Path(args.output), report)
+
+    baseline_path = Path(args.baseline)
+    regressions = []
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("machine") != report["machine"]:
+            print(f"\n⚠️ 基线来自另一台机器 ({baseline.get('machine')})，结果仅供参考")
+        regressions = compare(results, baseline.get("cases", {}), thresholds)
+    elif not args.save:
+        print(f"\n没有基线文件 {baseline_path}，使用 --save 保存本次结果作为基线")
+
+    if args.save:
+        # 只运行了部分用例时保留基线中其他用例的结果
+        saved = {}
+        if baseline_path.exists():
+            with open(baseline_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f).get("cases", {})
+        write_json(baseline_path, {**report, "cases": {**saved, **results}})
+        print(f"\n✅ 基线已保存: {baseline_path}")
+    elif regressions:
+        print(f"\n❌ {len(regressions)} 个用例退化: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
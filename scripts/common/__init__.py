@@ -0,0 +1,14 @@
+"""
+scripts 目录下各爬虫共用的模块
+"""
+
+import os
+from pathlib import Path
+
+# 本地缓存目录：默认为 scripts/.cache（已加入 .gitignore），可用环境变量 CRAWLER_CACHE_DIR 指定；
+# 使用本地替身服务（CRAWLER_STANDIN）时改用 scripts/.cache/standin，不与真实数据的缓存混在一起
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+if os.getenv("CRAWLER_CACHE_DIR"):
+    CACHE_DIR = Path(os.environ["CRAWLER_CACHE_DIR"])
+elif os.getenv("CRAWLER_STANDIN"):
+    CACHE_DIR = CACHE_DIR / "standin"
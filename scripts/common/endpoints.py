@@ -0,0 +1,53 @@
+"""
+外部服务地址 - 两个爬虫请求的所有站点集中在这里，便于切换到本地替身服务
+
+每个地址按以下顺序确定：
+1. 同名环境变量，例如 PUB_DEV_API=http://127.0.0.1:8080/api/packages
+2. 环境变量 CRAWLER_STANDIN 指定的本地替身服务（见 scripts/standin），
+   例如 CRAWLER_STANDIN=http://127.0.0.1:8080 时全部地址指向该服务
+3. 线上默认地址
+
+设置了 CRAWLER_STANDIN 时缓存目录也切换到 scripts/.cache/standin（见 common.CACHE_DIR），
+替身服务返回的数据和假翻译不会混入真实缓存。
+
+也可以用 python -m standin.server run -- <爬虫命令> 启动替身服务并运行爬虫，
+它会自动设置 CRAWLER_STANDIN。
+"""
+
+import os
+from typing import Dict, Optional
+
+DEFAULT_ENDPOINTS: Dict[str, str] = {
+    "FLUTTER_BLOG_RSS": "https://medium.com/feed/flutter",
+    "FLUTTER_RELEASES_API": "https://api.github.com/repos/flutter/flutter/releases",
+    "PUB_DEV_API": "https://pub.dev/api/packages",
+    "PUB_SEARCH_API": "https://pub.dev/api/search",
+    "FLUTTER_API_BASE": "https://api.flutter.dev/flutter",
+    "DEEPSEEK_API_URL": "https://yunwu.ai/v1/chat/completions",
+}
+
+# 替身服务上对应的路径（与线上服务的路径保持一致）
+STANDIN_PATHS: Dict[str, str] = {
+    "FLUTTER_BLOG_RSS": "/feed/flutter",
+    "FLUTTER_RELEASES_API": "/repos/flutter/flutter/releases",
+    "PUB_DEV_API": "/api/packages",
+    "PUB_SEARCH_API": "/api/search",
+    "FLUTTER_API_BASE": "/flutter",
+    "DEEPSEEK_API_URL": "/v1/chat/completions",
+}
+
+
+def endpoint(name: str, standin: Optional[str] = None) -> str:
+    """获取地址；standin 为替身服务根地址，未指定时读取 CRAWLER_STANDIN"""
+    override = os.getenv(name)
+    if override:
+        return override
+    standin = standin or os.getenv("CRAWLER_STANDIN")
+    if standin:
+        return standin.rstrip("/") + STANDIN_PATHS[name]
+    return DEFAULT_ENDPOINTS[name]
+
+
+def resolve_endpoints(standin: Optional[str] = None) -> Dict[str, str]:
+    """全部地址"""
+    return {name: endpoint(name, standin) for name in DEFAULT_ENDPOINTS}
@@ -0,0 +1,96 @@
+"""
+HTTP 校验器存储 - 保存每个 URL 的 ETag / Last-Modified 以及上次解析结果
+
+再次请求同一 URL 时附带 If-None-Match / If-Modified-Since 请求头，
+服务器返回 304 Not Modified 时直接复用保存的解析结果，省去下载和解析。
+
+存储文件：scripts/.cache/http_validators.json
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from common import CACHE_DIR
+
+DEFAULT_STORE_PATH = CACHE_DIR / "http_validators.json"
+
+
+class ValidatorStore:
+    """按 URL 保存 HTTP 校验器和解析结果"""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict] = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"读取 HTTP 校验器失败，将重新请求: {e}")
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """返回条件请求头；没有保存过解析结果时返回空字典"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry or "payload" not in entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Any:
+        """读取保存的解析结果（收到 304 时调用）"""
+        with self._lock:
+            self.not_modified += 1
+            return self._entries[url]["payload"]
+
+    def save(self, url: str, headers: Mapping[str, str], payload: Any):
+        """保存响应头中的校验器和解析结果；响应没有校验器时不保存"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        with self._lock:
+            if not etag and not last_modified:
+                self._dirty = self._entries.pop(url, None) is not None or self._dirty
+                return
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "payload": payload,
+                "updated_at": time.time(),
+            }
+            self._dirty = True
+
+    def flush(self):
+        """写回磁盘（先写临时文件再替换，避免中断时损坏）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+_store: Optional[ValidatorStore] = None
+_store_lock = threading.Lock()
+
+
+def get_validator_store() -> ValidatorStore:
+    """获取进程内共享的校验器存储"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ValidatorStore()
+        return _store
@@ -0,0 +1,251 @@
+"""
+运行指标 - 记录每次下载、解析、翻译和写入的耗时、流量、状态码、重试次数和 token 用量
+
+common.transport 发出的每个请求会自动记录（阶段默认为 fetch，翻译接口为 translate），
+解析和写入步骤用 timed() 包裹：
+
+    from common.metrics import get_metrics
+
+    with get_metrics().timed("parse", "medium.com"):
+        ...
+
+运行结束时调用 export() 写出两个文件：
+- {name}.json：按 阶段 / 主机 汇总的次数、失败数、耗时 p50 / p95 / 最大值、字节数、重试次数、token 数
+- {name}.prom：Prometheus textfile 格式，可由 node_exporter 的 textfile collector 读取
+
+默认目录为 scripts/.cache/metrics。
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from common import CACHE_DIR
+
+DEFAULT_METRICS_DIR = CACHE_DIR / "metrics"
+
+# 没有对应主机的步骤（写入文件等）
+LOCAL_HOST = "local"
+
+QUANTILES = (0.5, 0.95)
+
+
+@dataclass
+class Call:
+    """一次调用的记录，timed() 中可以补充字节数、状态码等信息"""
+    bytes: int = 0
+    status: Optional[int] = None
+    retries: int = 0
+    ok: bool = True
+
+
+@dataclass
+class StageStats:
+    """同一 阶段 / 主机 下所有调用的累计值"""
+    durations: List[float] = field(default_factory=list)
+    errors: int = 0
+    bytes: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数：中文每字约 1 个 token，其他字符约 4 个一个 token"""
+    chinese_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
+    return chinese_chars + (len(text) - chinese_chars + 3) // 4
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法计算分位数，values 为空时返回 0"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, math.ceil(q * len(ordered)) - 1)
+    return ordered[index]
+
+
+class Metrics:
+    """进程内的指标收集器，线程安全"""
+
+    def __init__(self, name: str = "crawler"):
+        self.name = name
+        self.started_at = time.time()
+        self._stages: Dict[Tuple[str, str], StageStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, stage: str, host: str) -> StageStats:
+        key = (stage, host or LOCAL_HOST)
+        if key not in self._stages:
+            self._stages[key] = StageStats()
+        return self._stages[key]
+
+    def record(self, stage: str, host: str, seconds: float, call: Optional[Call] = None):
+        """记录一次调用"""
+        call = call or Call()
+        with self._lock:
+            stats = self._stats(stage, host)
+            stats.durations.append(seconds)
+            stats.bytes += call.bytes
+            stats.retries += call.retries
+            if not call.ok:
+                stats.errors += 1
+            if call.status is not None:
+                stats.statuses[call.status] += 1
+
+    def record_tokens(self, stage: str, host: str, prompt_tokens: int, completion_tokens: int):
+        """记录翻译接口返回的 token 用量（计入对应阶段，不增加调用次数）"""
+        with self._lock:
+            stats = self._stats(stage, host)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+
+    def record_usage(
+        self, stage: str, host: str, usage: Optional[Dict], prompt: str, completion: str
+    ) -> Tuple[int, int]:
+        """记录接口响应中的 usage，缺少某一项时按 prompt / completion 的文本估算
+
+        返回记录的 (prompt_tokens, completion_tokens)。prompt 应包含系统提示词。
+        """
+        usage = usage or {}
+        prompt_tokens = usage.get("prompt_tokens", estimate_tokens(prompt))
+        completion_tokens = usage.get("completion_tokens", estimate_tokens(completion))
+        self.record_tokens(stage, host, prompt_tokens, completion_tokens)
+        return prompt_tokens, completion_tokens
+
+    @contextmanager
+    def timed(self, stage: str, host: str = LOCAL_HOST) -> Iterator[Call]:
+        """计时一个步骤；步骤抛出异常时记为失败并继续抛出"""
+        call = Call()
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException:
+            call.ok = False
+            raise
+        finally:
+            self.record(stage, host, time.perf_counter() - start, call)
+
+    def summary(self) -> Dict:
+        """按 阶段 / 主机 汇总"""
+        with self._lock:
+            items = sorted(self._stages.items())
+        stages = []
+        for (stage, host), stats in items:
+            stages.append({
+                "stage": stage,
+                "host": host,
+                "count": len(stats.durations),
+                "errors": stats.errors,
+                "total_seconds": round(sum(stats.durations), 6),
+                "p50_seconds": round(percentile(stats.durations, 0.5), 6),
+                "p95_seconds": round(percentile(stats.durations, 0.95), 6),
+                "max_seconds": round(max(stats.durations, default=0.0), 6),
+                "bytes": stats.bytes,
+                "retries": stats.retries,
+                "prompt_tokens": stats.prompt_tokens,
+                "completion_tokens": stats.completion_tokens,
+                "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+            })
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.time() - self.started_at, 6),
+            "stages": stages,
+        }
+
+    def prometheus(self) -> str:
+        """Prometheus textfile 格式的指标"""
+        summary = self.summary()
+        crawler = summary["name"]
+        lines = [
+            "# HELP crawler_stage_duration_seconds Duration of crawler steps.",
+            "# TYPE crawler_stage_duration_seconds summary",
+        ]
+        for entry in summary["stages"]:
+            labels = f'crawler="{crawler}",stage="{entry["stage"]}",host="{entry["host"]}"'
+            for q in QUANTILES:
+                value = entry["p50_seconds"] if q == 0.5 else entry["p95_seconds"]
+                lines.append(f'crawler_stage_duration_seconds{{{labels},quantile="{q}"}} {value}')
+            lines.append(f'crawler_stage_duration_seconds_sum{{{labels}}} {entry["total_seconds"]}')
+            lines.append(f'crawler_stage_duration_seconds_count{{{labels}}} {entry["count"]}')
+
+        counters = [
+            ("crawler_stage_errors_total", "Failed crawler steps.", "errors"),
+            ("crawler_bytes_total", "Bytes received.", "bytes"),
+            ("crawler_retries_total", "HTTP retries.", "retries"),
+            ("crawler_prompt_tokens_total", "LLM prompt tokens.", "prompt_tokens"),
+            ("crawler_completion_tokens_total", "LLM completion tokens.", "completion_tokens"),
+        ]
+        for metric, help_text, key in counters:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for entry in summary["stages"]:
+                labels = f'crawler="{crawler}",stage="{entry["stage"]}",host="{entry["host"]}"'
+                lines.append(f"{metric}{{{labels}}} {entry[key]}")
+
+        lines.append("# HELP crawler_http_responses_total HTTP responses by status code.")
+        lines.append("# TYPE crawler_http_responses_total counter")
+        for entry in summary["stages"]:
+            for status, count in entry["statuses"].items():
+                lines.append(
+                    f'crawler_http_responses_total{{crawler="{crawler}",stage="{entry["stage"]}",'
+                    f'host="{entry["host"]}",status="{status}"}} {count}'
+                )
+
+        lines.append("# HELP crawler_wall_seconds Wall time of the whole run.")
+        lines.append("# TYPE crawler_wall_seconds gauge")
+        lines.append(f'crawler_wall_seconds{{crawler="{crawler}"}} {summary["wall_seconds"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: Path = DEFAULT_METRICS_DIR) -> Tuple[Path, Path]:
+        """写出 JSON 汇总和 Prometheus textfile，返回两个文件的路径"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        json_path = directory / f"{self.name}.json"
+        prom_path = directory / f"{self.name}.prom"
+        # textfile collector 可能随时读取，先写临时文件再替换
+        for path, content in (
+            (json_path, json.dumps(self.summary(), ensure_ascii=False, indent=2)),
+            (prom_path, self.prometheus()),
+        ):
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        return json_path, prom_path
+
+    def report(self):
+        """输出各阶段的耗时汇总"""
+        summary = self.summary()
+        if not summary["stages"]:
+            return
+        print(f"\n耗时统计（总计 {summary['wall_seconds']:.1f} 秒）:")
+        for entry in summary["stages"]:
+            print(
+                f"  {entry['stage']:<10} {entry['host']:<24} {entry['count']:>5} 次"
+                f"  失败 {entry['errors']}  p50 {entry['p50_seconds']:.3f}s"
+                f"  p95 {entry['p95_seconds']:.3f}s  合计 {entry['total_seconds']:.2f}s"
+                f"  重试 {entry['retries']}"
+            )
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """获取进程内共享的指标收集器"""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
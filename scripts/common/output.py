@@ -0,0 +1,117 @@
+"""
+输出文件写入 - 内容没有变化时不改写文件
+
+爬虫每次运行都会重新生成 docs/ 下的页面。内容没变时如果照样写入，文件修改时间、
+页面中的"最后更新"时间戳都会变化，定时任务每次都会产生提交并触发整站重新部署。
+
+OutputWriter 写入前先读取已有文件，去掉易变字段（时间戳等）后比较两者的哈希：
+- 相同：保留原文件（包括其中旧的时间戳），不写入
+- 不同：先写临时文件再替换，读取方不会看到写了一半的文件
+
+    from common.output import get_output_writer
+
+    writer = get_output_writer()
+    writer.write_text(path, markdown, volatile=[re.compile(r"^> 最后更新: .*$", re.M)])
+    writer.write_json(path, data, volatile=[UPDATED_AT_FIELD])
+    writer.report()
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Union
+
+# json.dumps(..., indent=2) 输出的顶层 "updated_at" 字段
+UPDATED_AT_FIELD = re.compile(r'^  "updated_at": ".*?",?$', re.M)
+
+
+def content_hash(content: Union[str, bytes], volatile: Iterable[Pattern] = ()) -> str:
+    """去掉易变字段后内容的 SHA-256"""
+    if isinstance(content, bytes):
+        return hashlib.sha256(content).hexdigest()
+    for pattern in volatile:
+        content = pattern.sub("", content)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class OutputWriter:
+    """只在内容变化时写入文件，并统计有变化和未变化的文件数，线程安全"""
+
+    def __init__(self):
+        self.changed: List[Path] = []
+        self.unchanged = 0
+        self._lock = threading.Lock()
+
+    def write_text(self, path: Union[str, Path], content: str, volatile: Iterable[Pattern] = ()) -> bool:
+        """写入文本文件，返回文件是否有变化
+
+        volatile 中的正则匹配到的部分不参与比较。
+        """
+        path = Path(path)
+        volatile = list(volatile)
+        old = self._read(path)
+        if old is not None and content_hash(old, volatile) == content_hash(content, volatile):
+            with self._lock:
+                self.unchanged += 1
+            return False
+
+        self._replace(path, content.encode("utf-8"))
+        return True
+
+    def write_bytes(self, path: Union[str, Path], content: bytes) -> bool:
+        """写入二进制文件（图片等），返回文件是否有变化"""
+        path = Path(path)
+        try:
+            old = path.read_bytes()
+        except FileNotFoundError:
+            old = None
+        if old is not None and content_hash(old) == content_hash(content):
+            with self._lock:
+                self.unchanged += 1
+            return False
+        self._replace(path, content)
+        return True
+
+    def write_json(self, path: Union[str, Path], data, volatile: Iterable[Pattern] = ()) -> bool:
+        """以 indent=2、保留中文的格式写入 JSON 文件，返回文件是否有变化"""
+        return self.write_text(path, json.dumps(data, ensure_ascii=False, indent=2), volatile)
+
+    def _replace(self, path: Path, content: bytes):
+        """先写临时文件再替换"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.changed.append(path)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[str]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return f.read()
+        except (FileNotFoundError, UnicodeDecodeError):
+            return None
+
+    def report(self):
+        """输出本次运行写入的文件数"""
+        total = len(self.changed) + self.unchanged
+        if total:
+            print(f"输出文件: {len(self.changed)} 个有变化, {self.unchanged} 个未变化（共 {total} 个）")
+
+
+_writer: Optional[OutputWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_output_writer() -> OutputWriter:
+    """获取进程内共享的输出写入器"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = OutputWriter()
+        return _writer
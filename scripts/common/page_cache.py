@@ -0,0 +1,182 @@
+"""
+原始页面缓存 - 按 URL 保存下载的 HTML（gzip 压缩）和抓取时间
+
+用于 widget_crawler：调整解析逻辑后可以用 --offline 直接从缓存重新解析和生成文档，
+不必再次请求 api.flutter.dev。
+
+缓存目录：scripts/.cache/pages/{哈希前两位}/{URL 的 SHA-256}.html.gz
+每个页面旁边有同名 .json 保存 URL 和抓取时间。
+
+命令行用法（在 scripts 目录下执行）：
+    python -m common.page_cache stats
+    python -m common.page_cache clear
+    python -m common.page_cache prune --older-than 30
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from common import CACHE_DIR
+
+DEFAULT_CACHE_ROOT = CACHE_DIR / "pages"
+
+# 默认缓存有效期（天）
+DEFAULT_TTL_DAYS = 7
+
+
+class PageCache:
+    """按 URL 缓存页面内容"""
+
+    def __init__(self, root: Path = DEFAULT_CACHE_ROOT, ttl_days: float = DEFAULT_TTL_DAYS):
+        self.root = Path(root)
+        self.ttl_days = ttl_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        directory = self.root / digest[:2]
+        return directory / f"{digest}.html.gz", directory / f"{digest}.json"
+
+    def fetched_at(self, url: str) -> Optional[float]:
+        """页面的抓取时间，未缓存时返回 None"""
+        _, meta_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)["fetched_at"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[bytes]:
+        """读取缓存的页面；超过有效期时返回 None，allow_stale=True 时忽略有效期"""
+        fetched_at = self.fetched_at(url)
+        fresh = fetched_at is not None and (
+            allow_stale or time.time() - fetched_at <= self.ttl_days * 86400
+        )
+        content = None
+        if fresh:
+            page_path, _ = self._paths(url)
+            try:
+                with gzip.open(page_path, 'rb') as f:
+                    content = f.read()
+            except OSError:
+                content = None
+
+        with self._lock:
+            if content is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return content
+
+    def put(self, url: str, content: bytes):
+        """保存页面（先写临时文件再替换，多线程写同一 URL 也不会损坏）"""
+        page_path, meta_path = self._paths(url)
+        page_path.parent.mkdir(parents=True, exist_ok=True)
+
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_page = page_path.with_name(page_path.name + suffix)
+        with gzip.open(tmp_page, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_page, page_path)
+
+        tmp_meta = meta_path.with_name(meta_path.name + suffix)
+        with open(tmp_meta, 'w', encoding='utf-8') as f:
+            json.dump({"url": url, "fetched_at": time.time()}, f)
+        os.replace(tmp_meta, meta_path)
+
+    def entries(self) -> Iterator[Dict]:
+        """遍历所有缓存条目的元数据"""
+        if not self.root.exists():
+            return
+        for meta_path in self.root.glob("*/*.json"):
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            meta["path"] = meta_path
+            yield meta
+
+    def prune(self, older_than_days: float) -> int:
+        """删除抓取时间早于 older_than_days 天的页面，返回删除数量"""
+        cutoff = time.time() - older_than_days * 86400
+        removed = 0
+        for meta in self.entries():
+            if meta.get("fetched_at", 0) < cutoff:
+                meta_path = meta["path"]
+                page_path = meta_path.with_name(meta_path.name[:-len(".json")] + ".html.gz")
+                for path in (page_path, meta_path):
+                    if path.exists():
+                        path.unlink()
+                removed += 1
+        return removed
+
+    def clear(self):
+        if self.root.exists():
+            shutil.rmtree(self.root)
+
+    def report(self, label: str = "页面缓存"):
+        """输出本次运行的命中统计"""
+        if self.hits or self.misses:
+            print(f"{label}: 命中 {self.hits} 次, 未命中 {self.misses} 次")
+
+
+_cache: Optional[PageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """获取进程内共享的页面缓存"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="页面缓存管理")
+    parser.add_argument("--root", default=str(DEFAULT_CACHE_ROOT), help="缓存目录")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="查看缓存状态")
+    subparsers.add_parser("clear", help="清空缓存")
+    prune_parser = subparsers.add_parser("prune", help="删除过期页面")
+    prune_parser.add_argument(
+        "--older-than", type=float, metavar="DAYS", required=True, help="删除 DAYS 天之前抓取的页面"
+    )
+
+    args = parser.parse_args()
+    cache = PageCache(Path(args.root))
+
+    if args.command == "stats":
+        count = 0
+        size = 0
+        for meta in cache.entries():
+            count += 1
+            page_path = meta["path"].with_name(meta["path"].name[:-len(".json")] + ".html.gz")
+            if page_path.exists():
+                size += page_path.stat().st_size
+        print(f"缓存目录: {cache.root}")
+        print(f"页面数: {count}")
+        print(f"压缩后大小: {size / 1024:.1f} KB")
+    elif args.command == "clear":
+        cache.clear()
+        print("已清空页面缓存")
+    else:
+        print(f"已删除 {cache.prune(args.older_than)} 个页面")
+
+
+if __name__ == "__main__":
+    main()
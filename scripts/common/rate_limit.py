@@ -0,0 +1,26 @@
+"""
+线程安全的限速器，替代固定的 time.sleep 节流
+"""
+
+import threading
+import time
+
+
+class RateLimiter:
+    """限制每秒最多 rate 次调用，多个线程共享同一个限速器时整体不超过该速率"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """阻塞直到允许下一次调用"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,64 @@
+"""
+Markdown 页面渲染 - 两个爬虫共用的预编译模板
+
+模板使用 str.format 的占位符语法（{name}，字面的花括号写成 {{ }}），创建 Template 时
+解析一次，之后每次渲染只是按顺序拼接片段。整页内容先收集到 Document 的片段列表中，
+最后一次性 join，耗时与页面大小成线性关系，避免反复 md += ... 带来的平方级复制。
+
+    from common.render import Document, Template
+
+    ITEM = Template("### [{title}]({url})\\n\\n")
+
+    doc = Document()
+    for item in items:
+        doc.render(ITEM, title=item.title, url=item.url)
+    doc.write("---\\n")
+    content = doc.getvalue()
+"""
+
+import string
+from typing import Dict, List, Optional, Tuple
+
+_FORMATTER = string.Formatter()
+
+
+class Template:
+    """预编译的模板，占位符只能是简单的名称（不支持格式说明和属性访问）"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in _FORMATTER.parse(source):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                raise ValueError(f"模板占位符只能是简单名称: {{{field}}}")
+            self._parts.append((literal, field))
+        self.fields = {field for _, field in self._parts if field is not None}
+
+    def render_to(self, chunks: List[str], values: Dict):
+        """把渲染结果追加到 chunks"""
+        for literal, field in self._parts:
+            if literal:
+                chunks.append(literal)
+            if field is not None:
+                chunks.append(str(values[field]))
+
+    def render(self, **values) -> str:
+        chunks: List[str] = []
+        self.render_to(chunks, values)
+        return "".join(chunks)
+
+
+class Document:
+    """按顺序收集页面片段，getvalue() 时一次性拼接"""
+
+    def __init__(self):
+        self._chunks: List[str] = []
+
+    def write(self, text: str):
+        self._chunks.append(text)
+
+    def render(self, template: Template, **values):
+        template.render_to(self._chunks, values)
+
+    def getvalue(self) -> str:
+        return "".join(self._chunks)
@@ -0,0 +1,41 @@
+"""
+重试策略 - 需要重试的状态码、Retry-After 解析和指数退避
+
+只依赖标准库，common.transport（requests）和基于 aiohttp 的异步抓取共用同一套策略。
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# 需要重试的状态码
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# 默认重试次数（不含第一次请求）
+DEFAULT_RETRIES = 3
+
+# 指数退避的基数和上限（秒）
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 60.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头（秒数或 HTTP 日期），返回需要等待的秒数"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """第 attempt 次重试前等待的秒数：有 Retry-After 时遵循，否则指数退避 + 全抖动"""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_MAX)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
@@ -0,0 +1,225 @@
+"""
+翻译缓存 - news_crawler 和 widget_crawler 共用的持久化翻译结果缓存
+
+缓存保存在 scripts/.cache/translations.sqlite3，键为
+(原文, 提示词, 模型, temperature) 的 SHA-256，任何一项变化都会视为新的翻译。
+超过容量上限时按最近使用时间淘汰（LRU）。
+
+命令行用法（在 scripts 目录下执行）：
+    python -m common.translation_cache stats
+    python -m common.translation_cache clear
+    python -m common.translation_cache invalidate --model deepseek-chat
+    python -m common.translation_cache invalidate --older-than 30
+    python -m common.translation_cache invalidate --text "Announcing Flutter 3.38"
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from common import CACHE_DIR
+
+DEFAULT_DB_PATH = CACHE_DIR / "translations.sqlite3"
+
+# 最多保留的翻译条数
+DEFAULT_MAX_ENTRIES = 20000
+
+
+def make_key(text: str, prompt: str, model: str, temperature: float) -> str:
+    """根据原文、提示词、模型和 temperature 计算缓存键"""
+    payload = json.dumps([text, prompt, model, float(temperature)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """基于 SQLite 的翻译缓存，带命中统计和 LRU 淘汰"""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 爬虫会在线程池中调用翻译，连接需要允许跨线程使用
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, text: str, prompt: str, model: str, temperature: float) -> Optional[str]:
+        """查询缓存，命中时刷新最近使用时间"""
+        key = make_key(text, prompt, model, temperature)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, text: str, prompt: str, model: str, temperature: float, translation: str):
+        """写入翻译结果，超过容量时淘汰最久未使用的条目"""
+        key = make_key(text, prompt, model, temperature)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO translations
+                    (key, model, source, translation, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, text, translation, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                """
+                DELETE FROM translations WHERE key IN (
+                    SELECT key FROM translations ORDER BY last_used ASC LIMIT ?
+                )
+                """,
+                (overflow,),
+            )
+
+    def invalidate(
+        self,
+        model: Optional[str] = None,
+        text: Optional[str] = None,
+        older_than_days: Optional[float] = None,
+    ) -> int:
+        """按模型、原文或写入时间删除缓存，不传条件时清空全部，返回删除条数"""
+        conditions = []
+        params = []
+        if model is not None:
+            conditions.append("model = ?")
+            params.append(model)
+        if text is not None:
+            conditions.append("source = ?")
+            params.append(text)
+        if older_than_days is not None:
+            conditions.append("created_at < ?")
+            params.append(time.time() - older_than_days * 86400)
+
+        sql = "DELETE FROM translations"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        with self._lock:
+            deleted = self._conn.execute(sql, params).rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self) -> int:
+        """清空缓存"""
+        return self.invalidate()
+
+    def stats(self) -> Dict:
+        """返回缓存条目数、文件大小以及本次运行的命中统计"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "size_bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def report(self, label: str = "翻译缓存"):
+        """输出本次运行的命中统计"""
+        stats = self.stats()
+        if not stats["hits"] and not stats["misses"]:
+            return
+        print(f"{label}: 命中 {stats['hits']} 次, 未命中 {stats['misses']} 次, "
+              f"命中率 {stats['hit_rate']:.0%}, 共 {stats['entries']} 条")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> TranslationCache:
+    """获取进程内共享的缓存实例"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranslationCache()
+        return _cache
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="翻译缓存管理")
+    parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="缓存数据库路径")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="查看缓存状态")
+    subparsers.add_parser("clear", help="清空缓存")
+
+    invalidate_parser = subparsers.add_parser("invalidate", help="按条件删除缓存")
+    invalidate_parser.add_argument("--model", help="只删除指定模型的翻译")
+    invalidate_parser.add_argument("--text", help="只删除指定原文的翻译")
+    invalidate_parser.add_argument(
+        "--older-than", type=float, metavar="DAYS", help="只删除 DAYS 天之前写入的翻译"
+    )
+
+    args = parser.parse_args()
+    cache = TranslationCache(Path(args.db))
+
+    if args.command == "stats":
+        stats = cache.stats()
+        print(f"缓存文件: {cache.path}")
+        print(f"条目数: {stats['entries']} / {stats['max_entries']}")
+        print(f"文件大小: {stats['size_bytes'] / 1024:.1f} KB")
+    elif args.command == "clear":
+        print(f"已清空 {cache.clear()} 条翻译缓存")
+    else:
+        if args.model is None and args.text is None and args.older_than is None:
+            parser.error("invalidate 至少需要 --model、--text 或 --older-than 之一，清空全部请使用 clear")
+        deleted = cache.invalidate(
+            model=args.model, text=args.text, older_than_days=args.older_than
+        )
+        print(f"已删除 {deleted} 条翻译缓存")
+
+    cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+翻译记忆 - 按句子复用翻译结果，只把没有翻译过的句子发给翻译接口
+
+整段原文作为一个单元翻译时，上游改动一句话整段都要重新翻译，不同页面共有的句子
+（"See also"、示例代码的说明等）也会一再翻译。TranslationMemory 先把原文切分为段落和句子，
+逐句在翻译缓存（common.translation_cache，缓存键中的提示词与整段翻译不同）中查找，
+缺失的句子编号后合并为一次请求，译文按编号拆开写回缓存，最后按原来的段落结构拼接。
+
+    from common.translation_memory import TranslationMemory
+
+    memory = TranslationMemory(model, temperature, system_prompt)
+    translated = memory.translate(text, request)   # request(prompt) -> 接口返回的内容或 None
+    memory.report()
+"""
+
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+from common.translation_cache import TranslationCache, get_cache
+
+# 句号后面不断句的缩写
+ABBREVIATIONS = {"e.g", "i.e", "etc", "vs", "cf", "approx", "no", "mr", "mrs", "dr"}
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_WHITESPACE = re.compile(r"\s+")
+# 句末标点（可以跟着引号或括号）之后是空白，下一句以大写字母、数字、引号、括号或反引号开头
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])([\"')\]]*)\s+(?=[A-Z0-9\"'(\[`])")
+_LAST_WORD = re.compile(r"(\S+?)[.!?][\"')\]]*$")
+_NUMBERED_LINE = re.compile(r"^\s*\[(\d+)\]\s*(.*?)\s*$", re.M)
+
+
+def split_sentences(paragraph: str) -> List[str]:
+    """把一段文字切分为句子，段内的换行和连续空白合并为一个空格"""
+    paragraph = _WHITESPACE.sub(" ", paragraph).strip()
+    sentences = []
+    start = 0
+    for match in _SENTENCE_BREAK.finditer(paragraph):
+        end = match.end(1)
+        last_word = _LAST_WORD.search(paragraph[start:end])
+        if last_word and last_word.group(1).lower() in ABBREVIATIONS:
+            continue
+        sentences.append(paragraph[start:end])
+        start = match.end()
+    if start < len(paragraph):
+        sentences.append(paragraph[start:])
+    return sentences
+
+
+def split_paragraphs(text: str) -> List[List[str]]:
+    """原文 → [[段落 1 的句子...], [段落 2 的句子...]]，忽略空段落"""
+    paragraphs = []
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        sentences = split_sentences(paragraph)
+        if sentences:
+            paragraphs.append(sentences)
+    return paragraphs
+
+
+def join_sentences(sentences: List[str]) -> str:
+    """拼接一段中的译文：中文句子之间不加空格，前后都是英文时加一个空格"""
+    result = ""
+    for sentence in sentences:
+        if result and result[-1].isascii() and not result[-1].isspace() and sentence[:1].isascii():
+            result += " "
+        result += sentence
+    return result
+
+
+def build_segment_prompt(segments: List[str]) -> str:
+    """编号句子的批量翻译提示词"""
+    numbered = "\n".join(f"[{i}] {segment}" for i, segment in enumerate(segments, 1))
+    return f"""请将以下编号的 Flutter 文档句子逐条翻译为中文，保持专业术语的准确性：
+    - 类名、方法名、属性名保持英文原样
+    - 使用简洁专业的技术文档风格
+    - 每条译文单独一行，以对应的编号开头，不要合并或拆分句子
+
+{numbered}
+
+中文翻译："""
+
+
+def parse_segment_response(content: str, count: int) -> Optional[List[str]]:
+    """按编号拆出 count 条译文，缺少编号或译文为空时返回 None"""
+    translations: Dict[int, str] = {}
+    for number, translation in _NUMBERED_LINE.findall(content):
+        translations.setdefault(int(number), translation)
+    result = [translations.get(i, "") for i in range(1, count + 1)]
+    if not all(result):
+        return None
+    return result
+
+
+class TranslationMemory:
+    """句子级的翻译记忆，译文保存在共用的翻译缓存中，线程安全"""
+
+    def __init__(
+        self,
+        model: str,
+        temperature: float,
+        system_prompt: str = "",
+        cache: Optional[TranslationCache] = None,
+    ):
+        self.model = model
+        self.temperature = temperature
+        # 句子译文的缓存键包含提示词模板，修改提示词后旧的译文自动失效
+        self.cache_prompt = system_prompt + build_segment_prompt(["{text}"])
+        self._cache = cache
+        self.reused = 0
+        self.translated = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> TranslationCache:
+        return self._cache or get_cache()
+
+    def lookup(self, segment: str) -> Optional[str]:
+        return self.cache.get(segment, self.cache_prompt, self.model, self.temperature)
+
+    def translate(
+        self,
+        text: str,
+        request: Callable[[str], Optional[str]],
+        offline: bool = False,
+    ) -> Optional[str]:
+        """逐句翻译 text，返回拼接后的译文
+
+        request 接收批量翻译的提示词，返回接口的回复（失败时为 None）。有句子没有译文时
+        （offline=True、请求失败或回复无法按编号拆开）返回 None，由调用方决定如何处理。
+        """
+        paragraphs = split_paragraphs(text)
+        known: Dict[str, str] = {}
+        missing: List[str] = []
+        for sentence in dict.fromkeys(s for paragraph in paragraphs for s in paragraph):
+            translation = self.lookup(sentence)
+            if translation is None:
+                missing.append(sentence)
+            else:
+                known[sentence] = translation
+
+        with self._lock:
+            self.reused += len(known)
+
+        if missing:
+            if offline:
+                return None
+            content = request(build_segment_prompt(missing))
+            if content is None:
+                return None
+            translations = parse_segment_response(content, len(missing))
+            if translations is None:
+                print(f"批量翻译的回复无法按编号拆分（{len(missing)} 句）")
+                return None
+            for sentence, translation in zip(missing, translations):
+                self.cache.set(sentence, self.cache_prompt, self.model, self.temperature, translation)
+                known[sentence] = translation
+            # 只统计拿到译文并写入缓存的句子，请求失败或回退到整段翻译的不计入
+            with self._lock:
+                self.translated += len(missing)
+
+        return "\n\n".join(join_sentences([known[s] for s in paragraph]) for paragraph in paragraphs)
+
+    def report(self, label: str = "翻译记忆"):
+        """输出本次运行复用和新翻译的句子数"""
+        total = self.reused + self.translated
+        if total:
+            print(f"{label}: 共 {total} 句, 复用 {self.reused} 句, 新翻译 {self.translated} 句")
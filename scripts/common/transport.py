@@ -0,0 +1,123 @@
+"""
+共享 HTTP 传输层 - 两个爬虫的所有请求都通过这里发出
+
+- 每个主机一个 requests.Session，连接池复用 TCP/TLS 连接（keep-alive）
+- 429 / 5xx 和连接错误时按指数退避 + 随机抖动重试，优先遵循 Retry-After（策略见 common.retry）
+- 按主机限速，替代分散在各处的固定 time.sleep
+- 每次请求的耗时、字节数、状态码和重试次数记录到 common.metrics
+
+用法：
+    from common import transport
+
+    transport.set_host_rate("pub.dev", 5)
+    response = transport.get("https://pub.dev/api/packages/dio", timeout=10)
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from common.metrics import Call, get_metrics
+from common.rate_limit import RateLimiter
+# 重试策略也从这里导出（transport.RETRY_STATUSES 等），供 async_engine 使用
+from common.retry import DEFAULT_RETRIES, RETRY_STATUSES, backoff_delay, parse_retry_after
+
+# 每个主机连接池的大小，需要不小于访问同一主机的并发线程数
+POOL_SIZE = 16
+
+_sessions: Dict[str, requests.Session] = {}
+_limiters: Dict[str, RateLimiter] = {}
+_lock = threading.Lock()
+
+
+def get_session(host: str) -> requests.Session:
+    """获取主机对应的 Session，首次使用时创建"""
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def set_host_rate(host: str, rate: float):
+    """限制对某个主机每秒最多 rate 次请求"""
+    with _lock:
+        _limiters[host] = RateLimiter(rate)
+
+
+def set_default_host_rate(host: str, rate: float):
+    """与 set_host_rate 相同，但主机已经设置过限速时保持不变
+
+    用于模块级的默认值：模块被重复导入（例如脚本本身和 import news_crawler）
+    或多个地址指向同一主机（本地替身服务）时，不会覆盖命令行指定的限速。
+    """
+    with _lock:
+        _limiters.setdefault(host, RateLimiter(rate))
+
+
+def request(
+    method: str, url: str, retries: int = DEFAULT_RETRIES, stage: str = "fetch", **kwargs
+) -> requests.Response:
+    """发送请求，遇到 429 / 5xx 或连接错误时自动重试
+
+    重试用尽后返回最后一次响应（或抛出最后一次的异常），由调用方按原逻辑处理状态码。
+    stage 为记录到 common.metrics 的阶段名称。
+    """
+    host = urlsplit(url).netloc
+    with get_metrics().timed(stage, host) as call:
+        response = _send(method, url, host, retries, call, **kwargs)
+        call.status = response.status_code
+        call.ok = response.status_code < 400
+        # stream=True 时响应体还没有读取，只能使用 Content-Length
+        length = response.headers.get("Content-Length", "")
+        if kwargs.get("stream"):
+            call.bytes = int(length) if length.isdigit() else 0
+        else:
+            call.bytes = len(response.content or b"")
+        return response
+
+
+def _send(method: str, url: str, host: str, retries: int, call: Call, **kwargs) -> requests.Response:
+    session = get_session(host)
+
+    attempt = 0
+    while True:
+        limiter = _limiters.get(host)
+        if limiter is not None:
+            limiter.acquire()
+
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+            call.retries = attempt
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt >= retries:
+            return response
+
+        delay = backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+        print(f"  {host} 返回 {response.status_code}，{delay:.1f} 秒后重试 ({attempt + 1}/{retries})")
+        response.close()
+        time.sleep(delay)
+        attempt += 1
+        call.retries = attempt
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
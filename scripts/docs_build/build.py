@@ -0,0 +1,388 @@
+"""
+文档构建编排 - 按依赖关系运行全部文档生成脚本，跳过输入没有变化的任务
+
+每个任务声明命令、输入（脚本源码、fixtures 等文件的 glob）、输出和依赖的任务，
+任务之间构成有向无环图。没有依赖关系的任务并行运行。Widget 爬虫会用抓取结果覆盖
+docs/widgets 下人工补充过的页面，标记为 explicit，只在命令行中指定时运行。
+
+任务的输入指纹由命令、相关环境变量和全部输入文件的 SHA-256 计算。以下情况重新运行：
+- 输入指纹与上次成功运行后的不同（上游任务改写了输入文件时也会变化）
+- 声明的输出不存在
+- 任务设置了 ttl_hours（抓取远程数据的任务），距上次成功运行已超过该时长
+
+文件哈希按修改时间和大小缓存，任务状态保存在 scripts/.cache/docs_build/state.json，
+每个任务的输出写入 scripts/.cache/docs_build/logs/{任务名}.log。
+
+使用方法（在 scripts 目录下执行）：
+    python docs_build/build.py                  # 运行全部默认任务
+    python docs_build/build.py search-index     # 只运行指定任务及其依赖
+    python docs_build/build.py widgets docs-graph  # Widget 爬虫只在指定时运行
+    python docs_build/build.py -n               # 只显示需要运行的任务
+    python docs_build/build.py --force pages    # 忽略指纹强制运行
+    python docs_build/build.py --list
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR
+
+REPO_DIR = SCRIPTS_DIR.parent
+BUILD_DIR = CACHE_DIR / "docs_build"
+DEFAULT_STATE_PATH = BUILD_DIR / "state.json"
+LOG_DIR = BUILD_DIR / "logs"
+
+# 所有 Python 任务共用的模块
+COMMON_INPUTS = ["scripts/common/**/*.py"]
+
+# 任务失败时输出日志的最后几行
+LOG_TAIL_LINES = 20
+
+
+@dataclass
+class Task:
+    name: str
+    description: str
+    # 在 scripts 目录下用当前 Python 解释器运行的参数
+    command: List[str]
+    # 相对仓库根目录的 glob
+    inputs: List[str]
+    outputs: List[str]
+    deps: List[str] = field(default_factory=list)
+    # 影响结果的环境变量（例如切换到本地替身服务）
+    env: List[str] = field(default_factory=list)
+    # 抓取远程数据的任务，超过该时长即使输入没变也重新运行
+    ttl_hours: Optional[float] = None
+    # 只在命令行中指定时运行，不作为默认任务，也不作为其他任务的依赖自动运行
+    explicit: bool = False
+
+
+TASKS: List[Task] = [
+    Task(
+        name="news",
+        description="抓取 Flutter 新闻（docs/news）",
+        command=["news_crawler/news_crawler.py", "-o", "../docs/news/index.md", "-j", "../docs/news/data.json"],
+        inputs=["scripts/news_crawler/*.py", "scripts/standin/fixtures/**/*", *COMMON_INPUTS],
+        outputs=["docs/news/index.md", "docs/news/data.json"],
+        env=["CRAWLER_STANDIN"],
+        ttl_hours=6,
+    ),
+    Task(
+        name="widgets",
+        description="抓取 Widget 文档（docs/widgets）",
+        command=["widget_crawler/crawler.py", "-o", "../docs/widgets"],
+        inputs=["scripts/widget_crawler/*.py", "scripts/standin/fixtures/**/*", *COMMON_INPUTS],
+        outputs=["docs/widgets/index.json", "docs/widgets/index.md"],
+        env=["CRAWLER_STANDIN"],
+        ttl_hours=24,
+        # docs/widgets 下的页面大多经过人工补充，爬虫会用抓取结果覆盖同名页面
+        explicit=True,
+    ),
+    Task(
+        name="pages",
+        description="生成脚本维护的页面（docs/modules）",
+        command=["generators/generate.py"],
+        inputs=["scripts/generators/**/*.py", *COMMON_INPUTS],
+        outputs=[
+            "docs/modules/payment/alipay.md",
+            "docs/modules/payment/wechatpay.md",
+            "docs/modules/payment/wechat-login-share.md",
+            "docs/modules/app-update/index.md",
+            "docs/modules/hotupdate/index.md",
+        ],
+    ),
+    Task(
+        name="docs-graph",
+        description="生成 Widget 侧边栏和反向链接（docs/.vitepress/generated）",
+        command=["docs_graph/build_graph.py"],
+        inputs=[
+            "docs/**/*.md", "docs/widgets/index.json", "docs/.vitepress/config.ts",
+            "scripts/docs_graph/*.py", "scripts/widget_crawler/categories.py", *COMMON_INPUTS,
+        ],
+        outputs=["docs/.vitepress/generated/sidebar.json", "docs/.vitepress/generated/backlinks.json"],
+        deps=["news", "widgets", "pages"],
+    ),
+    Task(
+        name="search-index",
+        description="生成全文搜索索引（docs/public/search-index）",
+        command=["search_index/build_index.py"],
+        inputs=["docs/**/*.md", "scripts/search_index/*.py", "scripts/widget_crawler/categories.py", *COMMON_INPUTS],
+        outputs=["docs/public/search-index/manifest.json"],
+        deps=["news", "widgets", "pages"],
+    ),
+    Task(
+        name="images",
+        description="压缩页面引用的图片并生成 WebP / AVIF 版本（docs/public/images）",
+        command=["image_assets/optimize_images.py"],
+        # 只处理页面引用的图片，页面变化时也要重新运行
+        inputs=[
+            "docs/**/*.md", "docs/**/*.png", "docs/**/*.jpg", "docs/**/*.jpeg",
+            "scripts/image_assets/*.py", *COMMON_INPUTS,
+        ],
+        outputs=["docs/public/images/manifest.json"],
+    ),
+]
+
+
+def expand(patterns: Iterable[str]) -> List[Path]:
+    """glob → 排序后的文件列表"""
+    files = set()
+    for pattern in patterns:
+        for path in REPO_DIR.glob(pattern):
+            if path.is_file() and "node_modules" not in path.parts:
+                files.add(path)
+    return sorted(files)
+
+
+class BuildState:
+    """任务的上次运行结果和文件哈希缓存"""
+
+    def __init__(self, path: Path = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+        self.tasks: Dict[str, Dict] = {}
+        # 相对路径 → [修改时间, 大小, SHA-256]
+        self.files: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.tasks = data.get("tasks", {})
+                self.files = data.get("files", {})
+            except (OSError, ValueError) as e:
+                print(f"读取构建状态失败，将运行全部任务: {e}")
+
+    def file_hash(self, path: Path) -> str:
+        key = path.relative_to(REPO_DIR).as_posix()
+        stat = path.stat()
+        entry = self.files.get(key)
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        with self._lock:
+            self.files[key] = [stat.st_mtime_ns, stat.st_size, digest]
+            self._dirty = True
+        return digest
+
+    def fingerprint(self, task: Task) -> str:
+        """命令、环境变量和全部输入文件内容的哈希"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps(task.command).encode("utf-8"))
+        for name in task.env:
+            digest.update(f"\0{name}={os.getenv(name, '')}".encode("utf-8"))
+        for path in expand(task.inputs):
+            digest.update(f"\0{path.relative_to(REPO_DIR).as_posix()}\0{self.file_hash(path)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def stale_reason(self, task: Task, force: bool = False) -> Optional[str]:
+        """需要运行的原因，任务是最新的时返回 None"""
+        if force:
+            return "强制运行"
+        entry = self.tasks.get(task.name)
+        if entry is None:
+            return "没有运行记录"
+        missing = [pattern for pattern in task.outputs if not expand([pattern])]
+        if missing:
+            return f"输出缺失: {missing[0]}"
+        if entry["fingerprint"] != self.fingerprint(task):
+            return "输入有变化"
+        if task.ttl_hours is not None and time.time() - entry["finished_at"] > task.ttl_hours * 3600:
+            return f"超过 {task.ttl_hours:g} 小时"
+        return None
+
+    def record(self, task: Task, seconds: float):
+        # 运行后重新计算指纹：任务可能改写了自己的输入（例如原地压缩的图片）
+        fingerprint = self.fingerprint(task)
+        with self._lock:
+            self.tasks[task.name] = {"fingerprint": fingerprint, "finished_at": time.time(), "seconds": round(seconds, 2)}
+            self._dirty = True
+
+    def prune_files(self):
+        """删除已经不存在的文件的哈希"""
+        for key in list(self.files):
+            if not (REPO_DIR / key).exists():
+                del self.files[key]
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"tasks": self.tasks, "files": self.files}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def resolve_order(tasks: Dict[str, Task], targets: List[str]) -> List[str]:
+    """目标任务及其全部依赖，按依赖在前的顺序排列
+
+    explicit 的任务只在本身是目标时加入。
+    """
+    order: List[str] = []
+    visiting = set()
+
+    def visit(name: str, path: Tuple[str, ...]):
+        if name in order:
+            return
+        if name in visiting:
+            raise ValueError(f"任务之间存在循环依赖: {' → '.join(path + (name,))}")
+        if name not in tasks:
+            raise ValueError(f"未知的任务: {name}")
+        visiting.add(name)
+        for dep in tasks[name].deps:
+            if dep in tasks and tasks[dep].explicit and dep not in targets:
+                continue
+            visit(dep, path + (name,))
+        visiting.discard(name)
+        order.append(name)
+
+    for target in targets:
+        visit(target, ())
+    return order
+
+
+def execute(task: Task) -> Tuple[int, float]:
+    """运行任务的命令，输出写入日志文件，返回 (退出码, 耗时)"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    with open(LOG_DIR / f"{task.name}.log", 'w', encoding='utf-8') as log:
+        result = subprocess.run(
+            [sys.executable, *task.command], cwd=SCRIPTS_DIR,
+            stdout=log, stderr=subprocess.STDOUT, text=True
+        )
+    return result.returncode, time.perf_counter() - start
+
+
+def print_log_tail(task: Task):
+    log_path = LOG_DIR / f"{task.name}.log"
+    try:
+        lines = log_path.read_text(encoding="utf-8", errors="replace").splitlines()
+    except FileNotFoundError:
+        return
+    for line in lines[-LOG_TAIL_LINES:]:
+        print(f"    {line}")
+    print(f"    （完整日志: {log_path}）")
+
+
+def run_build(
+    tasks: Dict[str, Task],
+    targets: List[str],
+    state: BuildState,
+    jobs: int = 4,
+    force: Iterable[str] = (),
+    dry_run: bool = False,
+) -> Dict[str, str]:
+    """按依赖关系运行任务，返回 {任务名: 结果}
+
+    依赖全部完成的任务才会检查是否需要运行；依赖失败的任务跳过。
+    """
+    order = resolve_order(tasks, targets)
+    force = set(force)
+    results: Dict[str, str] = {}
+    pending = list(order)
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name in list(pending):
+                task = tasks[name]
+                if any(dep in pending or dep in running.values() for dep in task.deps):
+                    continue
+                pending.remove(name)
+                failed = [dep for dep in task.deps if results.get(dep) in ("失败", "跳过")]
+                if failed:
+                    results[name] = "跳过"
+                    print(f"⏭️  {name}: 依赖的任务 {', '.join(failed)} 没有完成")
+                    continue
+                reason = state.stale_reason(task, force=name in force)
+                if reason is None:
+                    results[name] = "最新"
+                    print(f"✔️  {name}: 最新")
+                elif dry_run:
+                    results[name] = "需要运行"
+                    print(f"•  {name}: 需要运行（{reason}）")
+                else:
+                    print(f"▶️  {name}: {task.description}（{reason}）")
+                    running[pool.submit(execute, task)] = name
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                task = tasks[name]
+                returncode, seconds = future.result()
+                if returncode == 0:
+                    state.record(task, seconds)
+                    state.save()
+                    results[name] = "完成"
+                    print(f"✅ {name}: 完成（{seconds:.1f} 秒）")
+                else:
+                    results[name] = "失败"
+                    print(f"❌ {name}: 退出码 {returncode}（{seconds:.1f} 秒）")
+                    print_log_tail(task)
+
+    state.prune_files()
+    state.save()
+    return results
+
+
+def main():
+    import argparse
+
+    tasks = {task.name: task for task in TASKS}
+
+    parser = argparse.ArgumentParser(description="文档构建编排")
+    parser.add_argument("targets", nargs="*", metavar="task", help="要运行的任务（默认为全部默认任务），依赖的任务会先运行")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="同时运行的任务数")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="只显示需要运行的任务")
+    parser.add_argument("--force", nargs="?", const="*", metavar="task", action="append", default=[],
+                        help="忽略指纹强制运行指定任务（不指定时为全部目标任务），可以重复指定")
+    parser.add_argument("--list", action="store_true", help="列出全部任务")
+    args = parser.parse_args()
+
+    if args.list:
+        for task in TASKS:
+            deps = f"（依赖 {', '.join(task.deps)}）" if task.deps else ""
+            explicit = "（需要指定）" if task.explicit else ""
+            print(f"{task.name:<14} {task.description}{deps}{explicit}")
+        return
+
+    targets = args.targets or [task.name for task in TASKS if not task.explicit]
+    force = set(args.force)
+    if "*" in force:
+        force = set(targets)
+
+    start = time.perf_counter()
+    try:
+        results = run_build(tasks, targets, BuildState(), jobs=args.jobs, force=force, dry_run=args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+
+    counts: Dict[str, int] = {}
+    for result in results.values():
+        counts[result] = counts.get(result, 0) + 1
+    summary = ", ".join(f"{count} 个{result}" for result, count in counts.items())
+    print(f"\n共 {len(results)} 个任务: {summary}，耗时 {time.perf_counter() - start:.1f} 秒")
+
+    if any(result in ("失败", "跳过") for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+"""
+文档页面关系图 - 一次扫描 docs/，生成侧边栏、反向链接和孤立/缺失页面报告
+
+每个页面只读取一次，同时解析出：
+- frontmatter 中的 title（没有时使用首页的 hero.name 或第一个一级标题）
+- 各级标题及其锚点（与 VitePress 的 slugify 规则一致）
+- 指向站内页面的链接：Markdown 链接、HTML 的 href 和 frontmatter 中的 link（如首页的按钮）
+
+输出（默认 docs/.vitepress/generated/）：
+- sidebar.json：由目录结构生成的侧边栏，config.ts 直接导入
+    {"/widgets/": [{"text": "基础组件", "link": "/widgets/basics/", "items": [...]}, ...]}
+- backlinks.json：每个页面被哪些页面链接
+    {"/widgets/basics/text": [{"link": "/widgets/basics/", "title": "基础组件"}, ...]}
+  主题的 Backlinks 组件据此在 Widget 页面底部列出引用本页的页面
+
+Widget 大全的侧边栏每个子目录一组，分组名取 Widget 爬虫写出的 index.json（没有时为
+WIDGET_CATEGORIES）中的分类名称，不在其中的目录使用目录下 index.md 的标题；分组按爬虫分类的
+顺序排列。组内页面的顺序依次参考目录页中链接的顺序、爬虫分类中的顺序和页面标题；条目文字取
+页面 frontmatter 的 title（如 "Text 文本"），没有时为爬虫记录的 Widget 名称或页面标题。
+只有目录页的分类以目录页作为唯一条目。爬虫新增分类后重新生成即可，不需要修改 config.ts。
+
+报告：
+- 缺失页面：页面或 config.ts（导航栏、侧边栏）链接到了不存在的页面
+- 失效锚点：链接中的 #锚点 在目标页面中不存在
+- 孤立页面：不在任何侧边栏或导航栏中，也没有被其他页面链接的页面
+
+解析结果按文件的修改时间和大小缓存在 scripts/.cache/docs_graph.json，再次运行时只重新解析
+变化过的页面。
+
+使用方法（在 scripts 目录下执行）：
+    python docs_graph/build_graph.py
+    python docs_graph/build_graph.py --report /tmp/docs_graph.json
+    python docs_graph/build_graph.py --strict   # 有缺失页面时退出码为 1
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import sys
+import threading
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import unquote, urldefrag
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR
+from common.output import get_output_writer
+
+DOCS_DIR = SCRIPTS_DIR.parent / "docs"
+CONFIG_PATH = DOCS_DIR / ".vitepress" / "config.ts"
+DEFAULT_OUTPUT_DIR = DOCS_DIR / ".vitepress" / "generated"
+DEFAULT_CACHE_PATH = CACHE_DIR / "docs_graph.json"
+
+# 解析规则变化时修改，使缓存全部失效
+PARSER_VERSION = 1
+
+# 不属于站点页面的目录
+EXCLUDED_DIRS = {".vitepress", "public", "node_modules"}
+
+# 由目录结构生成侧边栏的栏目
+WIDGETS_SECTION = "widgets"
+WIDGETS_OVERVIEW_TEXT = "Widget 概览"
+
+_FRONTMATTER = re.compile(r"\A---\n(.*?)\n---\n", re.S)
+_FRONTMATTER_TITLE = re.compile(r"^title:\s*['\"]?(.*?)['\"]?\s*$", re.M)
+# 首页（layout: home）没有标题时使用 hero.name
+_FRONTMATTER_HERO_NAME = re.compile(r"^hero:\n\s+name:\s*['\"]?(.*?)['\"]?\s*$", re.M)
+_FRONTMATTER_LINK = re.compile(r"^\s*(?:-\s+)?link:\s*['\"]?([^'\"\s]+)", re.M)
+_FENCED_CODE = re.compile(r"^(`{3,}|~{3,}).*?^\1", re.S | re.M)
+_INLINE_CODE = re.compile(r"`[^`\n]+`")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$", re.M)
+_CUSTOM_ANCHOR = re.compile(r"\s*\{#([^}]+)\}$")
+_MARKDOWN_LINK = re.compile(r"!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+_HTML_HREF = re.compile(r"<a\b[^>]*?\bhref=[\"']([^\"']+)[\"']", re.I)
+_CONFIG_LINK = re.compile(r"\blink:\s*['\"]([^'\"]+)['\"]")
+_SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+# 标题中的 Markdown 标记，生成锚点前去掉
+_HEADING_MARKUP = re.compile(r"!?\[([^\]]*)\]\([^)]*\)|<[^>]+>|[`*]")
+
+# VitePress（@mdit-vue/shared）的 slugify 规则
+_SLUG_SPECIAL = re.compile(r"[\s~`!@#$%^&*()\-_+=\[\]{}|\\;:\"'“”‘’<>,.?/]+")
+
+
+def slugify(text: str) -> str:
+    """标题文字 → 锚点，与 VitePress 生成的 id 一致"""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch) and ord(ch) >= 0x20)
+    slug = _SLUG_SPECIAL.sub("-", text)
+    slug = re.sub(r"-{2,}", "-", slug).strip("-")
+    if slug[:1].isdigit():
+        slug = "_" + slug
+    return slug.lower()
+
+
+def page_key(path: Path, docs_dir: Path) -> str:
+    """页面相对 docs/ 的路径，去掉 .md（widgets/basics/text、widgets/basics/index）"""
+    return path.relative_to(docs_dir).with_suffix("").as_posix()
+
+
+def page_link(key: str) -> str:
+    """页面在侧边栏中使用的地址（/widgets/basics/text、/widgets/basics/）"""
+    if key == "index":
+        return "/"
+    if key.endswith("/index"):
+        return "/" + key[:-len("index")]
+    return "/" + key
+
+
+def resolve_link(target: str, source_key: str) -> Optional[Tuple[str, str]]:
+    """站内链接 → (目标页面的 key, 锚点)，外部链接和静态资源返回 None
+
+    目标页面是否存在在所有页面解析完之后再判断（见 DocsGraph.resolve）。
+    """
+    target, fragment = urldefrag(target.strip())
+    if _SCHEME.match(target) or target.startswith("//"):
+        return None
+    target = unquote(target.split("?", 1)[0])
+    if not target:
+        # 只有锚点，指向当前页面
+        return (source_key, unquote(fragment)) if fragment else None
+
+    if target.startswith("/"):
+        path = target.lstrip("/")
+    else:
+        path = posixpath.join(posixpath.dirname(source_key), target)
+    is_dir = path.endswith("/") or path in ("", ".")
+    path = posixpath.normpath(path) if path else "."
+    if path.startswith(".."):
+        return None
+
+    stem, ext = posixpath.splitext(path)
+    if ext in (".md", ".html"):
+        path = stem
+    elif ext:
+        # 图片等静态资源
+        return None
+    if is_dir or path == ".":
+        path = "index" if path == "." else path + "/index"
+    return path, unquote(fragment)
+
+
+def parse_page(content: str, key: str) -> Dict:
+    """一次解析出页面的 {"title", "frontmatter", "headings", "links"}"""
+    title = ""
+    frontmatter: Dict[str, str] = {}
+    links: List[str] = []
+
+    match = _FRONTMATTER.match(content)
+    if match:
+        block = match.group(1)
+        title_match = _FRONTMATTER_TITLE.search(block) or _FRONTMATTER_HERO_NAME.search(block)
+        if title_match:
+            title = title_match.group(1)
+        for line in block.splitlines():
+            name, sep, value = line.partition(":")
+            if sep and name and not name[0].isspace() and value.strip():
+                frontmatter[name.strip()] = value.strip().strip("'\"")
+        links.extend(_FRONTMATTER_LINK.findall(block))
+        content = content[match.end():]
+
+    content = _FENCED_CODE.sub("", content)
+    content = _INLINE_CODE.sub("", content)
+
+    headings = []
+    slug_counts: Dict[str, int] = defaultdict(int)
+    for level, text in _HEADING.findall(content):
+        custom = _CUSTOM_ANCHOR.search(text)
+        if custom:
+            text = text[:custom.start()]
+            anchor = custom.group(1)
+        else:
+            anchor = slugify(_HEADING_MARKUP.sub(lambda m: m.group(1) or "", text))
+            # 重复的标题依次加 -1、-2
+            count = slug_counts[anchor]
+            slug_counts[anchor] += 1
+            if count:
+                anchor = f"{anchor}-{count}"
+        if len(level) == 1 and not title:
+            title = text.strip()
+        headings.append({"level": len(level), "text": text.strip(), "anchor": anchor})
+
+    links.extend(_MARKDOWN_LINK.findall(content))
+    links.extend(_HTML_HREF.findall(content))
+
+    resolved = []
+    seen = set()
+    for target in links:
+        link = resolve_link(target, key)
+        if link and link not in seen:
+            seen.add(link)
+            resolved.append(list(link))
+
+    return {
+        "title": title or posixpath.basename(key),
+        "frontmatter": frontmatter,
+        "headings": headings,
+        "links": resolved,
+    }
+
+
+def iter_pages(docs_dir: Path) -> Iterator[Path]:
+    for path in sorted(docs_dir.rglob("*.md")):
+        if not EXCLUDED_DIRS.intersection(path.relative_to(docs_dir).parts):
+            yield path
+
+
+class PageCache:
+    """每个页面的解析结果，按修改时间、大小和内容哈希判断是否需要重新解析"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.pages: Dict[str, Dict] = {}
+        self.reused = 0
+        self.parsed = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("parser") == PARSER_VERSION:
+                    self.pages = data.get("pages", {})
+            except (OSError, ValueError) as e:
+                print(f"读取页面缓存失败，将重新解析: {e}")
+
+    def get(self, key: str, path: Path) -> Dict:
+        """返回页面的解析结果，页面没有变化时使用缓存"""
+        stat = path.stat()
+        entry = self.pages.get(key)
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            self.reused += 1
+            return entry
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry["sha256"] == digest:
+            # 只是修改时间变化（例如重新检出），内容相同
+            entry.update(mtime=stat.st_mtime, size=stat.st_size)
+            self._dirty = True
+            self.reused += 1
+            return entry
+
+        entry = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest}
+        entry.update(parse_page(raw.decode("utf-8"), key))
+        with self._lock:
+            self.pages[key] = entry
+            self._dirty = True
+        self.parsed += 1
+        return entry
+
+    def prune(self, keys: Iterable[str]):
+        """删除已经不存在的页面"""
+        keep = set(keys)
+        for key in list(self.pages):
+            if key not in keep:
+                del self.pages[key]
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"parser": PARSER_VERSION, "pages": self.pages}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+class DocsGraph:
+    """全部页面及其链接关系"""
+
+    def __init__(self, pages: Dict[str, Dict]):
+        self.pages = pages
+        # 页面 key → 链接到它的页面 key
+        self.backlinks: Dict[str, Set[str]] = defaultdict(set)
+        # (来源, 链接的目标) 列表
+        self.missing: List[Tuple[str, str]] = []
+        self.broken_anchors: List[Tuple[str, str]] = []
+
+        for source, page in pages.items():
+            for target, fragment in page["links"]:
+                key = self.resolve(target)
+                if key is None:
+                    self.missing.append((source, page_link(target)))
+                    continue
+                if key != source:
+                    self.backlinks[key].add(source)
+                if fragment and fragment not in self.anchors(key):
+                    self.broken_anchors.append((source, f"{page_link(key)}#{fragment}"))
+
+    @classmethod
+    def scan(cls, docs_dir: Path, cache: PageCache) -> "DocsGraph":
+        pages = {}
+        for path in iter_pages(docs_dir):
+            key = page_key(path, docs_dir)
+            pages[key] = cache.get(key, path)
+        cache.prune(pages)
+        cache.save()
+        return cls(pages)
+
+    def resolve(self, target: str) -> Optional[str]:
+        """链接的目标 → 存在的页面 key（/widgets/basics 也可以指向 widgets/basics/index）"""
+        if target in self.pages:
+            return target
+        if target + "/index" in self.pages:
+            return target + "/index"
+        return None
+
+    def anchors(self, key: str) -> Set[str]:
+        return {heading["anchor"] for heading in self.pages[key]["headings"]}
+
+    def title(self, key: str) -> str:
+        return self.pages[key]["title"]
+
+    def backlink_map(self) -> Dict[str, List[Dict]]:
+        """{页面地址: [{"link", "title"}, ...]}，按地址排序"""
+        return {
+            page_link(key): [
+                {"link": page_link(source), "title": self.title(source)}
+                for source in sorted(sources)
+            ]
+            for key, sources in sorted(self.backlinks.items())
+        }
+
+    def orphans(self, listed: Set[str]) -> List[str]:
+        """不在侧边栏 / 导航栏中、也没有被其他页面链接的页面"""
+        return [
+            key for key in self.pages
+            if key != "index" and key not in listed and not self.backlinks.get(key)
+        ]
+
+
+def load_widget_categories(widgets_dir: Path) -> List[Dict]:
+    """Widget 分类 [{"category_id", "category_name", "widgets": [{"name", "file"}]}]
+
+    优先使用 Widget 爬虫写出的 index.json，没有时使用 WIDGET_CATEGORIES。
+    """
+    index_path = widgets_dir / "index.json"
+    if index_path.exists():
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"读取 {index_path} 失败，改用 WIDGET_CATEGORIES: {e}")
+
+    sys.path.insert(0, str(SCRIPTS_DIR / "widget_crawler"))
+    from categories import WIDGET_CATEGORIES
+    return [
+        {
+            "category_id": category_id,
+            "category_name": info["name"],
+            "widgets": [{"name": name, "file": f"{category_id}/{name.lower()}.md"} for name in info["widgets"]],
+        }
+        for category_id, info in WIDGET_CATEGORIES.items()
+    ]
+
+
+def widgets_sidebar(graph: DocsGraph, categories: List[Dict]) -> List[Dict]:
+    """Widget 大全的侧边栏：概览页加上每个子目录一组"""
+    section = WIDGETS_SECTION
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for key in graph.pages:
+        parts = key.split("/")
+        if len(parts) == 3 and parts[0] == section:
+            groups[parts[1]].append(key)
+
+    # 分类的名称和顺序以爬虫的分类为准，之后是其他目录
+    category_names = {}
+    crawled_order: Dict[str, int] = {}
+    crawled_names: Dict[str, str] = {}
+    for category in categories:
+        category_names[category["category_id"]] = category["category_name"]
+        for i, widget in enumerate(category["widgets"]):
+            key = section + "/" + widget["file"][:-len(".md")]
+            crawled_order[key] = i
+            crawled_names[key] = widget["name"]
+    category_order = [c["category_id"] for c in categories if c["category_id"] in groups]
+    category_order += sorted(c for c in groups if c not in category_order)
+
+    def label(key: str) -> str:
+        """侧边栏中的文字：frontmatter 的 title（如 "Text 文本"），其次是爬虫记录的 Widget 名称和页面标题"""
+        return graph.pages[key]["frontmatter"].get("title") or crawled_names.get(key) or graph.title(key)
+
+    sidebar = []
+    overview = section + "/index"
+    if overview in graph.pages:
+        sidebar.append({
+            "text": WIDGETS_OVERVIEW_TEXT,
+            "items": [{"text": label(overview), "link": page_link(overview)}],
+        })
+
+    for category_id in category_order:
+        index_key = f"{section}/{category_id}/index"
+        # 目录页中链接的顺序
+        listed_order: Dict[str, int] = {}
+        if index_key in graph.pages:
+            for target, _ in graph.pages[index_key]["links"]:
+                key = graph.resolve(target)
+                if key and key not in listed_order:
+                    listed_order[key] = len(listed_order)
+
+        keys = [key for key in groups[category_id] if key != index_key]
+        keys.sort(key=lambda k: (
+            listed_order.get(k, len(listed_order)),
+            crawled_order.get(k, len(crawled_order)),
+            graph.title(k).lower(),
+        ))
+
+        items = [{"text": label(key), "link": page_link(key)} for key in keys]
+        has_index = index_key in graph.pages
+        if not items:
+            # 只有目录页的分类（如 clip）把目录页作为唯一的条目，没有页面的分类不显示
+            if not has_index:
+                continue
+            items = [{"text": label(index_key), "link": page_link(index_key)}]
+
+        group = {
+            "text": category_names.get(category_id) or (graph.title(index_key) if has_index else category_id),
+            # 只展开第一组
+            "collapsed": any("collapsed" in other for other in sidebar),
+            "items": items,
+        }
+        if has_index and keys:
+            group["link"] = page_link(index_key)
+        sidebar.append(group)
+    return sidebar
+
+
+def config_links(config_path: Path) -> List[str]:
+    """config.ts 中手写的导航栏和侧边栏链接"""
+    if not config_path.exists():
+        return []
+    content = config_path.read_text(encoding="utf-8")
+    return [link for link in _CONFIG_LINK.findall(content) if not _SCHEME.match(link)]
+
+
+def sidebar_links(sidebar: Dict[str, List[Dict]]) -> Iterator[str]:
+    def walk(items):
+        for item in items:
+            if item.get("link"):
+                yield item["link"]
+            yield from walk(item.get("items", []))
+    for items in sidebar.values():
+        yield from walk(items)
+
+
+def build_graph(docs_dir: Path, output_dir: Path, config_path: Path, cache: PageCache) -> Dict:
+    """扫描文档，写出 sidebar.json 和 backlinks.json，返回报告"""
+    graph = DocsGraph.scan(docs_dir, cache)
+
+    categories = load_widget_categories(docs_dir / WIDGETS_SECTION)
+    sidebar = {f"/{WIDGETS_SECTION}/": widgets_sidebar(graph, categories)}
+
+    writer = get_output_writer()
+    writer.write_json(output_dir / "sidebar.json", sidebar)
+    writer.write_json(output_dir / "backlinks.json", graph.backlink_map())
+
+    # config.ts 中的链接同样要指向存在的页面
+    missing = list(graph.missing)
+    listed = set()
+    for link in config_links(config_path):
+        target = resolve_link(link, "index")
+        if target is None:
+            continue
+        key = graph.resolve(target[0])
+        if key is None:
+            missing.append((".vitepress/config.ts", link))
+        else:
+            listed.add(key)
+    for link in sidebar_links(sidebar):
+        listed.add(graph.resolve(resolve_link(link, "index")[0]))
+
+    return {
+        "pages": len(graph.pages),
+        "missing": [{"source": source, "link": link} for source, link in missing],
+        "broken_anchors": [{"source": source, "link": link} for source, link in graph.broken_anchors],
+        "orphans": [page_link(key) for key in graph.orphans(listed)],
+    }
+
+
+def print_report(report: Dict):
+    def section(title, entries):
+        if not entries:
+            return
+        print(f"\n{title}（{len(entries)} 个）:")
+        for entry in entries:
+            print(f"  {entry}")
+
+    section("❌ 缺失页面", [f"{e['link']}  ← {e['source']}" for e in report["missing"]])
+    section("⚠️ 失效锚点", [f"{e['link']}  ← {e['source']}" for e in report["broken_anchors"]])
+    section("🔍 孤立页面", report["orphans"])
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文档页面关系图")
+    parser.add_argument("--docs", default=str(DOCS_DIR), help="文档目录")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT_DIR), help="sidebar.json / backlinks.json 的输出目录")
+    parser.add_argument("--config", default=str(CONFIG_PATH), help="VitePress 配置文件")
+    parser.add_argument("--full", action="store_true", help="忽略缓存，重新解析全部页面")
+    parser.add_argument("--report", help="把报告写入 JSON 文件")
+    parser.add_argument("--strict", action="store_true", help="有缺失页面时退出码为 1")
+    args = parser.parse_args()
+
+    cache = PageCache()
+    if args.full:
+        cache.pages.clear()
+    report = build_graph(Path(args.docs), Path(args.output), Path(args.config), cache)
+
+    print(f"✅ 共 {report['pages']} 个页面: {cache.parsed} 个重新解析, {cache.reused} 个使用缓存")
+    print_report(report)
+    get_output_writer().report()
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.strict and report["missing"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
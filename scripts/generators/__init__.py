@@ -0,0 +1,5 @@
+"""
+页面生成器注册表 - 生成 docs/modules 下由脚本维护的页面
+
+详见 registry.py 和 generate.py。
+"""
@@ -0,0 +1,149 @@
+"""
+页面生成 - 并行运行注册表中的生成器，跳过来源没有变化的页面
+
+每个页面记录上次生成时来源模块（pages/{name}.py）和输出文件的 SHA-256，保存在
+scripts/.cache/generators.json。两者都没有变化时认为页面是最新的，不导入来源模块；
+来源变化、输出文件被改动或删除时重新生成。输出文件只在内容变化时改写。
+
+使用方法（在 scripts 目录下执行）：
+    python generators/generate.py              # 生成全部页面
+    python generators/generate.py alipay       # 只生成指定页面
+    python generators/generate.py --full       # 忽略记录，全部重新生成
+    python generators/generate.py --list
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR
+from common.output import content_hash, get_output_writer
+from generators.registry import Generator, get_generators
+
+DOCS_DIR = SCRIPTS_DIR.parent / "docs"
+DEFAULT_STATE_PATH = CACHE_DIR / "generators.json"
+
+
+def file_hash(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+class GeneratorState:
+    """每个页面上次生成时的来源和输出哈希，线程安全"""
+
+    def __init__(self, path: Path = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+        self.pages: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.pages = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"读取生成记录失败，将全部重新生成: {e}")
+
+    def is_fresh(self, generator: Generator, source_hash: str, output_path: Path) -> bool:
+        entry = self.pages.get(generator.name)
+        return (
+            entry is not None
+            and entry["source"] == source_hash
+            and entry["output"] == file_hash(output_path)
+        )
+
+    def record(self, generator: Generator, source_hash: str, output_hash: str):
+        with self._lock:
+            self.pages[generator.name] = {"source": source_hash, "output": output_hash}
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.pages, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def run_generator(generator: Generator, docs_dir: Path, state: GeneratorState, full: bool = False) -> str:
+    """生成一个页面，返回结果：最新 / 已生成 / 未变化"""
+    output_path = docs_dir / generator.output
+    source_hash = file_hash(generator.source)
+    if not full and state.is_fresh(generator, source_hash, output_path):
+        return "最新"
+
+    content = generator.load()
+    changed = get_output_writer().write_text(output_path, content)
+    state.record(generator, source_hash, content_hash(content))
+    return "已生成" if changed else "未变化"
+
+
+def run_generators(
+    generators: List[Generator],
+    docs_dir: Path = DOCS_DIR,
+    state: Optional[GeneratorState] = None,
+    full: bool = False,
+    workers: int = 4,
+) -> Dict[str, str]:
+    """并行运行生成器，返回 {名称: 结果}"""
+    state = state or GeneratorState()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            generator.name: pool.submit(run_generator, generator, docs_dir, state, full)
+            for generator in generators
+        }
+        results = {}
+        try:
+            for name, future in futures.items():
+                results[name] = future.result()
+        finally:
+            state.save()
+    return results
+
+
+def main():
+    import argparse
+
+    registry = get_generators()
+
+    parser = argparse.ArgumentParser(description="生成 docs/ 下由脚本维护的页面")
+    parser.add_argument("names", nargs="*", metavar="name", help="只生成指定页面（默认全部）")
+    parser.add_argument("--docs", default=str(DOCS_DIR), help="文档目录")
+    parser.add_argument("--full", action="store_true", help="忽略生成记录，全部重新生成")
+    parser.add_argument("--workers", type=int, default=4, help="并行线程数")
+    parser.add_argument("--list", action="store_true", help="列出全部生成器")
+    args = parser.parse_args()
+
+    if args.list:
+        for generator in registry.values():
+            print(f"{generator.name:<16} docs/{generator.output}")
+        return
+
+    unknown = [name for name in args.names if name not in registry]
+    if unknown:
+        parser.error(f"未知的生成器: {', '.join(unknown)}（可用: {', '.join(registry)}）")
+    generators = [registry[name] for name in args.names] if args.names else list(registry.values())
+
+    results = run_generators(generators, Path(args.docs), full=args.full, workers=args.workers)
+    for name, result in results.items():
+        print(f"  {result:<4} {name} → docs/{registry[name].output}")
+    skipped = sum(1 for result in results.values() if result == "最新")
+    print(f"✅ 共 {len(results)} 个页面，{skipped} 个已是最新")
+    get_output_writer().report()
+
+
+if __name__ == "__main__":
+    main()
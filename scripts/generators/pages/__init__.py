@@ -0,0 +1,3 @@
+"""
+各页面的内容，每个模块定义 CONTENT
+"""
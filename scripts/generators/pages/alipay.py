@@ -1,9 +1,8 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import os
+"""
+支付宝支付 - docs/modules/payment/alipay.md
+"""
 
-# 支付宝支付文档
-alipay_content = """# 支付宝支付
+CONTENT = """# 支付宝支付
 
 Flutter 中集成支付宝支付，可以使用官方 SDK 或第三方封装插件。本章介绍如何在 Flutter 应用中接入支付宝支付功能。
 
@@ -330,12 +329,3 @@ app.post('/api/alipay/notify', async (req, res) => {
 - [App支付接入文档](https://opendocs.alipay.com/open/204/105297)
 - [tobias 插件](https://pub.dev/packages/tobias)
 """
-
-# 创建目录
-os.makedirs('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/payment', exist_ok=True)
-
-# 写入文件
-with open('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/payment/alipay.md', 'w', encoding='utf-8') as f:
-    f.write(alipay_content)
-
-print('Alipay doc created!')
@@ -1,8 +1,8 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import os
+"""
+App 在线更新 - docs/modules/app-update/index.md
+"""
 
-content = """# App 在线更新
+CONTENT = """# App 在线更新
 
 App 在线更新是移动应用的核心功能之一，用于检测新版本并引导用户升级。本文详解 Flutter 中实现 App 更新的完整方案。
 
@@ -950,10 +950,3 @@ class XUpdateService {
 - [upgrader](https://pub.dev/packages/upgrader)
 - [Android 应用内更新](https://developer.android.com/guide/playcore/in-app-updates)
 """
-
-os.makedirs('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/app-update', exist_ok=True)
-
-with open('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/app-update/index.md', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print('App update doc created!')
@@ -1,8 +1,8 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import os
+"""
+Flutter 热更新方案 - docs/modules/hotupdate/index.md
+"""
 
-content = """# Flutter 热更新方案
+CONTENT = """# Flutter 热更新方案
 
 Flutter 热更新是指在不重新发布 App 的情况下，动态更新应用的 UI 或逻辑。由于 Flutter 使用 AOT 编译，原生热更新较为困难，但社区提供了多种解决方案。
 
@@ -537,10 +537,3 @@ class HotUpdateManager {
 - [Fair](https://github.com/niceshiki/fair)
 - [MXFlutter](https://github.com/niceshiki/mxflutter)
 """
-
-os.makedirs('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/hotupdate', exist_ok=True)
-
-with open('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/hotupdate/index.md', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print('Hot update doc created!')
@@ -1,8 +1,8 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import os
+"""
+微信登录与分享 - docs/modules/payment/wechat-login-share.md
+"""
 
-content = """# 微信登录与分享
+CONTENT = """# 微信登录与分享
 
 Flutter 中集成微信登录和分享功能，同样使用 fluwx 插件。本章介绍微信授权登录和内容分享的完整实现。
 
@@ -539,8 +539,3 @@ void dispose() {
 - [微信登录开发指南](https://developers.weixin.qq.com/doc/oplatform/Mobile_App/WeChat_Login/Development_Guide.html)
 - [fluwx 文档](https://pub.dev/packages/fluwx)
 """
-
-with open('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/payment/wechat-login-share.md', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print('Wechat login & share doc created!')
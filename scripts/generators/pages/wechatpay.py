@@ -1,8 +1,8 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-import os
+"""
+微信支付 - docs/modules/payment/wechatpay.md
+"""
 
-content = """# 微信支付
+CONTENT = """# 微信支付
 
 Flutter 中集成微信支付需要使用微信 SDK，可以通过 fluwx 插件实现。本章介绍如何在 Flutter 应用中接入微信支付功能。
 
@@ -385,8 +385,3 @@ app.post('/api/wechat/pay/notify', async (req, res) => {
 - [微信支付 V3 API](https://pay.weixin.qq.com/wiki/doc/apiv3/index.shtml)
 - [fluwx 插件](https://pub.dev/packages/fluwx)
 """
-
-with open('/Users/ab/Desktop/go/flutter_tutorial/docs/modules/payment/wechatpay.md', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print('Wechat pay doc created!')
@@ -0,0 +1,44 @@
+"""
+页面生成器注册表
+
+每个生成器对应 pages/ 下的一个模块，模块中的 CONTENT 是页面的完整内容。注册表只记录
+模块名和输出路径，页面内容在需要重新生成时才导入模块读取。
+
+新增页面时在 pages/ 下添加模块，并在 GENERATORS 中登记输出路径（相对 docs/）。
+"""
+
+import importlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+
+
+@dataclass(frozen=True)
+class Generator:
+    name: str
+    # 相对 docs/ 的输出路径
+    output: str
+
+    @property
+    def source(self) -> Path:
+        return PAGES_DIR / f"{self.name}.py"
+
+    def load(self) -> str:
+        """导入页面模块，返回页面内容"""
+        module = importlib.import_module(f"generators.pages.{self.name}")
+        return module.CONTENT
+
+
+GENERATORS: List[Generator] = [
+    Generator("alipay", "modules/payment/alipay.md"),
+    Generator("wechatpay", "modules/payment/wechatpay.md"),
+    Generator("wechat_share", "modules/payment/wechat-login-share.md"),
+    Generator("app_update", "modules/app-update/index.md"),
+    Generator("hotupdate", "modules/hotupdate/index.md"),
+]
+
+
+def get_generators() -> Dict[str, Generator]:
+    return {generator.name: generator for generator in GENERATORS}
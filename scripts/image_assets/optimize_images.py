@@ -0,0 +1,385 @@
+"""
+文档图片优化 - 无损压缩原图，生成 WebP / AVIF 和多种宽度的响应式版本
+
+处理 docs/ 下被页面引用的 PNG / JPEG 图片（Markdown 的 ![](...) 和 <img src>；没有页面引用的图片
+不会出现在构建产物中，不做处理）：
+1. PNG 原图用 Pillow 的 optimize 重新压缩（像素不变，去掉元数据），变小时替换原文件；
+   JPEG 重新编码会损失画质，原图保持不变
+2. 为每张图片生成 WebP 和 AVIF 版本，宽度为 RESPONSIVE_WIDTHS 中小于原图的宽度加上原图宽度，
+   输出到 docs/public/images/{原图相对 docs 的目录}/{文件名}-{宽度}w.{格式}
+3. 写出 docs/public/images/manifest.json，记录每张原图的尺寸和各版本的地址；VitePress 配置
+   （docs/.vitepress/config.ts）据此把页面中的这些图片渲染为带 srcset 的 <picture>
+
+处理在进程池中并行执行，结果按原图内容的 SHA-256 缓存在 scripts/.cache/images，
+只有新增或内容变化的图片才会重新处理。运行结束时输出每张图片处理前后的大小。
+
+需要 Pillow（pip install -r requirements.txt）；Pillow 不支持 AVIF 时只生成 WebP。
+
+使用方法（在 scripts 目录下执行）：
+    python image_assets/optimize_images.py
+    python image_assets/optimize_images.py --widths 640,1280 --formats webp --workers 4
+    python image_assets/optimize_images.py --full
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from PIL import Image, features
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR
+from common.output import get_output_writer
+
+DOCS_DIR = SCRIPTS_DIR.parent / "docs"
+DEFAULT_OUTPUT_DIR = DOCS_DIR / "public" / "images"
+DEFAULT_CACHE_DIR = CACHE_DIR / "images"
+
+# 站点上 docs/public/images 对应的路径（不含 base）
+OUTPUT_URL_PREFIX = "/images"
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+# 不处理的目录：VitePress 配置、依赖，以及 public（包括本脚本的输出目录）
+EXCLUDED_DIRS = {".vitepress", "node_modules", "public"}
+
+RESPONSIVE_WIDTHS = (480, 960, 1440)
+
+FORMATS = ("webp", "avif")
+DEFAULT_QUALITY = {"webp": 82, "avif": 60}
+
+# 处理参数或缓存格式变化时修改，使缓存全部失效
+PIPELINE_VERSION = 2
+
+# 页面中的图片引用：Markdown 图片和 HTML <img>
+_MARKDOWN_IMAGE = re.compile(r"!\[[^\]]*\]\(\s*<?([^)\s>]+)")
+_HTML_IMAGE = re.compile(r"<img\b[^>]*\bsrc=[\"']([^\"']+)[\"']", re.I)
+
+
+def is_excluded(relative: Path) -> bool:
+    return bool(EXCLUDED_DIRS.intersection(relative.parts))
+
+
+def resolve_image(docs_dir: Path, page: Path, src: str) -> Optional[Path]:
+    """页面中的图片地址 → docs 下的原图，外部地址或不是 PNG / JPEG 时返回 None"""
+    src = src.split("#", 1)[0].split("?", 1)[0]
+    if not src or "://" in src or src.startswith(("data:", "//")):
+        return None
+    if Path(src).suffix.lower() not in IMAGE_SUFFIXES:
+        return None
+    path = docs_dir / src.lstrip("/") if src.startswith("/") else page.parent / src
+    path = Path(os.path.normpath(path))
+    try:
+        relative = path.relative_to(docs_dir)
+    except ValueError:
+        return None
+    if is_excluded(relative) or not path.is_file():
+        return None
+    return path
+
+
+def find_images(docs_dir: Path) -> Iterator[Path]:
+    """被页面引用的图片"""
+    images = set()
+    for page in docs_dir.rglob("*.md"):
+        if is_excluded(page.relative_to(docs_dir)):
+            continue
+        text = page.read_text(encoding="utf-8")
+        for match in (*_MARKDOWN_IMAGE.finditer(text), *_HTML_IMAGE.finditer(text)):
+            path = resolve_image(docs_dir, page, match.group(1))
+            if path is not None:
+                images.add(path)
+    yield from sorted(images)
+
+
+def available_formats(formats: Sequence[str]) -> List[str]:
+    """去掉当前 Pillow 不支持的格式"""
+    supported = []
+    for fmt in formats:
+        if features.check(fmt):
+            supported.append(fmt)
+        else:
+            print(f"⚠️ 当前 Pillow 不支持 {fmt.upper()}，跳过该格式")
+    return supported
+
+
+def target_widths(width: int, widths: Sequence[int]) -> List[int]:
+    """小于原图的响应式宽度加上原图宽度，不放大"""
+    return sorted({w for w in widths if w < width} | {width})
+
+
+def recompress_png(image: Image.Image, original: bytes) -> Optional[bytes]:
+    """无损重新压缩 PNG，比原文件小时返回新内容"""
+    buffer = io.BytesIO()
+    params = {"optimize": True}
+    if image.info.get("icc_profile"):
+        params["icc_profile"] = image.info["icc_profile"]
+    image.save(buffer, "PNG", **params)
+    data = buffer.getvalue()
+    return data if len(data) < len(original) else None
+
+
+def process_image(task: Tuple[str, str, str, List[int], List[str], Dict[str, int]]) -> Dict:
+    """在子进程中处理一张图片，结果写入缓存目录，返回缓存条目"""
+    source, digest, cache_dir, widths, formats, quality = task
+    entry_dir = Path(cache_dir) / digest
+    entry_dir.mkdir(parents=True, exist_ok=True)
+
+    original = Path(source).read_bytes()
+    with Image.open(io.BytesIO(original)) as image:
+        image.load()
+        width, height = image.size
+
+        optimized = None
+        if image.format == "PNG":
+            optimized = recompress_png(image, original)
+            if optimized is not None:
+                (entry_dir / "optimized.png").write_bytes(optimized)
+
+        # WebP / AVIF 支持透明通道，其余模式统一转为 RGB / RGBA
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        base = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = []
+    for target in target_widths(width, widths):
+        resized = base if target == width else base.resize(
+            (target, max(1, round(height * target / width))), Image.LANCZOS
+        )
+        for fmt in formats:
+            name = f"{target}w.{fmt}"
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), quality=quality[fmt])
+            (entry_dir / name).write_bytes(buffer.getvalue())
+            variants.append({
+                "file": name, "format": fmt, "width": target,
+                "height": resized.height, "bytes": buffer.tell(),
+            })
+
+    return {
+        "version": PIPELINE_VERSION,
+        "widths": list(widths),
+        "formats": list(formats),
+        "quality": quality,
+        "width": width,
+        "height": height,
+        "bytes": len(original),
+        "optimized_bytes": len(optimized) if optimized is not None else None,
+        "variants": variants,
+    }
+
+
+class ImageCache:
+    """按原图内容哈希保存的处理结果"""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def get(self, digest: str, widths: Sequence[int], formats: Sequence[str], quality: Dict[str, int]) -> Optional[Dict]:
+        """处理参数相同且文件齐全时返回缓存条目"""
+        meta_path = self.cache_dir / digest / "meta.json"
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (entry.get("version") != PIPELINE_VERSION or entry.get("widths") != list(widths)
+                or entry.get("formats") != list(formats) or entry.get("quality") != quality):
+            return None
+        files = [variant["file"] for variant in entry["variants"]]
+        if entry["optimized_bytes"] is not None:
+            files.append("optimized.png")
+        if not all((self.cache_dir / digest / name).exists() for name in files):
+            return None
+        return entry
+
+    def put(self, digest: str, entry: Dict):
+        meta_path = self.cache_dir / digest / "meta.json"
+        tmp_path = meta_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, meta_path)
+
+    def alias(self, digest: str, optimized_digest: str, entry: Dict):
+        """原图替换为压缩后的版本后，新内容的哈希也指向同一组结果
+
+        新条目的 bytes 是压缩后的大小，original_bytes 保留最初的原图大小，报告中的
+        "原图" 列不会在第二次运行后变成压缩后的大小。
+        """
+        if optimized_digest == digest:
+            return
+        target = self.cache_dir / optimized_digest
+        if target.exists():
+            shutil.rmtree(target)
+        shutil.copytree(self.cache_dir / digest, target)
+        if (target / "optimized.png").exists():
+            (target / "optimized.png").unlink()
+        self.put(optimized_digest, {
+            **entry,
+            "bytes": entry["optimized_bytes"],
+            "optimized_bytes": None,
+            "original_bytes": entry.get("original_bytes", entry["bytes"]),
+        })
+
+    def read(self, digest: str, name: str) -> bytes:
+        return (self.cache_dir / digest / name).read_bytes()
+
+
+def format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+
+def optimize_images(
+    docs_dir: Path = DOCS_DIR,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    widths: Sequence[int] = RESPONSIVE_WIDTHS,
+    formats: Sequence[str] = FORMATS,
+    quality: Optional[Dict[str, int]] = None,
+    workers: Optional[int] = None,
+    cache: Optional[ImageCache] = None,
+) -> List[Dict]:
+    """处理全部图片，返回每张图片的报告"""
+    cache = cache or ImageCache()
+    formats = available_formats(formats)
+    quality = {fmt: (quality or DEFAULT_QUALITY)[fmt] for fmt in formats}
+
+    images = []
+    tasks = []
+    for path in find_images(docs_dir):
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        images.append((path, digest))
+        if cache.get(digest, widths, formats, quality) is None:
+            tasks.append((str(path), digest, str(cache.cache_dir), list(widths), formats, quality))
+
+    if tasks:
+        print(f"处理 {len(tasks)} 张新增或变化的图片（共 {len(images)} 张）...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for task, entry in zip(tasks, pool.map(process_image, tasks)):
+                cache.put(task[1], entry)
+
+    writer = get_output_writer()
+    manifest: Dict[str, Dict] = {}
+    written = set()
+    reports = []
+    for path, digest in images:
+        entry = cache.get(digest, widths, formats, quality)
+        relative = path.relative_to(docs_dir)
+
+        if entry["optimized_bytes"] is not None:
+            optimized = cache.read(digest, "optimized.png")
+            writer.write_bytes(path, optimized)
+            cache.alias(digest, hashlib.sha256(optimized).hexdigest(), entry)
+
+        sources: Dict[str, List[Dict]] = {}
+        for variant in entry["variants"]:
+            output_path = output_dir / relative.parent / f"{path.stem}-{variant['file']}"
+            writer.write_bytes(output_path, cache.read(digest, variant["file"]))
+            written.add(output_path)
+            sources.setdefault(variant["format"], []).append({
+                "url": f"{OUTPUT_URL_PREFIX}/{output_path.relative_to(output_dir).as_posix()}",
+                "width": variant["width"],
+                "height": variant["height"],
+            })
+        manifest[relative.as_posix()] = {"width": entry["width"], "height": entry["height"], "sources": sources}
+
+        full_width = {variant["format"]: variant["bytes"] for variant in entry["variants"]
+                      if variant["width"] == entry["width"]}
+        reports.append({
+            "path": relative.as_posix(),
+            "before": entry.get("original_bytes", entry["bytes"]),
+            "after": entry["optimized_bytes"] or entry["bytes"],
+            **full_width,
+        })
+
+    manifest_path = output_dir / "manifest.json"
+    writer.write_json(manifest_path, manifest)
+    written.add(manifest_path)
+
+    # 删除原图已删除或参数变化后不再生成的文件
+    if output_dir.exists():
+        for path in output_dir.rglob("*"):
+            if path.is_file() and path not in written:
+                path.unlink()
+        # 由深到浅删除空目录
+        for path in sorted(output_dir.rglob("*"), key=lambda p: len(p.parts), reverse=True):
+            if path.is_dir() and not any(path.iterdir()):
+                path.rmdir()
+
+    return reports
+
+
+def print_report(reports: List[Dict]):
+    """输出处理前后的大小，WebP / AVIF 为原尺寸版本的大小"""
+    if not reports:
+        print("没有页面引用的图片")
+        return
+    formats = [fmt for fmt in FORMATS if fmt in reports[0]]
+    # 表头中每个汉字占两列
+    header = f"{'图片':<46}{'原图':>8}{'压缩后':>7}" + "".join(f"{fmt.upper():>10}" for fmt in formats)
+    print("\n" + header)
+    totals = {"before": 0, "after": 0, **{fmt: 0 for fmt in formats}}
+    for report in reports:
+        row = f"{report['path']:<48}{format_size(report['before']):>10}{format_size(report['after']):>10}"
+        for fmt in formats:
+            row += f"{format_size(report.get(fmt, 0)):>10}"
+            totals[fmt] += report.get(fmt, 0)
+        totals["before"] += report["before"]
+        totals["after"] += report["after"]
+        print(row)
+
+    row = f"{'合计':<46}{format_size(totals['before']):>10}{format_size(totals['after']):>10}"
+    for fmt in formats:
+        row += f"{format_size(totals[fmt]):>10}"
+    print(row)
+    for fmt in formats:
+        saved = 1 - totals[fmt] / totals["before"] if totals["before"] else 0
+        print(f"原尺寸 {fmt.upper()} 比原图小 {saved:.0%}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文档图片优化")
+    parser.add_argument("--docs", default=str(DOCS_DIR), help="文档目录")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT_DIR), help="WebP / AVIF 版本的输出目录")
+    parser.add_argument("--widths", default=",".join(map(str, RESPONSIVE_WIDTHS)), help="响应式宽度，逗号分隔")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="生成的格式，逗号分隔")
+    parser.add_argument("--webp-quality", type=int, default=DEFAULT_QUALITY["webp"], help="WebP 质量")
+    parser.add_argument("--avif-quality", type=int, default=DEFAULT_QUALITY["avif"], help="AVIF 质量")
+    parser.add_argument("--workers", type=int, help="进程数（默认为 CPU 核数）")
+    parser.add_argument("--full", action="store_true", help="清空缓存，重新处理全部图片")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"不支持的格式: {', '.join(sorted(unknown))}，可用: {', '.join(FORMATS)}")
+
+    cache = ImageCache()
+    if args.full and cache.cache_dir.exists():
+        shutil.rmtree(cache.cache_dir)
+
+    reports = optimize_images(
+        Path(args.docs),
+        Path(args.output),
+        widths=[int(width) for width in args.widths.split(",")],
+        formats=formats,
+        quality={"webp": args.webp_quality, "avif": args.avif_quality},
+        workers=args.workers,
+        cache=cache,
+    )
+    print_report(reports)
+    get_output_writer().report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+文档外部链接检查 - 找出 docs/ 下失效的外部链接
+
+从全部 Markdown 页面（包括爬虫生成的 docs/news 和 docs/widgets）中提取外部链接：
+Markdown 链接、<https://...> 自动链接、HTML 的 href / src 属性和正文中的裸链接。
+代码块和行内代码中的地址是示例，不检查；example.com、localhost 等占位地址也跳过。
+
+同一个地址（去掉 #锚点）只检查一次。检查时先发 HEAD，HEAD 失败或服务器不支持时再发 GET
+（只读取响应头）；429 / 5xx 按 common.retry 的退避策略重试，并按主机限制并发数。
+
+结果保存在 scripts/.cache/link_check.json：正常的链接 TTL_DAYS 天内不再检查，
+失效的链接 BROKEN_TTL_DAYS 天后重新检查。每晚运行时只检查过期和新增的地址。
+
+有失效链接时退出码为 1。
+
+使用方法（在 scripts 目录下执行）：
+    python link_checker/check_links.py
+    python link_checker/check_links.py --max-per-host 2 --ttl-days 14
+    python link_checker/check_links.py --full --report /tmp/links.json
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlsplit
+
+import aiohttp
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR, retry
+
+DOCS_DIR = SCRIPTS_DIR.parent / "docs"
+DEFAULT_CACHE_PATH = CACHE_DIR / "link_check.json"
+
+EXCLUDED_DIRS = {".vitepress", "node_modules", "public"}
+
+# 正常的链接多少天后重新检查
+TTL_DAYS = 7
+# 失效的链接多少天后重新检查（可能只是暂时不可用）
+BROKEN_TTL_DAYS = 1
+
+# 每个主机的最大并发请求数和全部请求的最大并发数
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_MAX_TOTAL = 32
+
+REQUEST_TIMEOUT = 20
+
+# 示例和占位地址，不检查
+IGNORED_HOSTS = {
+    "example.com", "api.example.com", "localhost", "127.0.0.1", "0.0.0.0", "10.0.2.2",
+    "your-server.com", "your-nft-site.com",
+}
+
+# HEAD 返回这些状态时改用 GET 再试一次（很多服务器不支持或错误处理 HEAD）
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 502, 503}
+
+USER_AGENT = "Mozilla/5.0 (compatible; FlutterDocsLinkChecker/1.0)"
+
+_FENCED_CODE = re.compile(r"^(`{3,}|~{3,}).*?^\1", re.S | re.M)
+_INLINE_CODE = re.compile(r"`[^`\n]+`")
+_MARKDOWN_LINK = re.compile(r"\]\((https?://[^)\s]+)")
+_AUTOLINK = re.compile(r"<(https?://[^>\s]+)>")
+_HTML_ATTRIBUTE = re.compile(r"(?:href|src)=[\"'](https?://[^\"']+)[\"']")
+_BARE_URL = re.compile(r"https?://[^\s<>\"'`()\[\]{}，。、；：！？（）]+")
+_TRAILING_PUNCTUATION = ".,;:!?*_"
+
+
+def extract_links(content: str, ignored_hosts: Set[str] = IGNORED_HOSTS) -> Iterator[Tuple[str, int]]:
+    """提取页面中的外部链接，返回 (地址, 行号)"""
+    # 代码替换为等长的空白，保持行号不变
+    blank = lambda match: re.sub(r"[^\n]", " ", match.group(0))
+    content = _FENCED_CODE.sub(blank, content)
+    content = _INLINE_CODE.sub(blank, content)
+
+    for lineno, line in enumerate(content.splitlines(), 1):
+        urls = set()
+        for pattern in (_MARKDOWN_LINK, _AUTOLINK, _HTML_ATTRIBUTE):
+            urls.update(pattern.findall(line))
+        for url in _BARE_URL.findall(line):
+            # 已经作为 Markdown 链接等提取过的地址不再重复加入
+            if not any(found.startswith(url) or url.startswith(found) for found in urls):
+                urls.add(url)
+        for url in urls:
+            url = urldefrag(url.rstrip(_TRAILING_PUNCTUATION))[0]
+            host = urlsplit(url).hostname or ""
+            # 跳过占位地址和 "https://你的域名" 这类说明文字
+            if "." in host and host.isascii() and host not in ignored_hosts:
+                yield url, lineno
+
+
+def collect_links(docs_dir: Path, ignored_hosts: Set[str] = IGNORED_HOSTS) -> Dict[str, List[str]]:
+    """全部页面中的链接，键为地址，值为出现的位置（页面:行号）"""
+    links: Dict[str, List[str]] = {}
+    for path in sorted(docs_dir.rglob("*.md")):
+        relative = path.relative_to(docs_dir)
+        if EXCLUDED_DIRS.intersection(relative.parts):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for url, lineno in extract_links(content, ignored_hosts):
+            links.setdefault(url, []).append(f"{relative.as_posix()}:{lineno}")
+    return links
+
+
+@dataclass
+class LinkResult:
+    """一个地址的检查结果"""
+    url: str
+    ok: bool
+    status: Optional[int] = None
+    error: str = ""
+    final_url: str = ""
+    method: str = "HEAD"
+    checked_at: float = field(default_factory=time.time)
+
+
+class LinkCache:
+    """按地址保存的检查结果"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, ttl_days: float = TTL_DAYS,
+                 broken_ttl_days: float = BROKEN_TTL_DAYS):
+        self.path = Path(path)
+        self.ttl = ttl_days * 86400
+        self.broken_ttl = broken_ttl_days * 86400
+        self.results: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.results = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"读取链接检查缓存失败，将重新检查: {e}")
+
+    def fresh(self, url: str, now: Optional[float] = None) -> Optional[Dict]:
+        """未过期的检查结果"""
+        result = self.results.get(url)
+        if result is None:
+            return None
+        ttl = self.ttl if result["ok"] else self.broken_ttl
+        if (now or time.time()) - result["checked_at"] > ttl:
+            return None
+        return result
+
+    def put(self, result: LinkResult):
+        with self._lock:
+            self.results[result.url] = {
+                "ok": result.ok,
+                "status": result.status,
+                "error": result.error,
+                "final_url": result.final_url,
+                "method": result.method,
+                "checked_at": result.checked_at,
+            }
+            self._dirty = True
+
+    def prune(self, urls: Set[str]):
+        """删除已经不在文档中的地址"""
+        with self._lock:
+            for url in list(self.results):
+                if url not in urls:
+                    del self.results[url]
+                    self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+class LinkChecker:
+    """HEAD 优先、失败时改用 GET 的并发链接检查，按主机限制并发"""
+
+    def __init__(self, session: aiohttp.ClientSession, max_per_host: int = DEFAULT_MAX_PER_HOST,
+                 retries: int = retry.DEFAULT_RETRIES):
+        self.session = session
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+    async def _request(self, method: str, url: str, retries: int) -> Tuple[int, str]:
+        """发送请求（不读取响应体），429 / 5xx 时退避重试，返回 (状态码, 最终地址)"""
+        attempt = 0
+        while True:
+            async with self._semaphore(url):
+                async with self.session.request(method, url, allow_redirects=True) as response:
+                    status = response.status
+                    final_url = str(response.url)
+                    retry_after = retry.parse_retry_after(response.headers.get("Retry-After"))
+            if status not in retry.RETRY_STATUSES or attempt >= retries:
+                return status, final_url
+            # 在信号量外等待，不占用该主机的并发名额
+            await asyncio.sleep(retry.backoff_delay(attempt, retry_after))
+            attempt += 1
+
+    async def check(self, url: str) -> LinkResult:
+        head_error = ""
+        try:
+            # HEAD 失败时直接改用 GET，重试留给 GET
+            status, final_url = await self._request("HEAD", url, 0)
+            if status < 400:
+                return LinkResult(url, True, status, final_url=final_url)
+            if status not in HEAD_FALLBACK_STATUSES:
+                return LinkResult(url, False, status, final_url=final_url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            head_error = str(e) or type(e).__name__
+
+        try:
+            status, final_url = await self._request("GET", url, self.retries)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return LinkResult(url, False, error=str(e) or head_error or type(e).__name__, method="GET")
+        return LinkResult(url, status < 400, status, final_url=final_url, method="GET")
+
+
+async def check_urls(urls: List[str], max_per_host: int = DEFAULT_MAX_PER_HOST,
+                     max_total: int = DEFAULT_MAX_TOTAL, cache: Optional[LinkCache] = None) -> List[LinkResult]:
+    """并发检查全部地址，每完成一个写入缓存"""
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=max_total, limit_per_host=max_per_host)
+    headers = {"User-Agent": USER_AGENT}
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector, headers=headers) as session:
+        checker = LinkChecker(session, max_per_host)
+        results = []
+        done = 0
+        for future in asyncio.as_completed([checker.check(url) for url in urls]):
+            result = await future
+            results.append(result)
+            if cache is not None:
+                cache.put(result)
+            done += 1
+            if done % 50 == 0 or done == len(urls):
+                print(f"  已检查 {done}/{len(urls)}")
+        return results
+
+
+def print_report(links: Dict[str, List[str]], cache: LinkCache):
+    """输出失效链接及其所在位置，返回失效链接数"""
+    broken = [(url, cache.results[url]) for url in sorted(links) if not cache.results[url]["ok"]]
+    redirected = sum(
+        1 for url in links
+        if cache.results[url]["ok"] and cache.results[url]["final_url"] not in ("", url)
+    )
+    for url, result in broken:
+        reason = f"HTTP {result['status']}" if result["status"] else result["error"]
+        print(f"\n❌ {url}  ({reason})")
+        for location in links[url][:5]:
+            print(f"    {location}")
+        if len(links[url]) > 5:
+            print(f"    ... 共 {len(links[url])} 处")
+    print(f"\n共 {len(links)} 个外部链接: {len(links) - len(broken)} 个正常（{redirected} 个有重定向），{len(broken)} 个失效")
+    return len(broken)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文档外部链接检查")
+    parser.add_argument("--docs", default=str(DOCS_DIR), help="文档目录")
+    parser.add_argument("--max-per-host", type=int, default=DEFAULT_MAX_PER_HOST, help="每个主机的最大并发数")
+    parser.add_argument("--max-total", type=int, default=DEFAULT_MAX_TOTAL, help="全部请求的最大并发数")
+    parser.add_argument("--ttl-days", type=float, default=TTL_DAYS, help="正常链接的缓存天数")
+    parser.add_argument("--broken-ttl-days", type=float, default=BROKEN_TTL_DAYS, help="失效链接的缓存天数")
+    parser.add_argument("--full", action="store_true", help="忽略缓存，重新检查全部链接")
+    parser.add_argument("--ignore-host", action="append", default=[], help="额外跳过的主机，可以重复指定")
+    parser.add_argument("--report", help="把失效链接写入 JSON 文件")
+    args = parser.parse_args()
+
+    links = collect_links(Path(args.docs), IGNORED_HOSTS | set(args.ignore_host))
+    cache = LinkCache(ttl_days=args.ttl_days, broken_ttl_days=args.broken_ttl_days)
+    now = time.time()
+    pending = [url for url in links if args.full or cache.fresh(url, now) is None]
+    print(f"共 {len(links)} 个外部链接，{len(links) - len(pending)} 个使用缓存，检查 {len(pending)} 个")
+
+    start = time.perf_counter()
+    if pending:
+        try:
+            asyncio.run(check_urls(pending, args.max_per_host, args.max_total, cache))
+        finally:
+            cache.prune(set(links))
+            cache.save()
+    else:
+        cache.prune(set(links))
+        cache.save()
+    print(f"耗时 {time.perf_counter() - start:.1f} 秒")
+
+    broken = print_report(links, cache)
+    if args.report:
+        report = {
+            url: {**cache.results[url], "locations": links[url]}
+            for url in sorted(links) if not cache.results[url]["ok"]
+        }
+        Path(args.report).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if broken:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
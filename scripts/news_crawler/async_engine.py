@@ -0,0 +1,296 @@
+"""
+基于 asyncio 的并发抓取引擎
+
+与 news_crawler.py 中的同步 fetch_* 函数产出相同的 NewsItem 列表，
+区别在于博客、版本发布以及每个 pub.dev 包的请求全部并发执行：
+
+- 所有请求共用一个 aiohttp.ClientSession（复用连接）
+- 按主机名限制并发数，避免对单个站点请求过快
+- 与同步引擎共用 HTTP 校验器存储，未变化的地址返回 304 时复用上次结果
+- 429 / 5xx 和连接错误时按 common.transport 的退避策略重试
+- 每个请求的耗时、字节数、状态码和重试次数记录到 common.metrics
+
+使用方法：
+    python news_crawler.py --engine async
+    python news_crawler.py --engine async --max-per-host 8
+"""
+
+import asyncio
+import json
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from news_crawler import (
+    FLUTTER_BLOG_RSS,
+    FLUTTER_RELEASES_API,
+    PUB_DEV_API,
+    POPULAR_PACKAGES,
+    BLOG_HEADERS,
+    BLOG_LIMIT,
+    FEED_CHUNK_SIZE,
+    GITHUB_HEADERS,
+    PACKAGE_LIMIT,
+    RELEASES_LIMIT,
+    FeedReader,
+    NewsItem,
+    get_release_store,
+    get_validator_store,
+    items_from_payload,
+    items_to_payload,
+    next_page_url,
+    package_payload,
+    parse_releases,
+    parse_package,
+    translate_blog_items,
+)
+from common import transport
+from common.metrics import Call, get_metrics
+
+# 每个主机默认的最大并发请求数
+DEFAULT_MAX_PER_HOST = 4
+
+
+class AsyncFetcher:
+    """共享 ClientSession，并按主机限制并发的抓取器"""
+
+    def __init__(self, session: aiohttp.ClientSession, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        self.session = session
+        self.max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._semaphores[host]
+
+    async def get(
+        self,
+        url: str,
+        headers: Optional[Dict] = None,
+        timeout: float = 30,
+        retries: int = transport.DEFAULT_RETRIES,
+        consume: Optional[Callable[[bytes], bool]] = None,
+    ) -> Tuple[int, bytes, Mapping[str, str]]:
+        """发送 GET 请求，返回 (状态码, 响应体, 响应头)，429 / 5xx 时退避重试
+
+        指定 consume 时，200 响应的数据分段交给 consume 处理而不是整体返回，
+        consume 返回 True 表示已读到需要的内容，剩余数据不再读取。
+        consume 收到数据后连接中断或超时不会重试，直接抛出异常。
+        """
+        with get_metrics().timed("fetch", urlsplit(url).netloc) as call:
+            status, body, response_headers = await self._get(url, headers, timeout, retries, consume, call)
+            call.status = status
+            call.ok = status < 400
+            return status, body, response_headers
+
+    async def _get(
+        self,
+        url: str,
+        headers: Optional[Dict],
+        timeout: float,
+        retries: int,
+        consume: Optional[Callable[[bytes], bool]],
+        call: Call,
+    ) -> Tuple[int, bytes, Mapping[str, str]]:
+        attempt = 0
+        # consume 已经收到过数据时不能重试：重新请求的响应体会从头再交给同一个 consume
+        streamed = False
+        while True:
+            retry_after = None
+            try:
+                async with self._semaphore(url):
+                    async with self.session.get(
+                        url,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=timeout),
+                    ) as response:
+                        if consume is not None and response.status == 200:
+                            async for chunk in response.content.iter_chunked(FEED_CHUNK_SIZE):
+                                call.bytes += len(chunk)
+                                streamed = True
+                                if consume(chunk):
+                                    break
+                            return response.status, b"", response.headers
+                        body = await response.read()
+                        call.bytes = len(body)
+                        if response.status not in transport.RETRY_STATUSES or attempt >= retries:
+                            return response.status, body, response.headers
+                        retry_after = transport.parse_retry_after(response.headers.get("Retry-After"))
+                        print(f"  {urlsplit(url).netloc} 返回 {response.status}，稍后重试 ({attempt + 1}/{retries})")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if streamed or attempt >= retries:
+                    raise
+            # 退避等待时不占用主机的并发名额
+            await asyncio.sleep(transport.backoff_delay(attempt, retry_after))
+            attempt += 1
+            call.retries = attempt
+
+
+async def fetch_flutter_blog_async(fetcher: AsyncFetcher) -> List[NewsItem]:
+    """并发版 fetch_flutter_blog"""
+    news = []
+    store = get_validator_store()
+
+    try:
+        print("正在获取 Flutter 博客...")
+        # 边下载边解析，读到 BLOG_LIMIT 篇后不再读取剩余数据
+        reader = FeedReader(BLOG_LIMIT)
+
+        def consume(chunk: bytes) -> bool:
+            reader.feed(chunk)
+            return reader.done
+
+        status, _, headers = await fetcher.get(
+            FLUTTER_BLOG_RSS,
+            headers={**BLOG_HEADERS, **store.conditional_headers(FLUTTER_BLOG_RSS)},
+            timeout=30,
+            consume=consume
+        )
+        if status == 304:
+            news = items_from_payload(store.load(FLUTTER_BLOG_RSS))
+            print("  RSS 未变化，复用上次结果")
+        else:
+            if status >= 400:
+                raise RuntimeError(f"HTTP {status}")
+            if not reader.done:
+                reader.close()
+            print(f"  读取 {len(reader.items)} 篇文章")
+            # 翻译时会同步调用接口，放到线程中执行以免阻塞事件循环
+            news = await asyncio.to_thread(translate_blog_items, reader.items)
+            store.save(FLUTTER_BLOG_RSS, headers, items_to_payload(news))
+        print(f"  ✅ 获取到 {len(news)} 条博客文章")
+
+    except Exception as e:
+        print(f"  ❌ 获取博客失败: {e}")
+
+    return news
+
+
+async def sync_releases_async(fetcher: AsyncFetcher) -> int:
+    """并发版 sync_releases（翻页本身是顺序的，只是不阻塞其他来源）"""
+    releases = get_release_store()
+    store = get_validator_store()
+    before = len(releases.releases)
+    url = releases.sync_url(FLUTTER_RELEASES_API)
+    first_page = True
+    reached_end = False
+
+    while url:
+        headers = dict(GITHUB_HEADERS)
+        if first_page and releases.complete:
+            headers.update(store.conditional_headers(url))
+        status, body, response_headers = await fetcher.get(url, headers=headers, timeout=30)
+        if status == 304:
+            store.load(url)
+            break
+        if status >= 400:
+            raise RuntimeError(f"HTTP {status}")
+
+        page = json.loads(body)
+        if first_page:
+            store.save(url, response_headers, [release.get("tag_name") for release in page])
+        first_page = False
+
+        next_url = next_page_url(response_headers)
+        reached_end = next_url is None
+        url = next_url if releases.merge_page(page) else None
+
+    releases.mark_synced(reached_end)
+    releases.save()
+    return len(releases.releases) - before
+
+
+async def fetch_flutter_releases_async(
+    fetcher: AsyncFetcher, channel: Optional[str] = None
+) -> List[NewsItem]:
+    """并发版 fetch_flutter_releases"""
+    releases = get_release_store()
+
+    try:
+        print("正在获取 Flutter Releases...")
+        added = await sync_releases_async(fetcher)
+        print(f"  新增 {added} 个版本，本地共 {len(releases.releases)} 个")
+    except Exception as e:
+        print(f"  ❌ 同步发布信息失败: {e}")
+
+    with get_metrics().timed("parse", urlsplit(FLUTTER_RELEASES_API).netloc):
+        news = parse_releases(releases.query(channel, RELEASES_LIMIT))
+    print(f"  ✅ 获取到 {len(news)} 个版本")
+    return news
+
+
+async def fetch_package_async(fetcher: AsyncFetcher, package_name: str) -> Optional[NewsItem]:
+    """获取单个包的更新信息"""
+    store = get_validator_store()
+    url = f"{PUB_DEV_API}/{package_name}"
+    try:
+        status, body, headers = await fetcher.get(
+            url, headers=store.conditional_headers(url), timeout=10
+        )
+        if status == 304:
+            data = store.load(url)
+        elif status == 200:
+            data = package_payload(json.loads(body))
+            store.save(url, headers, data)
+        else:
+            return None
+        with get_metrics().timed("parse", urlsplit(PUB_DEV_API).netloc):
+            return parse_package(package_name, data)
+    except Exception as e:
+        print(f"  获取 {package_name} 失败: {e}")
+        return None
+
+
+async def fetch_package_updates_async(fetcher: AsyncFetcher) -> List[NewsItem]:
+    """并发版 fetch_package_updates，所有包同时请求"""
+    print("正在获取热门包更新...")
+
+    results = await asyncio.gather(*[
+        fetch_package_async(fetcher, package_name)
+        for package_name in POPULAR_PACKAGES[:PACKAGE_LIMIT]
+    ])
+    news = [item for item in results if item is not None]
+
+    print(f"  ✅ 获取到 {len(news)} 个包更新")
+    return news
+
+
+async def fetch_all(
+    blog: bool = True,
+    releases: bool = True,
+    packages: bool = True,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    release_channel: Optional[str] = None,
+) -> List[NewsItem]:
+    """并发抓取所有来源，结果顺序与同步引擎一致（博客、版本、包）"""
+    async with aiohttp.ClientSession() as session:
+        fetcher = AsyncFetcher(session, max_per_host)
+
+        tasks = []
+        if blog:
+            tasks.append(fetch_flutter_blog_async(fetcher))
+        if releases:
+            tasks.append(fetch_flutter_releases_async(fetcher, release_channel))
+        if packages:
+            tasks.append(fetch_package_updates_async(fetcher))
+
+        results = await asyncio.gather(*tasks)
+
+    all_news: List[NewsItem] = []
+    for items in results:
+        all_news.extend(items)
+    return all_news
+
+
+def run(
+    blog: bool = True,
+    releases: bool = True,
+    packages: bool = True,
+    max_per_host: int = DEFAULT_MAX_PER_HOST,
+    release_channel: Optional[str] = None,
+) -> List[NewsItem]:
+    """同步入口，供 news_crawler.main 调用"""
+    return asyncio.run(fetch_all(blog, releases, packages, max_per_host, release_channel))
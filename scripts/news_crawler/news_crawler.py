@@ -13,24 +13,35 @@ Flutter 新闻爬虫 - 从 Flutter 官方博客和其他资源获取最新动态
 """
 
 import os
+import sys
 import json
-import time
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
 from dataclasses import dataclass, asdict
 from html import unescape
 import re
 
-# 配置
-FLUTTER_BLOG_RSS = "https://medium.com/feed/flutter"
-FLUTTER_RELEASES_API = "https://api.github.com/repos/flutter/flutter/releases"
-PUB_DEV_API = "https://pub.dev/api/packages"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.translation_cache import get_cache
+from common.http_validators import get_validator_store
+from common import transport
+from common.metrics import DEFAULT_METRICS_DIR, estimate_tokens, get_metrics
+from common.endpoints import endpoint
+from common.output import UPDATED_AT_FIELD, get_output_writer
+from common.render import Document, Template
+from release_store import get_release_store, next_page_url
+
+# 配置（地址可以通过环境变量覆盖，见 common.endpoints）
+FLUTTER_BLOG_RSS = endpoint("FLUTTER_BLOG_RSS")
+FLUTTER_RELEASES_API = endpoint("FLUTTER_RELEASES_API")
+PUB_DEV_API = endpoint("PUB_DEV_API")
+PUB_SEARCH_API = endpoint("PUB_SEARCH_API")
 
 # Deepseek API 配置（用于翻译）
-DEEPSEEK_API_URL = "https://yunwu.ai/v1/chat/completions"
+DEEPSEEK_API_URL = endpoint("DEEPSEEK_API_URL")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
 
 # 标题翻译映射（常用词汇）
@@ -76,6 +87,10 @@ POPULAR_PACKAGES = [
     "flutter_svg", "shimmer", "animations", "flutter_animate"
 ]
 
+# 按主机限速，避免请求过快
+transport.set_default_host_rate(urlsplit(PUB_DEV_API).netloc, 5)
+transport.set_default_host_rate(urlsplit(DEEPSEEK_API_URL).netloc, 3)
+
 
 @dataclass
 class NewsItem:
@@ -86,8 +101,22 @@ class NewsItem:
     source: str
     summary: str = ""
     category: str = "general"
+    # 唯一标识：RSS guid、Release tag 或 包名@版本，增量模式下用于判断是否已抓取过
+    guid: str = ""
     
 
+# 增量模式下上次 data.json 中已有的条目，键为 guid 和 url
+SEEN_ITEMS: Dict[str, NewsItem] = {}
+
+
+def find_seen(*keys: str) -> Optional[NewsItem]:
+    """按 guid / url 查找上次已抓取过的条目"""
+    for key in keys:
+        if key and key in SEEN_ITEMS:
+            return SEEN_ITEMS[key]
+    return None
+
+
 def clean_html(html_text: str) -> str:
     """清理 HTML 标签"""
     # 移除 HTML 标签
@@ -99,21 +128,47 @@ def clean_html(html_text: str) -> str:
     return clean
 
 
-def translate_title(title: str) -> str:
-    """翻译新闻标题为中文"""
-    # 检查是否已经是中文
-    chinese_chars = sum(1 for c in title if '\u4e00' <= c <= '\u9fff')
-    if chinese_chars > len(title) * 0.3:  # 超过30%是中文字符
-        return title
-    
-    # 使用 API 翻译
-    try:
-        headers = {
-            "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        
-        prompt = f"""请将以下 Flutter 技术新闻标题翻译为简洁的中文：
+# 翻译模型配置
+TRANSLATE_MODEL = "deepseek-chat"
+TRANSLATE_SYSTEM_PROMPT = "你是一位专业的 Flutter/Dart 技术翻译。"
+TRANSLATE_TEMPERATURE = 0.1
+
+# 批量翻译时每次请求最多包含的标题数
+TITLE_BATCH_SIZE = 20
+
+
+@dataclass
+class TranslationStats:
+    """标题翻译统计，用于对比批量翻译与逐条翻译的开销"""
+    titles: int = 0
+    api_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    # 如果逐条翻译预计需要的 token 数
+    estimated_single_tokens: int = 0
+    fallbacks: int = 0
+
+
+TRANSLATION_STATS = TranslationStats()
+
+
+def is_chinese(text: str) -> bool:
+    """超过30%是中文字符时视为已是中文"""
+    chinese_chars = sum(1 for c in text if '\u4e00' <= c <= '\u9fff')
+    return chinese_chars > len(text) * 0.3
+
+
+def fallback_translate(title: str) -> str:
+    """回退到简单映射替换"""
+    translated = title
+    for en, zh in TITLE_TRANSLATIONS.items():
+        translated = translated.replace(en, zh)
+    return translated
+
+
+def build_title_prompt(title: str) -> str:
+    """单条标题翻译的提示词"""
+    return f"""请将以下 Flutter 技术新闻标题翻译为简洁的中文：
 
 标题：{title}
 
@@ -125,104 +180,405 @@ def translate_title(title: str) -> str:
 5. 只返回翻译结果，不要其他内容
 
 中文标题："""
-        
-        data = {
-            "model": "deepseek-chat",
-            "messages": [
-                {"role": "system", "content": "你是一位专业的 Flutter/Dart 技术翻译。"},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.1,
-            "max_tokens": 100
-        }
-        
-        response = requests.post(
-            DEEPSEEK_API_URL, 
-            headers=headers, 
-            json=data, 
-            timeout=30
-        )
-        response.raise_for_status()
-        result = response.json()
+
+
+def title_cache_prompt() -> str:
+    """翻译缓存键中使用的提示词：单条与批量翻译共用同一份标题提示词模板"""
+    return TRANSLATE_SYSTEM_PROMPT + build_title_prompt("{title}")
+
+
+def get_cached_title(title: str) -> Optional[str]:
+    """查询标题的翻译缓存"""
+    return get_cache().get(
+        title, title_cache_prompt(), TRANSLATE_MODEL, TRANSLATE_TEMPERATURE
+    )
+
+
+def cache_title(title: str, translated: str):
+    """写入标题的翻译缓存"""
+    get_cache().set(
+        title, title_cache_prompt(), TRANSLATE_MODEL, TRANSLATE_TEMPERATURE, translated
+    )
+
+
+def build_batch_prompt(titles: List[str]) -> str:
+    """批量标题翻译的提示词，标题以序号为键传入，要求按相同序号返回"""
+    numbered = json.dumps({str(i): t for i, t in enumerate(titles)}, ensure_ascii=False, indent=2)
+    return f"""请将以下 Flutter 技术新闻标题逐条翻译为简洁的中文。标题以 JSON 对象给出，键为序号：
+
+{numbered}
+
+要求：
+1. 翻译要简洁明了、通顺自然
+2. 保留版本号如 3.38、3.35 等
+3. 保留专有名词如 Flutter、Dart、Gemini、CLI、Impeller、Firebase 等
+4. 人名保留英文（如 Jaime）
+5. 只返回一个 JSON 对象，键为原序号，值为中文标题，不要其他内容
+
+JSON："""
+
+
+def call_translate_api(prompt: str, max_tokens: int) -> Dict:
+    """调用翻译接口，返回完整的响应 JSON"""
+    headers = {
+        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    
+    data = {
+        "model": TRANSLATE_MODEL,
+        "messages": [
+            {"role": "system", "content": TRANSLATE_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": TRANSLATE_TEMPERATURE,
+        "max_tokens": max_tokens
+    }
+    
+    response = transport.post(
+        DEEPSEEK_API_URL, 
+        headers=headers, 
+        json=data, 
+        timeout=30,
+        stage="translate"
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def record_usage(result: Dict, prompt: str, output: str):
+    """记录一次接口调用的 token 用量，接口未返回 usage 时按估算值记录"""
+    prompt_tokens, completion_tokens = get_metrics().record_usage(
+        "translate", urlsplit(DEEPSEEK_API_URL).netloc,
+        result.get("usage"), TRANSLATE_SYSTEM_PROMPT + prompt, output
+    )
+    TRANSLATION_STATS.api_calls += 1
+    TRANSLATION_STATS.prompt_tokens += prompt_tokens
+    TRANSLATION_STATS.completion_tokens += completion_tokens
+
+
+def translate_title(title: str) -> str:
+    """翻译新闻标题为中文"""
+    # 检查是否已经是中文
+    if is_chinese(title):
+        return title
+    
+    cached = get_cached_title(title)
+    if cached is not None:
+        return cached
+    
+    # 使用 API 翻译
+    prompt = build_title_prompt(title)
+    TRANSLATION_STATS.titles += 1
+    try:
+        result = call_translate_api(prompt, max_tokens=100)
         translated = result["choices"][0]["message"]["content"].strip()
         # 移除可能的引号
         translated = translated.strip('"\'')
+        record_usage(result, prompt, translated)
+        TRANSLATION_STATS.estimated_single_tokens += (
+            estimate_tokens(TRANSLATE_SYSTEM_PROMPT + prompt) + estimate_tokens(translated)
+        )
+        cache_title(title, translated)
         print(f"    翻译: {title[:40]}... → {translated}")
-        time.sleep(0.3)  # 避免请求过快
         return translated
     except Exception as e:
         print(f"    翻译失败: {e}")
-        # 回退到简单映射替换
-        translated = title
-        for en, zh in TITLE_TRANSLATIONS.items():
-            translated = translated.replace(en, zh)
-        return translated
+        TRANSLATION_STATS.fallbacks += 1
+        return fallback_translate(title)
+
+
+def parse_batch_response(content: str) -> Dict[int, str]:
+    """解析批量翻译结果，容忍模型在 JSON 外包裹的 ``` 代码块"""
+    content = content.strip()
+    match = re.search(r'\{.*\}', content, re.S)
+    if not match:
+        return {}
+    data = json.loads(match.group(0))
+    translations = {}
+    for key, value in data.items():
+        try:
+            index = int(key)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(value, str) and value.strip():
+            translations[index] = value.strip().strip('"\'')
+    return translations
+
+
+def translate_titles(titles: List[str]) -> List[str]:
+    """批量翻译标题，每 TITLE_BATCH_SIZE 条发送一次请求
+    
+    已在翻译缓存中的标题不再请求接口，批量结果中缺失的标题回退到
+    TITLE_TRANSLATIONS 映射替换。
+    """
+    results = list(titles)
+    pending = []
+    for i, title in enumerate(titles):
+        if is_chinese(title):
+            continue
+        cached = get_cached_title(title)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+    
+    for start in range(0, len(pending), TITLE_BATCH_SIZE):
+        chunk = pending[start:start + TITLE_BATCH_SIZE]
+        chunk_titles = [titles[i] for i in chunk]
+        TRANSLATION_STATS.titles += len(chunk)
+        
+        prompt = build_batch_prompt(chunk_titles)
+        translations: Dict[int, str] = {}
+        try:
+            result = call_translate_api(prompt, max_tokens=100 * len(chunk))
+            content = result["choices"][0]["message"]["content"]
+            record_usage(result, prompt, content)
+            translations = parse_batch_response(content)
+        except Exception as e:
+            print(f"    批量翻译失败: {e}")
+        
+        for offset, index in enumerate(chunk):
+            title = titles[index]
+            translated = translations.get(offset)
+            if translated:
+                print(f"    翻译: {title[:40]}... → {translated}")
+                cache_title(title, translated)
+            else:
+                TRANSLATION_STATS.fallbacks += 1
+                translated = fallback_translate(title)
+            results[index] = translated
+            TRANSLATION_STATS.estimated_single_tokens += (
+                estimate_tokens(TRANSLATE_SYSTEM_PROMPT + build_title_prompt(title))
+                + estimate_tokens(translated)
+            )
+    
+    return results
+
+
+def print_translation_report():
+    """输出翻译调用统计以及批量翻译节省的调用次数和 token 数"""
+    stats = TRANSLATION_STATS
+    get_cache().report()
+    if not stats.titles:
+        return
+    
+    used_tokens = stats.prompt_tokens + stats.completion_tokens
+    print(f"\n翻译统计: {stats.titles} 条标题, {stats.api_calls} 次接口调用, "
+          f"{used_tokens} tokens, {stats.fallbacks} 条使用映射回退")
+    saved_calls = stats.titles - stats.api_calls
+    if saved_calls > 0:
+        saved_tokens = stats.estimated_single_tokens - used_tokens
+        print(f"  批量翻译节省 {saved_calls} 次调用, 约 {max(saved_tokens, 0)} tokens")
+
+
+BLOG_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
+}
+
+GITHUB_HEADERS = {
+    "Accept": "application/vnd.github.v3+json",
+    "User-Agent": "Flutter-News-Crawler"
+}
+
+# 每次抓取的数量
+BLOG_LIMIT = 10
+RELEASES_LIMIT = 10
+PACKAGE_LIMIT = 10
+
+
+# Atom 命名空间
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+
+# 流式读取 RSS 时每次从连接读取的字节数
+FEED_CHUNK_SIZE = 8192
+
+
+def parse_feed_date(text: str) -> str:
+    """解析 RSS 的 pubDate 或 Atom 的 published/updated，返回 YYYY-MM-DD"""
+    text = text.strip()
+    try:
+        # RSS 日期格式: Wed, 15 May 2024 12:00:00 GMT
+        return datetime.strptime(text[:25], "%a, %d %b %Y %H:%M:%S").strftime("%Y-%m-%d")
+    except ValueError:
+        pass
+    try:
+        # Atom 日期格式: 2024-05-15T12:00:00Z
+        return datetime.strptime(text[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        return datetime.now().strftime("%Y-%m-%d")
+
+
+def atom_link(entry: ET.Element) -> Optional[str]:
+    """Atom 条目的文章地址：rel 为空或 alternate 的 link"""
+    for link in entry.findall(f'{ATOM_NS}link'):
+        if link.get('rel', 'alternate') == 'alternate':
+            return link.get('href')
+    return None
+
+
+def parse_feed_entry(entry: ET.Element) -> Optional[NewsItem]:
+    """把 RSS 的 <item> 或 Atom 的 <entry> 转为 NewsItem（标题尚未翻译）"""
+    if entry.tag == 'item':
+        title_elem = entry.find('title')
+        url = entry.findtext('link')
+        guid = entry.findtext('guid') or ""
+        date_text = entry.findtext('pubDate')
+        summary_text = entry.findtext('description')
+    else:
+        title_elem = entry.find(f'{ATOM_NS}title')
+        url = atom_link(entry)
+        guid = entry.findtext(f'{ATOM_NS}id') or ""
+        date_text = entry.findtext(f'{ATOM_NS}published') or entry.findtext(f'{ATOM_NS}updated')
+        summary_text = entry.findtext(f'{ATOM_NS}summary') or entry.findtext(f'{ATOM_NS}content')
+
+    if title_elem is None or url is None:
+        return None
+
+    url = url.strip()
+    guid = guid.strip()
+
+    # 增量模式：已抓取过的文章直接复用，不再解析摘要
+    previous = find_seen(guid, url)
+    if previous is not None:
+        return previous
+
+    # 获取摘要
+    summary = ""
+    if summary_text:
+        summary = clean_html(summary_text)[:200] + "..."
+
+    return NewsItem(
+        title=clean_html(title_elem.text or ""),
+        url=url,
+        date=parse_feed_date(date_text) if date_text else "",
+        source="Flutter Blog",
+        summary=summary,
+        category="blog",
+        guid=guid or url
+    )
+
+
+class FeedReader:
+    """增量解析 RSS / Atom：每收到一段数据就解析出已经结束的条目
+
+    读到 limit 个条目后 done 为 True，调用方可以停止读取连接上剩余的数据。
+    """
+
+    def __init__(self, limit: int = BLOG_LIMIT):
+        self.limit = limit
+        self.entries = 0
+        self.items: List[NewsItem] = []
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    @property
+    def done(self) -> bool:
+        return self.entries >= self.limit
+
+    def feed(self, chunk: bytes) -> List[NewsItem]:
+        """送入一段数据，返回其中新结束的条目"""
+        self._parser.feed(chunk)
+        return self._collect()
+
+    def close(self) -> List[NewsItem]:
+        """数据读取完毕（未提前结束）时调用，检查文档是否完整"""
+        self._parser.close()
+        return self._collect()
+
+    def _collect(self) -> List[NewsItem]:
+        new_items = []
+        for _, elem in self._parser.read_events():
+            if self.done or elem.tag not in ('item', f'{ATOM_NS}entry'):
+                continue
+            self.entries += 1
+            with get_metrics().timed("parse", urlsplit(FLUTTER_BLOG_RSS).netloc):
+                item = parse_feed_entry(elem)
+            # 条目处理完后释放子元素，整个文档不会在内存中累积
+            elem.clear()
+            if item is not None:
+                new_items.append(item)
+        self.items.extend(new_items)
+        return new_items
+
+
+def iter_feed_items(chunks: Iterable[bytes], limit: int = BLOG_LIMIT) -> Iterator[NewsItem]:
+    """从分段的 RSS / Atom 数据中逐条产出 NewsItem，读到 limit 个条目后不再读取"""
+    reader = FeedReader(limit)
+    for chunk in chunks:
+        yield from reader.feed(chunk)
+        if reader.done:
+            return
+    yield from reader.close()
+
+
+def translate_blog_items(items: List[NewsItem]) -> List[NewsItem]:
+    """批量翻译新文章的标题，已抓取过的文章原样保留"""
+    seen, news = [], []
+    for item in items:
+        # parse_feed_entry 对已抓取过的文章直接返回上次的对象
+        (seen if find_seen(item.guid, item.url) is item else news).append(item)
+
+    # 翻译标题：一次请求批量翻译本次抓取的所有标题
+    translated_titles = translate_titles([item.title for item in news])
+    for item, translated_title in zip(news, translated_titles):
+        item.title = translated_title
+
+    if seen:
+        print(f"  其中 {len(seen)} 篇已抓取过，跳过解析和翻译")
+    return seen + news
+
+
+def parse_blog_feed(content: Union[bytes, Iterable[bytes]]) -> List[NewsItem]:
+    """解析博客 RSS / Atom 内容，content 可以是完整的字节串或分段读取的数据"""
+    chunks = [content] if isinstance(content, bytes) else content
+    items = list(iter_feed_items(chunks))
+    print(f"  读取 {len(items)} 篇文章")
+    return translate_blog_items(items)
+
+
+def items_to_payload(items: List[NewsItem]) -> List[Dict]:
+    """NewsItem 列表转为可保存到校验器存储的数据"""
+    return [asdict(item) for item in items]
+
+
+def items_from_payload(payload: List[Dict]) -> List[NewsItem]:
+    """从校验器存储恢复 NewsItem 列表"""
+    return [NewsItem(**data) for data in payload]
+
+
+def package_payload(data: Dict) -> Dict:
+    """只保留 parse_package 用到的字段，减小校验器存储的体积"""
+    latest = data.get("latest", {})
+    return {
+        "latest": {
+            "version": latest.get("version", ""),
+            "published": latest.get("published", ""),
+            "pubspec": {"description": latest.get("pubspec", {}).get("description", "")},
+        }
+    }
 
 
 def fetch_flutter_blog() -> List[NewsItem]:
     """获取 Flutter 官方博客文章"""
     news = []
+    store = get_validator_store()
     
     try:
         print("正在获取 Flutter 博客...")
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)"
-        }
-        response = requests.get(FLUTTER_BLOG_RSS, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        # 解析 RSS
-        root = ET.fromstring(response.content)
-        channel = root.find('channel')
-        
-        if channel is None:
-            print("  无法解析 RSS")
-            return news
-        
-        items = channel.findall('item')
-        print(f"  找到 {len(items)} 篇文章")
-        
-        for item in items[:10]:  # 只取最近10篇
-            title_elem = item.find('title')
-            link_elem = item.find('link')
-            pub_date_elem = item.find('pubDate')
-            description_elem = item.find('description')
-            
-            if title_elem is None or link_elem is None:
-                continue
-                
-            title = clean_html(title_elem.text or "")
-            # 翻译标题
-            translated_title = translate_title(title)
-            url = link_elem.text or ""
-            
-            # 解析日期
-            date_str = ""
-            if pub_date_elem is not None and pub_date_elem.text:
-                try:
-                    # RSS 日期格式: Wed, 15 May 2024 12:00:00 GMT
-                    dt = datetime.strptime(
-                        pub_date_elem.text.strip()[:25], 
-                        "%a, %d %b %Y %H:%M:%S"
-                    )
-                    date_str = dt.strftime("%Y-%m-%d")
-                except:
-                    date_str = datetime.now().strftime("%Y-%m-%d")
-            
-            # 获取摘要
-            summary = ""
-            if description_elem is not None and description_elem.text:
-                summary = clean_html(description_elem.text)[:200] + "..."
-            
-            news.append(NewsItem(
-                title=translated_title,
-                url=url,
-                date=date_str,
-                source="Flutter Blog",
-                summary=summary,
-                category="blog"
-            ))
-        
+        # 流式读取：读到 BLOG_LIMIT 篇后关闭连接，不等整个 RSS 下载完
+        with transport.get(
+            FLUTTER_BLOG_RSS,
+            headers={**BLOG_HEADERS, **store.conditional_headers(FLUTTER_BLOG_RSS)},
+            timeout=30,
+            stream=True
+        ) as response:
+            if response.status_code == 304:
+                news = items_from_payload(store.load(FLUTTER_BLOG_RSS))
+                print("  RSS 未变化，复用上次结果")
+            else:
+                response.raise_for_status()
+                news = parse_blog_feed(response.iter_content(FEED_CHUNK_SIZE))
+                store.save(FLUTTER_BLOG_RSS, response.headers, items_to_payload(news))
         print(f"  ✅ 获取到 {len(news)} 条博客文章")
         
     except Exception as e:
@@ -231,125 +587,181 @@ def fetch_flutter_blog() -> List[NewsItem]:
     return news
 
 
-def fetch_flutter_releases() -> List[NewsItem]:
-    """获取 Flutter 版本发布信息"""
+def parse_releases(releases: List[Dict]) -> List[NewsItem]:
+    """解析 GitHub Releases 接口返回的版本列表"""
     news = []
+    print(f"  找到 {len(releases)} 个版本")
     
-    try:
-        print("正在获取 Flutter Releases...")
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "User-Agent": "Flutter-News-Crawler"
-        }
-        response = requests.get(
-            FLUTTER_RELEASES_API,
-            headers=headers,
-            params={"per_page": 10},
-            timeout=30
-        )
-        response.raise_for_status()
+    for release in releases:
+        tag_name = release.get("tag_name", "")
+        url = release.get("html_url", "")
         
-        releases = response.json()
-        print(f"  找到 {len(releases)} 个版本")
+        previous = find_seen(tag_name, url)
+        if previous is not None:
+            news.append(previous)
+            continue
         
-        for release in releases:
-            tag_name = release.get("tag_name", "")
-            name = release.get("name", tag_name)
-            url = release.get("html_url", "")
-            published_at = release.get("published_at", "")
-            body = release.get("body", "")
-            prerelease = release.get("prerelease", False)
-            
-            # 解析日期
-            date_str = ""
-            if published_at:
-                try:
-                    dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                    date_str = dt.strftime("%Y-%m-%d")
-                except:
-                    date_str = datetime.now().strftime("%Y-%m-%d")
-            
-            # 标题（翻译版本名称中的月份等）
-            if prerelease:
-                title = f"Flutter {name}（预发布版）"
-            else:
-                title = f"Flutter {name}"
-            # 翻译标题中的日期格式
-            title = title.replace("January", "1月").replace("February", "2月")
-            title = title.replace("March", "3月").replace("April", "4月")
-            title = title.replace("May", "5月").replace("June", "6月")
-            title = title.replace("July", "7月").replace("August", "8月")
-            title = title.replace("September", "9月").replace("October", "10月")
-            title = title.replace("November", "11月").replace("December", "12月")
-            title = title.replace("beta", "测试版").replace("stable", "稳定版")
-            
-            # 摘要
-            summary = clean_html(body)[:200] + "..." if body else "查看发布说明了解详情"
-            
-            news.append(NewsItem(
-                title=title,
-                url=url,
-                date=date_str,
-                source="GitHub Releases",
-                summary=summary,
-                category="release"
-            ))
+        name = release.get("name", tag_name)
+        published_at = release.get("published_at", "")
+        body = release.get("body", "")
+        prerelease = release.get("prerelease", False)
+        
+        # 解析日期
+        date_str = ""
+        if published_at:
+            try:
+                dt = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
+                date_str = dt.strftime("%Y-%m-%d")
+            except:
+                date_str = datetime.now().strftime("%Y-%m-%d")
+        
+        # 标题（翻译版本名称中的月份等）
+        if prerelease:
+            title = f"Flutter {name}（预发布版）"
+        else:
+            title = f"Flutter {name}"
+        # 翻译标题中的日期格式
+        title = title.replace("January", "1月").replace("February", "2月")
+        title = title.replace("March", "3月").replace("April", "4月")
+        title = title.replace("May", "5月").replace("June", "6月")
+        title = title.replace("July", "7月").replace("August", "8月")
+        title = title.replace("September", "9月").replace("October", "10月")
+        title = title.replace("November", "11月").replace("December", "12月")
+        title = title.replace("beta", "测试版").replace("stable", "稳定版")
         
-        print(f"  ✅ 获取到 {len(news)} 个版本")
+        # 摘要
+        summary = clean_html(body)[:200] + "..." if body else "查看发布说明了解详情"
         
+        news.append(NewsItem(
+            title=title,
+            url=url,
+            date=date_str,
+            source="GitHub Releases",
+            summary=summary,
+            category="release",
+            guid=tag_name
+        ))
+    
+    return news
+
+
+def sync_releases(full: bool = False) -> int:
+    """把 GitHub Releases 增量同步到本地存储，返回新增的版本数"""
+    releases = get_release_store()
+    store = get_validator_store()
+    before = len(releases.releases)
+    url = releases.sync_url(FLUTTER_RELEASES_API)
+    first_page = True
+    reached_end = False
+    
+    while url:
+        headers = dict(GITHUB_HEADERS)
+        if first_page and releases.complete and not full:
+            # 第一页未变化说明没有新版本，GitHub 对 304 响应不计入配额
+            headers.update(store.conditional_headers(url))
+        response = transport.get(url, headers=headers, timeout=30)
+        if response.status_code == 304:
+            store.load(url)
+            break
+        response.raise_for_status()
+        
+        page = response.json()
+        if first_page:
+            store.save(url, response.headers, [release.get("tag_name") for release in page])
+        first_page = False
+        
+        next_url = next_page_url(response.headers)
+        reached_end = next_url is None
+        url = next_url if releases.merge_page(page, full) else None
+    
+    releases.mark_synced(reached_end)
+    releases.save()
+    return len(releases.releases) - before
+
+
+def fetch_flutter_releases(channel: Optional[str] = None) -> List[NewsItem]:
+    """获取 Flutter 版本发布信息，channel 为 stable / beta 时只返回该渠道的版本"""
+    releases = get_release_store()
+    
+    try:
+        print("正在获取 Flutter Releases...")
+        added = sync_releases()
+        print(f"  新增 {added} 个版本，本地共 {len(releases.releases)} 个")
     except Exception as e:
-        print(f"  ❌ 获取发布信息失败: {e}")
+        # 同步失败时仍然使用本地已保存的版本
+        print(f"  ❌ 同步发布信息失败: {e}")
     
+    with get_metrics().timed("parse", urlsplit(FLUTTER_RELEASES_API).netloc):
+        news = parse_releases(releases.query(channel, RELEASES_LIMIT))
+    print(f"  ✅ 获取到 {len(news)} 个版本")
     return news
 
 
+def parse_package(package_name: str, data: Dict) -> Optional[NewsItem]:
+    """解析 pub.dev 包信息，只保留最近7天内更新的包"""
+    latest = data.get("latest", {})
+    
+    version = latest.get("version", "")
+    published = latest.get("published", "")
+    pubspec = latest.get("pubspec", {})
+    description = pubspec.get("description", "")
+    guid = f"{package_name}@{version}"
+    
+    # 检查是否是最近7天内更新
+    if not published:
+        return None
+    try:
+        dt = datetime.fromisoformat(published.replace("Z", "+00:00"))
+        if datetime.now(dt.tzinfo) - dt > timedelta(days=7):
+            return None
+        date_str = dt.strftime("%Y-%m-%d")
+    except:
+        return None
+    
+    previous = find_seen(guid)
+    if previous is not None:
+        return previous
+    
+    return NewsItem(
+        title=f"{package_name} {version} 发布",
+        url=f"https://pub.dev/packages/{package_name}",
+        date=date_str,
+        source="pub.dev",
+        summary=description[:150] + "..." if len(description) > 150 else description,
+        category="package",
+        guid=guid
+    )
+
+
 def fetch_package_updates() -> List[NewsItem]:
     """获取热门包更新信息"""
     news = []
     
     print("正在获取热门包更新...")
+    store = get_validator_store()
     
-    for package_name in POPULAR_PACKAGES[:10]:
+    for package_name in POPULAR_PACKAGES[:PACKAGE_LIMIT]:
         try:
-            response = requests.get(
-                f"{PUB_DEV_API}/{package_name}",
+            url = f"{PUB_DEV_API}/{package_name}"
+            response = transport.get(
+                url,
+                headers=store.conditional_headers(url),
                 timeout=10
             )
             
-            if response.status_code != 200:
+            if response.status_code == 304:
+                data = store.load(url)
+            elif response.status_code == 200:
+                data = package_payload(response.json())
+                store.save(url, response.headers, data)
+            else:
                 continue
                 
-            data = response.json()
-            latest = data.get("latest", {})
-            
-            version = latest.get("version", "")
-            published = latest.get("published", "")
-            pubspec = latest.get("pubspec", {})
-            description = pubspec.get("description", "")
-            
-            # 检查是否是最近7天内更新
-            if published:
-                try:
-                    dt = datetime.fromisoformat(published.replace("Z", "+00:00"))
-                    if datetime.now(dt.tzinfo) - dt > timedelta(days=7):
-                        continue
-                    date_str = dt.strftime("%Y-%m-%d")
-                except:
-                    continue
-            else:
+            with get_metrics().timed("parse", urlsplit(PUB_DEV_API).netloc):
+                item = parse_package(package_name, data)
+            if item is None:
                 continue
-            
-            news.append(NewsItem(
-                title=f"{package_name} {version} 发布",
-                url=f"https://pub.dev/packages/{package_name}",
-                date=date_str,
-                source="pub.dev",
-                summary=description[:150] + "..." if len(description) > 150 else description,
-                category="package"
-            ))
-            
-            # 避免请求过快
-            time.sleep(0.2)
+            news.append(item)
             
         except Exception as e:
             print(f"  获取 {package_name} 失败: {e}")
@@ -358,20 +770,11 @@ def fetch_package_updates() -> List[NewsItem]:
     return news
 
 
-def generate_markdown(news_items: List[NewsItem], output_path: str):
-    """生成 Markdown 格式的新闻页面"""
-    
-    # 按日期排序
-    news_items.sort(key=lambda x: x.date, reverse=True)
-    
-    # 按分类分组
-    releases = [n for n in news_items if n.category == "release"]
-    blogs = [n for n in news_items if n.category == "blog"]
-    packages = [n for n in news_items if n.category == "package"]
-    
-    now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-    md = f"""---
+# 新闻页面中每次运行都会变化的时间戳，判断页面是否需要重新写入时忽略
+LAST_UPDATED_LINE = re.compile(r"^> 📅 最后更新: .*$", re.M)
+
+# 新闻页面模板
+NEWS_PAGE_HEADER = Template("""---
 title: Flutter 最新动态
 description: Flutter 官方博客、版本发布和热门包更新
 ---
@@ -384,57 +787,43 @@ description: Flutter 官方博客、版本发布和热门包更新
 
 ## 🚀 版本发布
 
-"""
-    
-    if releases:
-        for item in releases[:5]:
-            md += f"""### [{item.title}]({item.url})
+""")
 
-<Badge type="info" text="{item.date}" /> <Badge type="tip" text="{item.source}" />
+RELEASE_ENTRY = Template("""### [{title}]({url})
 
-{item.summary}
+<Badge type="info" text="{date}" /> <Badge type="tip" text="{source}" />
+
+{summary}
 
 ---
 
-"""
-    else:
-        md += "*暂无最新版本信息*\n\n"
-    
-    md += """## 📝 官方博客
+""")
 
-"""
-    
-    if blogs:
-        for item in blogs[:8]:
-            md += f"""### [{item.title}]({item.url})
+BLOG_SECTION = Template("""## 📝 官方博客
+
+""")
+
+BLOG_ENTRY = Template("""### [{title}]({url})
 
-<Badge type="info" text="{item.date}" />
+<Badge type="info" text="{date}" />
 
-{item.summary}
+{summary}
 
 ---
 
-"""
-    else:
-        md += "*暂无最新博客文章*\n\n"
-    
-    md += """## 📦 热门包更新
+""")
+
+PACKAGE_SECTION = Template("""## 📦 热门包更新
 
 最近7天内更新的热门 Flutter 包：
 
 | 包名 | 说明 | 更新日期 |
 |------|------|----------|
-"""
-    
-    if packages:
-        for item in packages:
-            title = item.title.replace("|", "\\|")
-            summary = item.summary[:50].replace("|", "\\|") + "..."
-            md += f"| [{title}]({item.url}) | {summary} | {item.date} |\n"
-    else:
-        md += "| *暂无更新* | - | - |\n"
-    
-    md += """
+""")
+
+PACKAGE_ROW = Template("| [{title}]({url}) | {summary} | {date} |\n")
+
+NEWS_PAGE_FOOTER = Template("""
 
 ## 📚 更多资源
 
@@ -452,16 +841,128 @@ description: Flutter 官方博客、版本发布和热门包更新
 ---
 
 <small>本页面内容自动生成，如有遗漏请访问官方渠道获取最新信息。</small>
-"""
+""")
+
+
+def render_news_page(news_items: List[NewsItem]) -> str:
+    """渲染新闻页面的 Markdown"""
+    
+    # 按日期排序
+    news_items.sort(key=lambda x: x.date, reverse=True)
+    
+    # 按分类分组
+    releases = [n for n in news_items if n.category == "release"]
+    blogs = [n for n in news_items if n.category == "blog"]
+    # 增量模式下历史记录中会保留更早的包版本，这里只展示最近7天的
+    package_cutoff = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d")
+    packages = [
+        n for n in news_items
+        if n.category == "package" and n.date >= package_cutoff
+    ]
+    
+    doc = Document()
+    doc.render(NEWS_PAGE_HEADER, now=datetime.now().strftime("%Y-%m-%d %H:%M"))
+    
+    if releases:
+        for item in releases[:5]:
+            doc.render(RELEASE_ENTRY, **vars(item))
+    else:
+        doc.write("*暂无最新版本信息*\n\n")
     
-    # 写入文件
-    output_file = Path(output_path)
-    output_file.parent.mkdir(parents=True, exist_ok=True)
+    doc.render(BLOG_SECTION)
+    
+    if blogs:
+        for item in blogs[:8]:
+            doc.render(BLOG_ENTRY, **vars(item))
+    else:
+        doc.write("*暂无最新博客文章*\n\n")
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(md)
+    doc.render(PACKAGE_SECTION)
     
-    print(f"\n✅ 新闻页面已生成: {output_path}")
+    if packages:
+        for item in packages:
+            doc.render(
+                PACKAGE_ROW,
+                title=item.title.replace("|", "\\|"),
+                url=item.url,
+                summary=item.summary[:50].replace("|", "\\|") + "...",
+                date=item.date,
+            )
+    else:
+        doc.write("| *暂无更新* | - | - |\n")
+    
+    doc.render(NEWS_PAGE_FOOTER)
+    return doc.getvalue()
+
+
+def generate_markdown(news_items: List[NewsItem], output_path: str):
+    """生成 Markdown 格式的新闻页面"""
+    md = render_news_page(news_items)
+    
+    # 写入文件（除时间戳外内容没有变化时保留原文件）
+    if get_output_writer().write_text(output_path, md, volatile=[LAST_UPDATED_LINE]):
+        print(f"\n✅ 新闻页面已生成: {output_path}")
+    else:
+        print(f"\n新闻页面没有变化: {output_path}")
+
+
+def item_key(item: NewsItem) -> str:
+    """条目在历史记录中的唯一键"""
+    return item.guid or item.url
+
+
+def load_history(json_path: str) -> List[NewsItem]:
+    """读取上次生成的 data.json"""
+    path = Path(json_path)
+    if not path.exists():
+        return []
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"读取历史数据失败，将全量抓取: {e}")
+        return []
+    
+    fields = set(NewsItem.__dataclass_fields__)
+    return [
+        NewsItem(**{k: v for k, v in item.items() if k in fields})
+        for item in data.get("items", [])
+    ]
+
+
+def index_history(history: List[NewsItem]):
+    """建立已抓取条目的 guid / url 索引"""
+    SEEN_ITEMS.clear()
+    for item in history:
+        if item.guid:
+            SEEN_ITEMS[item.guid] = item
+        # 包的 url 不含版本号，只能按 guid 判断
+        if item.url and item.category != "package":
+            SEEN_ITEMS[item.url] = item
+
+
+def merge_history(
+    history: List[NewsItem],
+    news_items: List[NewsItem],
+    retention_days: int
+) -> List[NewsItem]:
+    """合并历史条目和本次抓取结果，丢弃超出保留期的历史条目
+    
+    保留期只作用于从上次 data.json 带过来的条目，本次抓取到的条目（例如仍在
+    RSS 中的旧文章、最近的几个版本）总是保留。
+    """
+    cutoff = (datetime.now() - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+    merged: Dict[str, NewsItem] = {}
+    for item in history:
+        if not item.date or item.date >= cutoff:
+            merged[item_key(item)] = item
+    for item in news_items:
+        merged[item_key(item)] = item
+    
+    kept = list(merged.values())
+    kept.sort(key=lambda x: x.date, reverse=True)
+    return kept
 
 
 def save_json(news_items: List[NewsItem], output_path: str):
@@ -471,13 +972,18 @@ def save_json(news_items: List[NewsItem], output_path: str):
         "items": [asdict(item) for item in news_items]
     }
     
-    output_file = Path(output_path)
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ JSON 数据已保存: {output_path}")
+    if get_output_writer().write_json(output_path, data, volatile=[UPDATED_AT_FIELD]):
+        print(f"✅ JSON 数据已保存: {output_path}")
+    else:
+        print(f"JSON 数据没有变化: {output_path}")
+
+
+def export_metrics(metrics_dir: str):
+    """输出本次运行的耗时统计，并写出 JSON 汇总和 Prometheus textfile"""
+    metrics = get_metrics()
+    metrics.report()
+    json_path, prom_path = metrics.export(metrics_dir)
+    print(f"运行指标已写入: {json_path}, {prom_path}")
 
 
 def main():
@@ -510,8 +1016,67 @@ def main():
         action="store_true",
         help="跳过包更新抓取"
     )
+    parser.add_argument(
+        "--release-channel",
+        choices=["stable", "beta"],
+        help="只显示指定渠道的版本（从本地版本存储中筛选）"
+    )
+    parser.add_argument(
+        "--packages",
+        choices=["popular", "bulk"],
+        default="popular",
+        help="包更新来源：popular 只检查 POPULAR_PACKAGES，bulk 批量跟踪 pub.dev 上的 Flutter 包"
+    )
+    parser.add_argument(
+        "--bulk-limit",
+        type=int,
+        default=2000,
+        help="bulk 模式下跟踪的包数量"
+    )
+    parser.add_argument(
+        "--bulk-workers",
+        type=int,
+        default=8,
+        help="bulk 模式下并发请求包详情的线程数"
+    )
+    parser.add_argument(
+        "--pub-rate",
+        type=float,
+        default=5,
+        help="每秒最多向 pub.dev 发送的请求数"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["sync", "async"],
+        default="sync",
+        help="抓取引擎：sync 依次请求，async 并发请求（需要 aiohttp）"
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        default=4,
+        help="async 引擎下每个主机的最大并发请求数"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="增量模式：只处理上次 JSON 中没有的条目，并合并到历史记录"
+    )
+    parser.add_argument(
+        "--retention-days",
+        type=int,
+        default=90,
+        help="增量模式下历史记录保留的天数"
+    )
+    
+    parser.add_argument(
+        "--metrics-dir",
+        default=str(DEFAULT_METRICS_DIR),
+        help="运行指标（JSON 汇总和 Prometheus textfile）的输出目录"
+    )
     
     args = parser.parse_args()
+    get_metrics().name = "news_crawler"
     
     print("=" * 50)
     print("Flutter 新闻爬虫")
@@ -519,28 +1084,75 @@ def main():
     
     all_news: List[NewsItem] = []
     
+    history: List[NewsItem] = []
+    if args.incremental:
+        history = load_history(args.json)
+        index_history(history)
+        print(f"增量模式: 已有 {len(history)} 条历史记录")
+    
+    transport.set_host_rate(urlsplit(PUB_DEV_API).netloc, args.pub_rate)
+    popular_packages = not args.no_packages and args.packages == "popular"
+    
     # 获取各类新闻
-    if not args.no_blog:
-        all_news.extend(fetch_flutter_blog())
+    if args.engine == "async":
+        import async_engine
+        all_news = async_engine.run(
+            blog=not args.no_blog,
+            releases=not args.no_releases,
+            packages=popular_packages,
+            max_per_host=args.max_per_host,
+            release_channel=args.release_channel,
+        )
+    else:
+        if not args.no_blog:
+            all_news.extend(fetch_flutter_blog())
+        
+        if not args.no_releases:
+            all_news.extend(fetch_flutter_releases(args.release_channel))
+        
+        if popular_packages:
+            all_news.extend(fetch_package_updates())
     
-    if not args.no_releases:
-        all_news.extend(fetch_flutter_releases())
+    if not args.no_packages and args.packages == "bulk":
+        # 批量模式使用线程池并发请求，与抓取引擎无关
+        import pub_bulk
+        all_news.extend(pub_bulk.fetch_bulk_package_updates(args.bulk_limit, args.bulk_workers))
     
-    if not args.no_packages:
-        all_news.extend(fetch_package_updates())
+    # 保存本次响应的 ETag / Last-Modified
+    get_validator_store().flush()
     
     if not all_news:
         print("\n⚠️ 未获取到任何新闻")
+        export_metrics(args.metrics_dir)
         return
     
     print(f"\n总计获取 {len(all_news)} 条新闻")
     
+    if args.incremental:
+        new_count = sum(1 for item in all_news if item_key(item) not in SEEN_ITEMS)
+        all_news = merge_history(history, all_news, args.retention_days)
+        print(f"新增 {new_count} 条，合并后共 {len(all_news)} 条（保留 {args.retention_days} 天）")
+    
     # 生成输出
-    generate_markdown(all_news, args.output)
-    save_json(all_news, args.json)
+    with get_metrics().timed("write"):
+        generate_markdown(all_news, args.output)
+    with get_metrics().timed("write"):
+        save_json(all_news, args.json)
+    get_output_writer().report()
+    print_translation_report()
+    
+    store = get_validator_store()
+    if store.not_modified:
+        print(f"条件请求: {store.not_modified} 个地址未变化，复用了上次的解析结果")
+    
+    export_metrics(args.metrics_dir)
     
     print("\n完成!")
 
 
 if __name__ == "__main__":
+    # 作为脚本运行时模块名是 __main__，async_engine / pub_bulk 中的 from news_crawler import ...
+    # 会再加载一份模块，SEEN_ITEMS、TRANSLATION_STATS 等全局状态各有一份。先把当前模块
+    # 登记为 news_crawler，让它们共用同一份。
+    sys.modules.setdefault("news_crawler", sys.modules[__name__])
     main()
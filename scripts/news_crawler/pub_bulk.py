@@ -0,0 +1,200 @@
+"""
+pub.dev 批量抓取 - 跟踪数千个 Flutter 包的版本更新
+
+POPULAR_PACKAGES 只覆盖十几个包。批量模式分两步：
+
+1. 分页请求 pub.dev 搜索接口（q=sdk:flutter），获取前 N 个 Flutter 包的包名
+2. 多个线程并发请求每个包的详情，所有线程共用 pub.dev 主机的限速
+
+每个包的 latest.version、发布时间和描述保存在版本索引
+scripts/.cache/pub_versions.json 中。已记录过的包请求详情时附带 ETag 条件请求，
+返回 304 时直接使用索引中的数据；只有版本号变化的包才会重新解析和更新索引。
+
+使用方法：
+    python news_crawler.py --packages bulk
+    python news_crawler.py --packages bulk --bulk-limit 3000 --bulk-workers 16 --pub-rate 10
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+from news_crawler import (
+    PUB_DEV_API,
+    PUB_SEARCH_API,
+    NewsItem,
+    get_validator_store,
+    package_payload,
+    parse_package,
+)
+from common import CACHE_DIR, transport
+from common.metrics import get_metrics
+
+DEFAULT_INDEX_PATH = CACHE_DIR / "pub_versions.json"
+
+# 搜索条件：只包含支持 Flutter SDK 的包
+SEARCH_QUERY = "sdk:flutter"
+
+# 默认跟踪的包数量和并发线程数
+DEFAULT_BULK_LIMIT = 2000
+DEFAULT_BULK_WORKERS = 8
+
+# 每处理多少个包输出一次进度
+PROGRESS_INTERVAL = 200
+
+
+class VersionIndex:
+    """包名到最新版本信息（package_payload 的格式）的映射，线程安全"""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.packages: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.packages = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"读取版本索引失败，将重新抓取: {e}")
+
+    def get(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            return self.packages.get(name)
+
+    def update(self, name: str, payload: Dict) -> bool:
+        """记录包的最新版本信息，返回版本号是否发生变化"""
+        version = payload["latest"]["version"]
+        with self._lock:
+            previous = self.packages.get(name)
+            if previous is not None and previous["latest"]["version"] == version:
+                return False
+            self.packages[name] = payload
+            self._dirty = True
+            return True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.packages, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def list_flutter_packages(limit: int = DEFAULT_BULK_LIMIT, query: str = SEARCH_QUERY) -> List[str]:
+    """分页请求搜索接口，返回前 limit 个包名（按 pub.dev 默认排序）"""
+    store = get_validator_store()
+    names: List[str] = []
+    url: Optional[str] = f"{PUB_SEARCH_API}?{urlencode({'q': query})}"
+
+    while url and len(names) < limit:
+        response = transport.get(url, headers=store.conditional_headers(url), timeout=30)
+        if response.status_code == 304:
+            page = store.load(url)
+        else:
+            response.raise_for_status()
+            data = response.json()
+            page = {
+                "names": [entry["package"] for entry in data.get("packages", [])],
+                "next": data.get("next"),
+            }
+            store.save(url, response.headers, page)
+
+        if not page["names"]:
+            break
+        names.extend(page["names"])
+        url = page["next"]
+
+    return names[:limit]
+
+
+class BulkStats:
+    """批量抓取的计数，多个线程共同更新"""
+
+    def __init__(self):
+        self.changed = 0
+        self.unchanged = 0
+        self.not_modified = 0
+        self.failed = 0
+        self.done = 0
+        self._lock = threading.Lock()
+
+    def add(self, field: str, total: int):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+            self.done += 1
+            if self.done % PROGRESS_INTERVAL == 0:
+                print(f"  已处理 {self.done}/{total} 个包")
+
+
+def refresh_package(name: str, index: VersionIndex, stats: BulkStats, total: int):
+    """请求单个包的详情并更新版本索引"""
+    store = get_validator_store()
+    url = f"{PUB_DEV_API}/{name}"
+    # 索引中没有的包不发条件请求，否则 304 时没有可用的数据
+    headers = store.conditional_headers(url) if index.get(name) is not None else {}
+
+    try:
+        response = transport.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            store.load(url)
+            stats.add("not_modified", total)
+            return
+        response.raise_for_status()
+
+        payload = package_payload(response.json())
+        # 校验器存储只用于条件请求，完整数据保存在版本索引中
+        store.save(url, response.headers, payload["latest"]["version"])
+        stats.add("changed" if index.update(name, payload) else "unchanged", total)
+    except Exception as e:
+        print(f"  获取 {name} 失败: {e}")
+        stats.add("failed", total)
+
+
+def fetch_bulk_package_updates(
+    limit: int = DEFAULT_BULK_LIMIT,
+    workers: int = DEFAULT_BULK_WORKERS,
+    index: Optional[VersionIndex] = None,
+) -> List[NewsItem]:
+    """批量获取前 limit 个 Flutter 包中最近 7 天内更新的包"""
+    print("正在批量获取 pub.dev 包更新...")
+    index = index or VersionIndex()
+
+    try:
+        names = list_flutter_packages(limit)
+    except Exception as e:
+        print(f"  ❌ 获取包列表失败: {e}")
+        return []
+    print(f"  包列表: {len(names)} 个包")
+
+    stats = BulkStats()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name in names:
+            pool.submit(refresh_package, name, index, stats, len(names))
+    index.save()
+
+    news = []
+    for name in names:
+        payload = index.get(name)
+        if payload is None:
+            continue
+        with get_metrics().timed("parse", urlsplit(PUB_DEV_API).netloc):
+            item = parse_package(name, payload)
+        if item is not None:
+            news.append(item)
+
+    print(
+        f"  版本变化 {stats.changed} 个，未变化 {stats.unchanged + stats.not_modified} 个"
+        f"（304: {stats.not_modified}），失败 {stats.failed} 个"
+    )
+    print(f"  ✅ 获取到 {len(news)} 个包更新")
+    return news
+
@@ -0,0 +1,170 @@
+"""
+Flutter 版本发布的本地存储
+
+第一次运行时按 GitHub 的 Link 响应头逐页读取全部 Releases，按 tag_name 保存到
+scripts/.cache/flutter_releases.json。之后每次同步从最新一页开始读取，遇到已保存过的
+tag 就停止翻页，只请求比上次更新的部分；第一页还附带条件请求，没有新版本时返回 304。
+
+按渠道（stable / beta）筛选、限制数量都是对本地存储的查询，不再发起请求。
+
+同步由 news_crawler.fetch_flutter_releases 调用，也可以单独执行：
+    python release_store.py sync
+    python release_store.py sync --full
+    python release_store.py list --channel beta --limit 5
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common import CACHE_DIR
+
+DEFAULT_STORE_PATH = CACHE_DIR / "flutter_releases.json"
+
+# 同步时每页请求的数量（GitHub 允许的最大值）
+SYNC_PAGE_SIZE = 100
+
+# 存储中保留的字段（parse_releases 用到的字段）
+RELEASE_FIELDS = ("tag_name", "name", "html_url", "published_at", "prerelease", "body")
+
+CHANNELS = ("stable", "beta")
+
+_NEXT_LINK = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+
+
+def next_page_url(headers: Mapping[str, str]) -> Optional[str]:
+    """从 Link 响应头中取出下一页地址，没有下一页时返回 None"""
+    match = _NEXT_LINK.search(headers.get("Link", ""))
+    return match.group(1) if match else None
+
+
+def release_channel(release: Dict) -> str:
+    """版本所属渠道：预发布版本和 .pre 版本号属于 beta，其余属于 stable"""
+    if release.get("prerelease") or ".pre" in release.get("tag_name", ""):
+        return "beta"
+    return "stable"
+
+
+class ReleaseStore:
+    """按 tag_name 保存的版本发布记录"""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH):
+        self.path = Path(path)
+        self.releases: Dict[str, Dict] = {}
+        self.synced_at = 0.0
+        # 是否已经完整读到过最后一页；首次同步中断时下次会继续翻页补齐
+        self.complete = False
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.releases = data.get("releases", {})
+                self.synced_at = data.get("synced_at", 0.0)
+                self.complete = data.get("complete", False)
+            except (OSError, ValueError) as e:
+                print(f"读取版本存储失败，将重新同步: {e}")
+
+    def sync_url(self, api_url: str) -> str:
+        """同步的第一页地址"""
+        return f"{api_url}?per_page={SYNC_PAGE_SIZE}"
+
+    def merge_page(self, page: List[Dict], full: bool = False) -> bool:
+        """保存一页版本，返回是否需要继续读取下一页
+
+        页面按发布时间从新到旧排列，遇到已保存的 tag 说明后面的都已同步过；
+        full=True 或历史尚未完整同步时忽略这一点，继续读取。
+        """
+        full = full or not self.complete
+        reached_known = False
+        with self._lock:
+            for release in page:
+                tag_name = release.get("tag_name")
+                if not tag_name:
+                    continue
+                if tag_name in self.releases and not full:
+                    reached_known = True
+                    continue
+                self.releases[tag_name] = {field: release.get(field) for field in RELEASE_FIELDS}
+                self._dirty = True
+        return bool(page) and not reached_known
+
+    def mark_synced(self, reached_end: bool):
+        """记录同步时间；reached_end 表示本次读到了最后一页"""
+        with self._lock:
+            self.synced_at = time.time()
+            self.complete = self.complete or reached_end
+            self._dirty = True
+
+    def query(self, channel: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        """按发布时间从新到旧返回版本，可按渠道筛选"""
+        with self._lock:
+            releases = list(self.releases.values())
+        if channel:
+            releases = [release for release in releases if release_channel(release) == channel]
+        releases.sort(key=lambda release: release.get("published_at") or "", reverse=True)
+        return releases[:limit] if limit is not None else releases
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {"synced_at": self.synced_at, "complete": self.complete, "releases": self.releases},
+                    f, ensure_ascii=False
+                )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+_store: Optional[ReleaseStore] = None
+_store_lock = threading.Lock()
+
+
+def get_release_store() -> ReleaseStore:
+    """获取进程内共享的版本存储"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReleaseStore()
+        return _store
+
+
+def main():
+    import argparse
+    # 通过 news_crawler 导入，与 sync_releases 使用同一个存储实例
+    from news_crawler import get_release_store, sync_releases
+
+    parser = argparse.ArgumentParser(description="Flutter 版本发布存储")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="同步新版本")
+    sync_parser.add_argument("--full", action="store_true", help="重新读取全部历史")
+    list_parser = subparsers.add_parser("list", help="查看已保存的版本")
+    list_parser.add_argument("--channel", choices=CHANNELS, help="只显示指定渠道")
+    list_parser.add_argument("--limit", type=int, default=20, help="显示数量")
+
+    args = parser.parse_args()
+    store = get_release_store()
+
+    if args.command == "sync":
+        added = sync_releases(full=args.full)
+        print(f"新增 {added} 个版本，共 {len(store.releases)} 个")
+    else:
+        for release in store.query(args.channel, args.limit):
+            print(f"{(release.get('published_at') or '')[:10]}  "
+                  f"{release_channel(release):<6}  {release['tag_name']}")
+
+
+if __name__ == "__main__":
+    main()
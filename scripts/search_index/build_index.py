@@ -0,0 +1,439 @@
+"""
+文档全文搜索索引 - 为 docs/ 下的全部页面生成按词前缀分片的倒排索引
+
+分词规则（客户端对查询词使用相同的规则）：
+- 中文：连续的汉字按二元组切分（"状态管理" → 状态 / 态管 / 管理），单个汉字保留为一个词
+- 英文：ASCII 标识符整体转为小写（setState → setstate），忽略常见停用词；
+  WIDGET_CATEGORIES 中的 Widget 名称额外按驼峰拆分（ElevatedButton → elevated / button）
+
+页面标题中的词权重为 5，小标题中的为 2，正文中的为 1，同一页面内累加。
+
+输出目录（默认 docs/public/search-index，构建后位于站点的 /search-index/）：
+- manifest.json：页面列表和分片表
+    {"version": 1, "docs": [{"url": ..., "title": ...}, ...],
+     "shards": [{"prefix": "a", "file": "61.json"}, ...]}
+- {前缀的 UTF-8 十六进制}.json：一个分片
+    {"terms": {"词": [页面编号增量, 权重, 页面编号增量, 权重, ...]}}
+
+分片按词排序后以前缀为边界切分：分片 i 包含所有满足 prefix_i <= 词 < prefix_(i+1) 的词。
+客户端对每个查询词在分片表中二分查找最后一个 prefix 不大于该词的分片，只加载用到的分片。
+
+重新生成时按文件的修改时间和大小判断页面是否变化，变化时再比较内容哈希，只对内容变化的
+页面重新分词，分词结果缓存在 scripts/.cache/search_tokens.json；Widget 名称集合变化时全部页面
+重新分词。内容没有变化的分片不会改写，上一次 manifest 中列出、这一次不再使用的分片会被删除。
+
+使用方法（在 scripts 目录下执行）：
+    python search_index/build_index.py
+    python search_index/build_index.py --full
+    python search_index/build_index.py search "状态管理 setState"
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from common import CACHE_DIR
+from common.output import get_output_writer
+
+DOCS_DIR = SCRIPTS_DIR.parent / "docs"
+DEFAULT_OUTPUT_DIR = DOCS_DIR / "public" / "search-index"
+DEFAULT_CACHE_PATH = CACHE_DIR / "search_tokens.json"
+
+INDEX_VERSION = 1
+
+# 分词规则变化时修改，使缓存中的分词结果全部失效
+TOKENIZER_VERSION = 1
+
+# 分片的目标大小（字节），超过时按更长的前缀继续切分
+SHARD_TARGET_BYTES = 32 * 1024
+MAX_PREFIX_LENGTH = 3
+
+TITLE_WEIGHT = 5
+HEADING_WEIGHT = 2
+BODY_WEIGHT = 1
+
+# 不参与索引的目录（VitePress 配置和静态资源）
+EXCLUDED_DIRS = {".vitepress", "public", "node_modules"}
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "the", "this", "to", "with",
+}
+
+_CJK = "㐀-䶿一-鿿豈-﫿"
+_CJK_RUN = re.compile(f"[{_CJK}]+")
+_IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+_CAMEL_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+_FRONTMATTER = re.compile(r"\A---\n(.*?)\n---\n", re.S)
+_FRONTMATTER_TITLE = re.compile(r"^title:\s*['\"]?(.*?)['\"]?\s*$", re.M)
+_SCRIPT_STYLE = re.compile(r"<(script|style)\b.*?</\1>", re.S | re.I)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_ATTRIBUTE_VALUE = re.compile(r"=\s*\"([^\"]*)\"")
+_LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_URL = re.compile(r"https?://\S+")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$", re.M)
+
+
+def widget_names() -> Set[str]:
+    """WIDGET_CATEGORIES 中的全部 Widget 名称（widget_crawler/categories.py 不依赖爬虫的第三方库）"""
+    sys.path.insert(0, str(SCRIPTS_DIR / "widget_crawler"))
+    from categories import WIDGET_CATEGORIES
+    return {name for category in WIDGET_CATEGORIES.values() for name in category["widgets"]}
+
+
+def widgets_digest(widgets: Set[str]) -> str:
+    """Widget 名称集合的哈希，集合变化时（爬虫新增或删除 Widget）页面的分词结果失效"""
+    return hashlib.sha256("\n".join(sorted(widgets)).encode("utf-8")).hexdigest()
+
+
+def tokenize(text: str, widgets: Set[str] = frozenset()) -> Iterator[str]:
+    """按索引的分词规则切分文本"""
+    for run in _CJK_RUN.findall(text):
+        if len(run) == 1:
+            yield run
+        for i in range(len(run) - 1):
+            yield run[i:i + 2]
+
+    for identifier in _IDENTIFIER.findall(text):
+        term = identifier.lower()
+        if len(term) >= 2 and term not in STOPWORDS:
+            yield term
+        if identifier in widgets:
+            for part in _CAMEL_PART.findall(identifier):
+                part = part.lower()
+                if len(part) >= 2 and part != term and part not in STOPWORDS:
+                    yield part
+
+
+def _strip_html(match: re.Match) -> str:
+    # 组件的属性值（如 FeatureCard 的 title / description）也是页面内容
+    return " " + " ".join(_ATTRIBUTE_VALUE.findall(match.group(0))) + " "
+
+
+def parse_page(content: str, fallback_title: str) -> Tuple[str, str, str]:
+    """拆出页面的 (标题, 小标题文本, 正文文本)"""
+    title = ""
+    match = _FRONTMATTER.match(content)
+    if match:
+        title_match = _FRONTMATTER_TITLE.search(match.group(1))
+        if title_match:
+            title = title_match.group(1)
+        content = content[match.end():]
+
+    content = _SCRIPT_STYLE.sub(" ", content)
+    content = _HTML_TAG.sub(_strip_html, content)
+    content = _LINK.sub(r"\1", content)
+    content = _URL.sub(" ", content)
+
+    headings = []
+    for level, text in _HEADING.findall(content):
+        if level == "#" and not title:
+            title = text.strip()
+        else:
+            headings.append(text)
+    body = _HEADING.sub(" ", content)
+    return title or fallback_title, "\n".join(headings), body
+
+
+def page_terms(content: str, fallback_title: str, widgets: Set[str]) -> Tuple[str, Dict[str, int]]:
+    """页面标题和每个词的权重"""
+    title, headings, body = parse_page(content, fallback_title)
+    weights: Counter = Counter()
+    for term in tokenize(title, widgets):
+        weights[term] += TITLE_WEIGHT
+    for term in tokenize(headings, widgets):
+        weights[term] += HEADING_WEIGHT
+    for term in tokenize(body, widgets):
+        weights[term] += BODY_WEIGHT
+    return title, dict(weights)
+
+
+def page_url(path: Path, docs_dir: Path) -> str:
+    """页面相对站点根目录的地址（不含 base），与 VitePress 的路由一致"""
+    relative = path.relative_to(docs_dir).with_suffix("").as_posix()
+    if relative == "index":
+        return ""
+    if relative.endswith("/index"):
+        return relative[:-len("index")]
+    return relative + ".html"
+
+
+def iter_pages(docs_dir: Path) -> Iterator[Path]:
+    for path in sorted(docs_dir.rglob("*.md")):
+        if not EXCLUDED_DIRS.intersection(path.relative_to(docs_dir).parts):
+            yield path
+
+
+class TokenCache:
+    """每个页面的分词结果，按修改时间、大小、内容哈希和 Widget 名称集合判断是否需要重新分词"""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.pages: Dict[str, Dict] = {}
+        self.reused = 0
+        self.tokenized = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("tokenizer") == TOKENIZER_VERSION:
+                    self.pages = data.get("pages", {})
+            except (OSError, ValueError) as e:
+                print(f"读取分词缓存失败，将重新分词: {e}")
+
+    def get(self, key: str, path: Path, widgets: Set[str]) -> Dict:
+        """返回页面的 {"title", "terms"}，页面和 Widget 名称集合都没有变化时使用缓存"""
+        stat = path.stat()
+        widgets_key = widgets_digest(widgets)
+        entry = self.pages.get(key)
+        if entry and entry.get("widgets") != widgets_key:
+            # 驼峰拆分只作用于 Widget 名称，集合变化后需要重新分词
+            entry = None
+        if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+            self.reused += 1
+            return entry
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry and entry["sha256"] == digest:
+            # 只是修改时间变化（例如重新检出），内容相同
+            entry.update(mtime=stat.st_mtime, size=stat.st_size)
+            self._dirty = True
+            self.reused += 1
+            return entry
+
+        title, terms = page_terms(raw.decode("utf-8"), path.stem, widgets)
+        entry = {
+            "mtime": stat.st_mtime, "size": stat.st_size, "sha256": digest,
+            "widgets": widgets_key, "title": title, "terms": terms,
+        }
+        with self._lock:
+            self.pages[key] = entry
+            self._dirty = True
+        self.tokenized += 1
+        return entry
+
+    def prune(self, keys: Iterable[str]):
+        """删除已经不存在的页面"""
+        keep = set(keys)
+        for key in list(self.pages):
+            if key not in keep:
+                del self.pages[key]
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"tokenizer": TOKENIZER_VERSION, "pages": self.pages}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+def encode_postings(postings: List[Tuple[int, int]]) -> List[int]:
+    """[(页面编号, 权重), ...] → [编号增量, 权重, 编号增量, 权重, ...]"""
+    encoded = []
+    previous = 0
+    for doc_id, weight in postings:
+        encoded.extend((doc_id - previous, weight))
+        previous = doc_id
+    return encoded
+
+
+def decode_postings(encoded: List[int]) -> List[Tuple[int, int]]:
+    postings = []
+    doc_id = 0
+    for i in range(0, len(encoded), 2):
+        doc_id += encoded[i]
+        postings.append((doc_id, encoded[i + 1]))
+    return postings
+
+
+def split_shards(terms: List[Tuple[str, int]], prefix_length: int = 1) -> List[Tuple[str, List[Tuple[str, int]]]]:
+    """把已排序的 (词, 大小) 按前缀分组，组过大时用更长的前缀继续切分"""
+    groups: List[Tuple[str, List[Tuple[str, int]]]] = []
+    for term, size in terms:
+        prefix = term[:prefix_length]
+        if groups and groups[-1][0] == prefix:
+            groups[-1][1].append((term, size))
+        else:
+            groups.append((prefix, [(term, size)]))
+
+    result = []
+    for prefix, group in groups:
+        if sum(size for _, size in group) > SHARD_TARGET_BYTES and prefix_length < MAX_PREFIX_LENGTH:
+            result.extend(split_shards(group, prefix_length + 1))
+        else:
+            result.append((prefix, group))
+    return result
+
+
+def pack_shards(groups: List[Tuple[str, List[Tuple[str, int]]]]) -> List[Tuple[str, List[str]]]:
+    """合并相邻的小组，每个分片不超过 SHARD_TARGET_BYTES（单个组本身过大时除外）"""
+    shards: List[Tuple[str, List[str]]] = []
+    current_size = 0
+    for prefix, group in groups:
+        size = sum(size for _, size in group)
+        if shards and current_size + size <= SHARD_TARGET_BYTES:
+            shards[-1][1].extend(term for term, _ in group)
+            current_size += size
+        else:
+            shards.append((prefix, [term for term, _ in group]))
+            current_size = size
+    return shards
+
+
+_SHARD_FILE = re.compile(r"(?:[0-9a-f]{2})+\.json")
+
+
+def shard_file(prefix: str) -> str:
+    return prefix.encode("utf-8").hex() + ".json"
+
+
+def manifest_files(output_dir: Path, manifest: Optional[Dict] = None) -> Set[str]:
+    """索引写出的文件名（分片和 manifest.json）；未指定 manifest 时读取输出目录中已有的"""
+    if manifest is None:
+        try:
+            with open(output_dir / "manifest.json", 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return set()
+    files = {shard["file"] for shard in manifest.get("shards", [])} | {"manifest.json"}
+    # 只认 shard_file 生成的文件名，避免损坏的 manifest 指向其他文件
+    return {name for name in files if name == "manifest.json" or _SHARD_FILE.fullmatch(name)}
+
+
+def build_index(
+    docs_dir: Path = DOCS_DIR,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    cache: Optional[TokenCache] = None,
+) -> Dict:
+    """生成索引，返回 manifest"""
+    cache = cache or TokenCache()
+    widgets = widget_names()
+    previous_files = manifest_files(output_dir)
+
+    docs = []
+    postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    keys = []
+    for doc_id, path in enumerate(iter_pages(docs_dir)):
+        key = path.relative_to(docs_dir).as_posix()
+        keys.append(key)
+        entry = cache.get(key, path, widgets)
+        docs.append({"url": page_url(path, docs_dir), "title": entry["title"]})
+        for term, weight in entry["terms"].items():
+            postings[term].append((doc_id, weight))
+    cache.prune(keys)
+
+    encoded = {term: encode_postings(postings[term]) for term in sorted(postings)}
+    sizes = [
+        (term, len(json.dumps(term, ensure_ascii=False)) + len(json.dumps(value)) + 2)
+        for term, value in encoded.items()
+    ]
+    shards = pack_shards(split_shards(sizes))
+
+    writer = get_output_writer()
+    manifest = {"version": INDEX_VERSION, "docs": docs, "shards": []}
+    for prefix, terms in shards:
+        name = shard_file(prefix)
+        manifest["shards"].append({"prefix": prefix, "file": name})
+        writer.write_text(
+            output_dir / name,
+            json.dumps({"terms": {term: encoded[term] for term in terms}}, ensure_ascii=False, separators=(",", ":"))
+        )
+    writer.write_text(output_dir / "manifest.json", json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+
+    # 删除分片边界变化后不再使用的旧分片：只删除上一份 manifest 中列出的文件，
+    # 输出目录中的其他文件（例如用 --output 指定了已有目录）保持不变
+    current = manifest_files(output_dir, manifest)
+    for name in previous_files - current:
+        path = output_dir / name
+        if path.exists():
+            path.unlink()
+
+    cache.save()
+    return manifest
+
+
+def find_shard(manifest: Dict, term: str) -> Optional[Dict]:
+    """二分查找词所在的分片"""
+    shards = manifest["shards"]
+    lo, hi = 0, len(shards)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if shards[mid]["prefix"] <= term:
+            lo = mid + 1
+        else:
+            hi = mid
+    return shards[lo - 1] if lo else None
+
+
+def search(query: str, output_dir: Path = DEFAULT_OUTPUT_DIR, limit: int = 10) -> List[Tuple[Dict, int]]:
+    """用生成的索引搜索，流程与客户端相同：只读取查询词所在的分片，要求包含全部查询词"""
+    with open(output_dir / "manifest.json", 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    loaded: Dict[str, Dict] = {}
+    scores: Optional[Counter] = None
+    for term in set(tokenize(query)):
+        shard = find_shard(manifest, term)
+        if shard is None:
+            return []
+        if shard["file"] not in loaded:
+            with open(output_dir / shard["file"], 'r', encoding='utf-8') as f:
+                loaded[shard["file"]] = json.load(f)["terms"]
+        term_scores = Counter(dict(decode_postings(loaded[shard["file"]].get(term, []))))
+        if scores is None:
+            scores = term_scores
+        else:
+            scores = Counter({doc_id: scores[doc_id] + weight for doc_id, weight in term_scores.items() if doc_id in scores})
+
+    if not scores:
+        return []
+    return [(manifest["docs"][doc_id], score) for doc_id, score in scores.most_common(limit)]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="文档全文搜索索引")
+    parser.add_argument("command", nargs="?", choices=["build", "search"], default="build")
+    parser.add_argument("query", nargs="?", help="search 的查询内容")
+    parser.add_argument("--docs", default=str(DOCS_DIR), help="文档目录")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT_DIR), help="索引输出目录")
+    parser.add_argument("--full", action="store_true", help="忽略分词缓存，重新分词全部页面")
+    args = parser.parse_args()
+
+    output_dir = Path(args.output)
+    if args.command == "search":
+        if not args.query:
+            parser.error("search 需要指定查询内容")
+        for doc, score in search(args.query, output_dir):
+            print(f"{score:>5}  {doc['title']}  /{doc['url']}")
+        return
+
+    cache = TokenCache()
+    if args.full:
+        cache.pages.clear()
+    manifest = build_index(Path(args.docs), output_dir, cache)
+    print(f"✅ 索引已生成: {len(manifest['docs'])} 个页面, {len(manifest['shards'])} 个分片 → {output_dir}")
+    print(f"分词: {cache.tokenized} 个页面重新分词, {cache.reused} 个使用缓存")
+    get_output_writer().report()
+
+
+if __name__ == "__main__":
+    main()
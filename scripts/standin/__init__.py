@@ -0,0 +1,7 @@
+"""
+本地替身服务 - 在没有网络的环境下运行和压测两个爬虫
+
+用 fixtures/ 中录制的数据模拟 Medium RSS、GitHub Releases、pub.dev、
+api.flutter.dev 和翻译接口，可以配置延迟分布、错误率和 429 突发。
+详见 server.py。
+"""
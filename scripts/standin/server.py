@@ -0,0 +1,458 @@
+"""
+本地替身服务
+
+一个 HTTP 服务同时模拟爬虫访问的所有站点，路径与线上服务一致（见 common.endpoints）：
+
+    GET  /feed/flutter                        Medium RSS（fixtures/medium_feed.xml）
+    GET  /repos/flutter/flutter/releases      GitHub Releases，支持 per_page / page 和 Link 分页
+    GET  /api/search?q=...&page=N             pub.dev 搜索，每页 10 个包，返回 next
+    GET  /api/packages/{name}                 pub.dev 包详情
+    GET  /flutter/index.json                  api.flutter.dev 搜索数据
+    GET  /flutter/{库}/{类名}-class.html      api.flutter.dev 类页面（由 Container 页面替换类名生成）
+    POST /v1/chat/completions                 翻译接口，返回 "【译】原文"
+    GET  /_standin/stats                      各服务的请求数和状态码统计
+
+所有 GET 响应带 ETag，请求附带相同的 If-None-Match 时返回 304。
+
+每个服务（rss / github / pub / api / llm）可以单独配置，不带 "服务=" 前缀时作用于全部服务：
+    --latency [服务=]分布        fixed:MS | uniform:MIN,MAX | normal:MEAN,STDDEV | lognormal:MEDIAN,SIGMA（毫秒）
+    --error-rate [服务=]比例      以该比例随机返回 500 / 502 / 503
+    --burst [服务=]N,M[,秒]       每 N 个请求之后连续 M 个请求返回 429，Retry-After 为指定秒数（默认 1）
+
+用法（在 scripts 目录下执行）：
+    # 启动服务，再用 CRAWLER_STANDIN 环境变量让爬虫访问它
+    python -m standin.server serve --port 8080 --latency uniform:20,200 --burst pub=50,10
+    CRAWLER_STANDIN=http://127.0.0.1:8080 python news_crawler/news_crawler.py
+
+    # 启动服务、运行命令、输出统计后退出；--cold 使用空的临时缓存目录
+    python -m standin.server run --latency lognormal:80,0.6 --error-rate 0.05 --cold -- \\
+        python news_crawler/news_crawler.py --engine async -o /tmp/news.md -j /tmp/news.json
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+CLASS_PAGE_TEMPLATE = (
+    Path(__file__).resolve().parent.parent / "widget_crawler" / "fixtures" / "pages" / "Container-class.html"
+)
+
+SERVICES = ("rss", "github", "pub", "api", "llm")
+
+# pub.dev 搜索接口每页的包数量
+SEARCH_PAGE_SIZE = 10
+
+# GitHub 未指定 per_page 时的默认值
+GITHUB_DEFAULT_PER_PAGE = 30
+
+ERROR_STATUSES = (500, 502, 503)
+
+
+@dataclass
+class Latency:
+    """响应延迟分布（毫秒）"""
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+
+    @classmethod
+    def parse(cls, spec: str) -> "Latency":
+        kind, _, raw = spec.partition(":")
+        params = tuple(float(value) for value in raw.split(",")) if raw else (0.0,)
+        expected = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"无效的延迟分布: {spec}")
+        return cls(kind, params)
+
+    def sample(self) -> float:
+        """取一个延迟（秒）"""
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = random.uniform(*self.params)
+        elif self.kind == "normal":
+            ms = random.gauss(*self.params)
+        else:
+            median, sigma = self.params
+            ms = median * random.lognormvariate(0, sigma)
+        return max(ms, 0.0) / 1000
+
+
+@dataclass
+class Burst:
+    """每 every 个请求之后连续 length 个请求返回 429"""
+    every: int
+    length: int
+    retry_after: int = 1
+
+    @classmethod
+    def parse(cls, spec: str) -> "Burst":
+        values = [int(value) for value in spec.split(",")]
+        if len(values) not in (2, 3) or values[0] <= 0 or values[1] < 0:
+            raise ValueError(f"无效的 429 突发配置: {spec}")
+        return cls(*values)
+
+    def active(self, count: int) -> bool:
+        """第 count 个请求（从 1 开始）是否落在突发区间内"""
+        return (count - 1) % (self.every + self.length) >= self.every
+
+
+@dataclass
+class ServiceProfile:
+    """单个服务的故障注入配置"""
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    burst: Optional[Burst] = None
+
+
+def apply_option(profiles: Dict[str, ServiceProfile], option: str, spec: str):
+    """把 "[服务=]值" 形式的参数应用到对应服务"""
+    service, sep, value = spec.partition("=")
+    if not sep:
+        service, value = "", spec
+    targets = [service] if service else list(SERVICES)
+    for target in targets:
+        if target not in profiles:
+            raise ValueError(f"未知服务: {target}，可用: {', '.join(SERVICES)}")
+        profile = profiles[target]
+        if option == "latency":
+            profile.latency = Latency.parse(value)
+        elif option == "error_rate":
+            profile.error_rate = float(value)
+        else:
+            profile.burst = Burst.parse(value)
+
+
+class Fixtures:
+    """录制的响应数据"""
+
+    def __init__(self, recent_packages: int = 5, extra_packages: int = 0):
+        self.feed = (FIXTURES_DIR / "medium_feed.xml").read_bytes()
+        self.releases: List[Dict] = json.loads((FIXTURES_DIR / "github_releases.json").read_text(encoding="utf-8"))
+        self.classes: Dict[str, str] = json.loads((FIXTURES_DIR / "flutter_classes.json").read_text(encoding="utf-8"))
+        self.class_page = CLASS_PAGE_TEMPLATE.read_text(encoding="utf-8")
+        self.packages: Dict[str, Dict] = json.loads((FIXTURES_DIR / "pub_packages.json").read_text(encoding="utf-8"))
+
+        # 录制的发布时间已经过去很久，把前 recent_packages 个包改为最近几天发布，
+        # 使 parse_package 的 7 天筛选有结果
+        now = datetime.now(timezone.utc)
+        for i, data in enumerate(list(self.packages.values())[:recent_packages]):
+            published = now - timedelta(days=i, hours=1)
+            data["latest"]["published"] = published.strftime("%Y-%m-%dT%H:%M:%S.000000Z")
+
+        # 批量抓取压测用的合成包
+        for i in range(extra_packages):
+            name = f"standin_package_{i:05d}"
+            self.packages[name] = {
+                "name": name,
+                "latest": {
+                    "version": f"1.0.{i % 7}",
+                    "published": "2024-01-01T00:00:00.000000Z",
+                    "pubspec": {"name": name, "description": f"Synthetic package {i} for load testing."},
+                },
+            }
+
+    def index_json(self) -> List[Dict]:
+        return [
+            {
+                "name": name,
+                "qualifiedName": f"{library}.{name}",
+                "href": f"{library}/{name}-class.html",
+                "kind": 3,
+            }
+            for name, library in sorted(self.classes.items())
+        ]
+
+    def page(self, library: str, class_name: str) -> Optional[str]:
+        if self.classes.get(class_name) != library:
+            return None
+        return self.class_page.replace("Container", class_name)
+
+
+class StandinState:
+    """服务配置和运行统计，所有请求线程共享"""
+
+    def __init__(self, fixtures: Fixtures, profiles: Dict[str, ServiceProfile]):
+        self.fixtures = fixtures
+        self.profiles = profiles
+        self.requests: Counter = Counter()
+        self.statuses: Dict[str, Counter] = {service: Counter() for service in SERVICES}
+        self._lock = threading.Lock()
+
+    def next_request(self, service: str) -> int:
+        with self._lock:
+            self.requests[service] += 1
+            return self.requests[service]
+
+    def record_status(self, service: str, status: int):
+        with self._lock:
+            self.statuses[service][status] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                service: {
+                    "requests": self.requests[service],
+                    "statuses": {str(status): count for status, count in sorted(self.statuses[service].items())},
+                }
+                for service in SERVICES
+            }
+
+
+def fake_translation(prompt: str) -> str:
+    """按提示词的格式返回假翻译：编号句子逐行返回，批量标题返回 JSON，其余返回 "【译】原文" """
+    segments = re.findall(r"^\[(\d+)\] (.*)$", prompt, re.M)
+    if segments:
+        return "\n".join(f"[{number}] 【译】{text}" for number, text in segments)
+    match = re.search(r"\{.*\}", prompt, re.S)
+    if match:
+        try:
+            titles = json.loads(match.group(0))
+            return json.dumps({key: f"【译】{value}" for key, value in titles.items()}, ensure_ascii=False)
+        except ValueError:
+            pass
+    match = re.search(r"标题：(.*)", prompt)
+    if match:
+        return f"【译】{match.group(1).strip()}"
+    match = re.search(r"原文：\n(.*?)\n\n中文翻译", prompt, re.S)
+    if match:
+        return f"【译】{match.group(1).strip()}"
+    return f"【译】{prompt.strip()}"
+
+
+def route(path: str) -> Optional[str]:
+    """请求路径对应的服务"""
+    if path == "/feed/flutter":
+        return "rss"
+    if path.startswith("/repos/"):
+        return "github"
+    if path.startswith("/api/"):
+        return "pub"
+    if path.startswith("/flutter/"):
+        return "api"
+    if path.startswith("/v1/"):
+        return "llm"
+    return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    server_version = "standin/1.0"
+    state: StandinState
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, service: str, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+        self.state.record_status(service, status)
+
+    def _send_cached(self, service: str, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        """带 ETag 的 200 响应，If-None-Match 匹配时返回 304"""
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        headers = {**(headers or {}), "ETag": etag}
+        if self.headers.get("If-None-Match") == etag:
+            self._send(service, 304, headers=headers)
+        else:
+            self._send(service, 200, body, content_type, headers)
+
+    def _inject_faults(self, service: str) -> bool:
+        """按配置等待并注入 429 / 5xx，已发送错误响应时返回 True"""
+        profile = self.state.profiles[service]
+        count = self.state.next_request(service)
+        time.sleep(profile.latency.sample())
+        if profile.burst and profile.burst.active(count):
+            body = json.dumps({"message": "rate limited"}).encode()
+            self._send(service, 429, body, headers={"Retry-After": str(profile.burst.retry_after)})
+            return True
+        if profile.error_rate and random.random() < profile.error_rate:
+            self._send(service, random.choice(ERROR_STATUSES), b'{"message": "injected error"}')
+            return True
+        return False
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/_standin/stats":
+            body = json.dumps(self.state.stats()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        service = route(parts.path)
+        if service is None or service == "llm":
+            self.send_error(404)
+            return
+        if self._inject_faults(service):
+            return
+
+        query = parse_qs(parts.query)
+        fixtures = self.state.fixtures
+        base = f"http://{self.headers.get('Host')}"
+
+        if service == "rss":
+            self._send_cached(service, fixtures.feed, "application/rss+xml; charset=UTF-8")
+        elif service == "github":
+            per_page = int(query.get("per_page", [GITHUB_DEFAULT_PER_PAGE])[0])
+            page = int(query.get("page", ["1"])[0])
+            start = (page - 1) * per_page
+            body = json.dumps(fixtures.releases[start:start + per_page]).encode()
+            headers = {}
+            if start + per_page < len(fixtures.releases):
+                headers["Link"] = f'<{base}{parts.path}?per_page={per_page}&page={page + 1}>; rel="next"'
+            self._send_cached(service, body, "application/json", headers)
+        elif parts.path == "/api/search":
+            page = int(query.get("page", ["1"])[0])
+            names = list(fixtures.packages)
+            start = (page - 1) * SEARCH_PAGE_SIZE
+            data: Dict = {"packages": [{"package": name} for name in names[start:start + SEARCH_PAGE_SIZE]]}
+            if start + SEARCH_PAGE_SIZE < len(names):
+                q = query.get("q", [""])[0]
+                data["next"] = f"{base}/api/search?q={q}&page={page + 1}"
+            self._send_cached(service, json.dumps(data).encode(), "application/json")
+        elif parts.path.startswith("/api/packages/"):
+            data = fixtures.packages.get(parts.path.rsplit("/", 1)[-1])
+            if data is None:
+                self._send(service, 404, b'{"error": {"code": "NotFound"}}')
+            else:
+                self._send_cached(service, json.dumps(data).encode(), "application/json")
+        elif parts.path == "/flutter/index.json":
+            self._send_cached(service, json.dumps(fixtures.index_json()).encode(), "application/json")
+        else:
+            match = re.fullmatch(r"/flutter/([A-Za-z0-9_]+)/([A-Za-z0-9_$]+)-class\.html", parts.path)
+            page = fixtures.page(*match.groups()) if match else None
+            if page is None:
+                self._send(service, 404, b"<html><body>404</body></html>", "text/html")
+            else:
+                self._send_cached(service, page.encode("utf-8"), "text/html; charset=utf-8")
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        service = route(parts.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = self.rfile.read(length)
+        if service != "llm":
+            self.send_error(404)
+            return
+        if self._inject_faults(service):
+            return
+
+        request = json.loads(payload or b"{}")
+        prompt = request.get("messages", [{}])[-1].get("content", "")
+        content = fake_translation(prompt)
+        body = json.dumps({
+            "id": "standin",
+            "model": request.get("model", ""),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 2, "completion_tokens": len(content) // 2},
+        }, ensure_ascii=False).encode("utf-8")
+        self._send(service, 200, body)
+
+
+def create_server(host: str, port: int, state: StandinState) -> ThreadingHTTPServer:
+    """创建服务（port 为 0 时由系统分配端口）"""
+    handler = type("Handler", (StandinHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def print_stats(state: StandinState):
+    print("\n替身服务统计:")
+    for service, entry in state.stats().items():
+        if entry["requests"]:
+            statuses = ", ".join(f"{status}: {count}" for status, count in entry["statuses"].items())
+            print(f"  {service:<7} {entry['requests']:>6} 次请求  ({statuses})")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="爬虫的本地替身服务")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    serve_parser = subparsers.add_parser("serve", help="启动服务")
+    run_parser = subparsers.add_parser("run", help="启动服务并运行命令，命令结束后退出")
+    run_parser.add_argument("--cold", action="store_true", help="使用空的临时缓存目录（CRAWLER_CACHE_DIR）")
+    run_parser.add_argument("cmd", nargs=argparse.REMAINDER, help="要运行的命令（放在 -- 之后）")
+
+    for sub in (serve_parser, run_parser):
+        sub.add_argument("--host", default="127.0.0.1")
+        sub.add_argument("--port", type=int, default=8080 if sub is serve_parser else 0)
+        sub.add_argument("--latency", action="append", default=[], metavar="[服务=]分布")
+        sub.add_argument("--error-rate", action="append", default=[], metavar="[服务=]比例")
+        sub.add_argument("--burst", action="append", default=[], metavar="[服务=]N,M[,秒]")
+        sub.add_argument("--recent-packages", type=int, default=5, help="改为最近几天发布的包数量")
+        sub.add_argument("--extra-packages", type=int, default=0, help="额外生成的合成包数量（批量抓取压测）")
+
+    args = parser.parse_args()
+
+    profiles = {service: ServiceProfile() for service in SERVICES}
+    try:
+        for option in ("latency", "error_rate", "burst"):
+            for spec in getattr(args, option):
+                apply_option(profiles, option, spec)
+    except ValueError as e:
+        parser.error(str(e))
+
+    state = StandinState(Fixtures(args.recent_packages, args.extra_packages), profiles)
+    server = create_server(args.host, args.port, state)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+
+    if args.command == "serve":
+        print(f"替身服务已启动: {base_url}")
+        print(f"  export CRAWLER_STANDIN={base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            print_stats(state)
+        return
+
+    cmd = args.cmd[1:] if args.cmd[:1] == ["--"] else args.cmd
+    if not cmd:
+        parser.error("run 需要在 -- 之后指定要运行的命令")
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    env = {**os.environ, "CRAWLER_STANDIN": base_url}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if args.cold:
+            env["CRAWLER_CACHE_DIR"] = cache_dir
+        print(f"替身服务: {base_url}")
+        started = time.perf_counter()
+        returncode = subprocess.call(cmd, env=env)
+        elapsed = time.perf_counter() - started
+    server.shutdown()
+    server.server_close()
+    print_stats(state)
+    print(f"命令耗时 {elapsed:.2f} 秒，退出码 {returncode}")
+    sys.exit(returncode)
+
+
+if __name__ == "__main__":
+    main()
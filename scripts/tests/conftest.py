@@ -0,0 +1,26 @@
+"""
+scripts 下各脚本的测试（在 scripts 目录下执行 python -m pytest tests）
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from standin.server import SERVICES, Fixtures, ServiceProfile, StandinState, create_server
+
+
+@pytest.fixture(scope="session")
+def standin_url():
+    """在后台线程中启动本地替身服务，返回根地址"""
+    state = StandinState(Fixtures(), {service: ServiceProfile() for service in SERVICES})
+    server = create_server("127.0.0.1", 0, state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
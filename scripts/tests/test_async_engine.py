@@ -0,0 +1,99 @@
+"""
+异步抓取引擎 AsyncFetcher 的重试行为：用假的 ClientSession 模拟连接中断
+"""
+
+import asyncio
+import sys
+
+import aiohttp
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, str(SCRIPTS_DIR / "news_crawler"))
+import async_engine  # noqa: E402
+
+
+class FakeContent:
+    def __init__(self, chunks, error):
+        self.chunks = chunks
+        self.error = error
+
+    async def iter_chunked(self, size):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error is not None:
+            raise self.error
+
+
+class FakeResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, chunks, error):
+        self.content = FakeContent(chunks, error)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """依次返回 responses 中的 (数据分段, 读完后抛出的异常)"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def get(self, url, **kwargs):
+        chunks, error = self.responses[self.requests]
+        self.requests += 1
+        if chunks is None:
+            raise error
+        return FakeResponse(chunks, error)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(async_engine.transport, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+
+def fetch(session, received):
+    fetcher = async_engine.AsyncFetcher(session)
+
+    def consume(chunk):
+        received.append(chunk)
+        return False
+
+    return asyncio.run(fetcher.get("https://example.com/feed", consume=consume))
+
+
+def test_interrupted_stream_is_not_retried():
+    session = FakeSession([
+        ([b"<rss>", b"<item>"], asyncio.TimeoutError()),
+        ([b"<rss>", b"<item>", b"</item></rss>"], None),
+    ])
+    received = []
+
+    with pytest.raises(asyncio.TimeoutError):
+        fetch(session, received)
+
+    # 第二次请求的响应体如果也交给 consume，同一个 FeedReader 会读到重复的开头
+    assert session.requests == 1
+    assert received == [b"<rss>", b"<item>"]
+
+
+def test_connection_error_before_stream_is_retried():
+    session = FakeSession([
+        (None, aiohttp.ClientConnectionError()),
+        ([b"<rss>", b"</rss>"], None),
+    ])
+    received = []
+
+    status, _, _ = fetch(session, received)
+
+    assert status == 200
+    assert session.requests == 2
+    assert received == [b"<rss>", b"</rss>"]
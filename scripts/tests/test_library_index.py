@@ -0,0 +1,80 @@
+"""
+Widget 库索引：所有库都找不到的 Widget 记录下来，有效期内不再探测
+"""
+
+import sys
+import time
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, str(SCRIPTS_DIR / "widget_crawler"))
+import crawler  # noqa: E402
+from library_index import LIBRARY_PRIORITY, MISSING_TTL_DAYS, LibraryIndex  # noqa: E402
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    index = LibraryIndex(tmp_path / "widget_library_index.json")
+    monkeypatch.setattr(crawler, "get_library_index", lambda: index)
+    return index
+
+
+class FakePages:
+    """代替 get_page：按库名返回 statuses 中的状态码（默认 404），记录请求过的地址"""
+
+    def __init__(self):
+        self.urls = []
+        self.statuses = {}
+
+    def __call__(self, url, offline=False, limiter=None):
+        self.urls.append(url)
+        return self.statuses.get(url.split("/")[-2], 404), b""
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    pages = FakePages()
+    monkeypatch.setattr(crawler, "get_page", pages)
+    return pages
+
+
+def test_missing_widget_is_not_probed_again(index, pages):
+    assert crawler.fetch_widget_page("NoSuchWidget") is None
+    assert len(pages.urls) == len(LIBRARY_PRIORITY)
+
+    # 记录会保存到索引文件，下次运行时仍然有效
+    index.save()
+    reloaded = LibraryIndex(index.path)
+    assert reloaded.is_missing("NoSuchWidget")
+
+    assert crawler.fetch_widget_page("NoSuchWidget") is None
+    assert len(pages.urls) == len(LIBRARY_PRIORITY)
+
+
+def test_expired_missing_widget_is_probed_again(index, pages):
+    index.missing["NoSuchWidget"] = time.time() - (MISSING_TTL_DAYS + 1) * 86400
+
+    assert crawler.fetch_widget_page("NoSuchWidget") is None
+    assert len(pages.urls) == len(LIBRARY_PRIORITY)
+
+
+def test_found_widget_clears_missing_record(index, pages):
+    index.missing["Card"] = time.time() - (MISSING_TTL_DAYS + 1) * 86400
+    pages.statuses["material"] = 200
+
+    library, _, _ = crawler.fetch_widget_page("Card")
+
+    assert library == "material"
+    assert index.lookup("Card") == "material"
+    assert not index.is_missing("Card")
+
+
+@pytest.mark.parametrize("offline, status", [(True, 404), (False, 503)])
+def test_uncertain_misses_are_not_recorded(index, pages, offline, status):
+    # 离线模式下的 404 只表示没有缓存，5xx 可能是临时错误
+    pages.statuses["material"] = status
+
+    assert crawler.fetch_widget_page("Card", offline=offline) is None
+    assert not index.is_missing("Card")
@@ -0,0 +1,52 @@
+"""
+Widget 页面解析后端的一致性：lxml 后端逐字段与 BeautifulSoup（html.parser）后端的输出相同
+"""
+
+import sys
+
+import pytest
+
+from conftest import SCRIPTS_DIR
+
+sys.path.insert(0, str(SCRIPTS_DIR / "widget_crawler"))
+import parsers
+
+pytest.importorskip("lxml")
+
+PAGES_DIR = SCRIPTS_DIR / "widget_crawler" / "fixtures" / "pages"
+PAGES = sorted(PAGES_DIR.glob("*.html"))
+FIELDS = ["description", "inheritance", "constructors", "properties"]
+
+
+def test_fixture_pages():
+    # 至少包含 Container 之外的几个页面，其中有内联 script 的页面
+    assert len(PAGES) >= 4
+    assert any(b"<script>" in path.read_bytes().split(b"</head>", 1)[1] for path in PAGES)
+
+
+@pytest.mark.parametrize("field", FIELDS)
+@pytest.mark.parametrize("page", PAGES, ids=lambda path: path.stem)
+def test_lxml_matches_html_parser(page, field):
+    content = page.read_bytes()
+    expected = parsers.parse_with_html_parser(content)
+    actual = parsers.parse_with_lxml(content)
+    assert set(actual) == set(FIELDS)
+    assert actual[field] == expected[field]
+
+
+@pytest.mark.parametrize("html, expected", [
+    ("<p>A <b>b</b> c</p>", "Abc"),
+    ("<p>before<script>var x = 1;</script> after</p>", "beforeafter"),
+    ("<p><style>.x { color: red; }</style>styled</p>", "styled"),
+    ("<p>kept<template><span>template</span></template> tail</p>", "kepttail"),
+    ("<p>one<!-- comment --> two</p>", "onetwo"),
+    ("<p><noscript>fallback</noscript> text</p>", "fallbacktext"),
+])
+def test_text_matches_get_text(html, expected):
+    from bs4 import BeautifulSoup
+    import lxml.html
+
+    reference = BeautifulSoup(html, "html.parser").p.get_text(strip=True)
+    element = lxml.html.fragment_fromstring(html)
+    assert reference == expected
+    assert parsers._text(element) == expected
@@ -0,0 +1,58 @@
+"""
+翻译记忆的统计：只有拿到译文并写入缓存的句子才计为新翻译
+"""
+
+import pytest
+
+from common.translation_cache import TranslationCache
+from common.translation_memory import TranslationMemory, build_segment_prompt
+
+TEXT = "First sentence. Second sentence.\n\nThird one."
+
+
+@pytest.fixture
+def memory(tmp_path):
+    cache = TranslationCache(tmp_path / "translations.sqlite3")
+    yield TranslationMemory("test-model", 0.1, "system", cache=cache)
+    cache.close()
+
+
+def numbered_reply(prompt: str) -> str:
+    """按编号返回 "译：原文" """
+    lines = [line for line in prompt.splitlines() if line.startswith("[")]
+    return "\n".join(f"{line.split(' ', 1)[0]} 译：{line.split(' ', 1)[1]}" for line in lines)
+
+
+def test_failed_request_is_not_counted(memory):
+    assert memory.translate(TEXT, lambda prompt: None) is None
+    assert (memory.reused, memory.translated) == (0, 0)
+    assert memory.lookup("First sentence.") is None
+
+
+def test_unparsable_reply_is_not_counted(memory):
+    assert memory.translate(TEXT, lambda prompt: "整段译文，没有编号") is None
+    assert (memory.reused, memory.translated) == (0, 0)
+
+
+def test_offline_is_not_counted(memory):
+    assert memory.translate(TEXT, numbered_reply, offline=True) is None
+    assert memory.translated == 0
+
+
+def test_translated_then_reused(memory):
+    prompts = []
+
+    def request(prompt):
+        prompts.append(prompt)
+        return numbered_reply(prompt)
+
+    translated = memory.translate(TEXT, request)
+    assert translated == "译：First sentence.译：Second sentence.\n\n译：Third one."
+    assert (memory.reused, memory.translated) == (0, 3)
+
+    # 失败后重试：已有的句子复用，只请求新句子
+    assert memory.translate("First sentence. New sentence.", lambda prompt: None) is None
+    assert (memory.reused, memory.translated) == (1, 3)
+    assert memory.translate("First sentence. New sentence.", request) is not None
+    assert prompts[-1] == build_segment_prompt(["New sentence."])
+    assert (memory.reused, memory.translated) == (2, 4)
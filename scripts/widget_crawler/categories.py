@@ -0,0 +1,65 @@
+"""
+Widget 分类表
+
+只包含数据、不依赖第三方库，docs_graph 和 search_index 读取分类时不需要安装爬虫的依赖。
+"""
+
+# Widget 分类
+WIDGET_CATEGORIES = {
+    "basics": {
+        "name": "基础组件",
+        "widgets": ["Container", "Text", "Image", "Icon", "RichText", "SelectableText"]
+    },
+    "layout": {
+        "name": "布局组件",
+        "widgets": ["Row", "Column", "Stack", "Wrap", "Flex", "Expanded", "Flexible", "Spacer", "Center", "Align", "Padding", "ConstrainedBox", "SizedBox", "AspectRatio", "FractionallySizedBox"]
+    },
+    "scrolling": {
+        "name": "滚动组件",
+        "widgets": ["ListView", "GridView", "SingleChildScrollView", "CustomScrollView", "PageView", "NestedScrollView", "Scrollbar"]
+    },
+    "buttons": {
+        "name": "按钮组件",
+        "widgets": ["ElevatedButton", "FilledButton", "TextButton", "OutlinedButton", "IconButton", "FloatingActionButton", "DropdownButton", "PopupMenuButton"]
+    },
+    "input": {
+        "name": "输入组件",
+        "widgets": ["TextField", "TextFormField", "Checkbox", "Radio", "Switch", "Slider", "DropdownButtonFormField", "DatePicker", "TimePicker"]
+    },
+    "dialogs": {
+        "name": "对话框组件",
+        "widgets": ["AlertDialog", "SimpleDialog", "Dialog", "BottomSheet", "SnackBar", "Banner"]
+    },
+    "navigation": {
+        "name": "导航组件",
+        "widgets": ["Navigator", "AppBar", "BottomNavigationBar", "NavigationBar", "NavigationRail", "TabBar", "Drawer", "BottomAppBar"]
+    },
+    "material": {
+        "name": "Material 组件",
+        "widgets": ["Scaffold", "Card", "Chip", "ListTile", "Divider", "ExpansionTile", "DataTable", "ProgressIndicator", "CircularProgressIndicator", "LinearProgressIndicator"]
+    },
+    "cupertino": {
+        "name": "Cupertino 组件",
+        "widgets": ["CupertinoApp", "CupertinoButton", "CupertinoTextField", "CupertinoSwitch", "CupertinoActivityIndicator", "CupertinoAlertDialog", "CupertinoNavigationBar"]
+    },
+    "animation": {
+        "name": "动画组件",
+        "widgets": ["AnimatedContainer", "AnimatedOpacity", "AnimatedBuilder", "AnimatedPositioned", "AnimatedSwitcher", "Hero", "FadeTransition", "SlideTransition", "ScaleTransition", "RotationTransition"]
+    },
+    "painting": {
+        "name": "绘制组件",
+        "widgets": ["CustomPaint", "ClipRect", "ClipRRect", "ClipOval", "ClipPath", "DecoratedBox", "BackdropFilter", "Transform"]
+    },
+    "async": {
+        "name": "异步组件",
+        "widgets": ["FutureBuilder", "StreamBuilder", "RefreshIndicator"]
+    },
+    "gesture": {
+        "name": "手势组件",
+        "widgets": ["GestureDetector", "InkWell", "InkResponse", "Draggable", "LongPressDraggable", "DragTarget", "Dismissible"]
+    },
+    "accessibility": {
+        "name": "无障碍组件",
+        "widgets": ["Semantics", "MergeSemantics", "ExcludeSemantics"]
+    }
+}
@@ -9,96 +9,40 @@ Flutter Widget 爬虫 - 从 api.flutter.dev 爬取 Widget 信息并使用 Deepse
 """
 
 import os
-import json
-import time
-import requests
-from bs4 import BeautifulSoup
+import sys
+import threading
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.translation_cache import get_cache
+from common.translation_memory import TranslationMemory
+from common.page_cache import get_page_cache
+from common.rate_limit import RateLimiter
+from common.metrics import DEFAULT_METRICS_DIR, get_metrics
+from common.endpoints import endpoint
+from common.output import get_output_writer
+from common.render import Document, Template
+from common import transport
+from categories import WIDGET_CATEGORIES
+from library_index import LIBRARY_PRIORITY, get_library_index
+from parsers import PARSERS, DEFAULT_PARSER, get_parser
 
 # Deepseek API 配置
-DEEPSEEK_API_URL = "https://yunwu.ai/v1/chat/completions"
+DEEPSEEK_API_URL = endpoint("DEEPSEEK_API_URL")
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY", "")
+TRANSLATE_MODEL = "deepseek-chat"
+TRANSLATE_SYSTEM_PROMPT = "你是一位专业的 Flutter/Dart 技术文档翻译专家。"
+TRANSLATE_TEMPERATURE = 0.3
 
-# Flutter API 文档基础 URL
-FLUTTER_API_BASE = "https://api.flutter.dev/flutter"
-
-# Widget 分类
-WIDGET_CATEGORIES = {
-    "basics": {
-        "name": "基础组件",
-        "widgets": ["Container", "Text", "Image", "Icon", "RichText", "SelectableText"]
-    },
-    "layout": {
-        "name": "布局组件",
-        "widgets": ["Row", "Column", "Stack", "Wrap", "Flex", "Expanded", "Flexible", "Spacer", "Center", "Align", "Padding", "ConstrainedBox", "SizedBox", "AspectRatio", "FractionallySizedBox"]
-    },
-    "scrolling": {
-        "name": "滚动组件",
-        "widgets": ["ListView", "GridView", "SingleChildScrollView", "CustomScrollView", "PageView", "NestedScrollView", "Scrollbar"]
-    },
-    "buttons": {
-        "name": "按钮组件",
-        "widgets": ["ElevatedButton", "FilledButton", "TextButton", "OutlinedButton", "IconButton", "FloatingActionButton", "DropdownButton", "PopupMenuButton"]
-    },
-    "input": {
-        "name": "输入组件",
-        "widgets": ["TextField", "TextFormField", "Checkbox", "Radio", "Switch", "Slider", "DropdownButtonFormField", "DatePicker", "TimePicker"]
-    },
-    "dialogs": {
-        "name": "对话框组件",
-        "widgets": ["AlertDialog", "SimpleDialog", "Dialog", "BottomSheet", "SnackBar", "Banner"]
-    },
-    "navigation": {
-        "name": "导航组件",
-        "widgets": ["Navigator", "AppBar", "BottomNavigationBar", "NavigationBar", "NavigationRail", "TabBar", "Drawer", "BottomAppBar"]
-    },
-    "material": {
-        "name": "Material 组件",
-        "widgets": ["Scaffold", "Card", "Chip", "ListTile", "Divider", "ExpansionTile", "DataTable", "ProgressIndicator", "CircularProgressIndicator", "LinearProgressIndicator"]
-    },
-    "cupertino": {
-        "name": "Cupertino 组件",
-        "widgets": ["CupertinoApp", "CupertinoButton", "CupertinoTextField", "CupertinoSwitch", "CupertinoActivityIndicator", "CupertinoAlertDialog", "CupertinoNavigationBar"]
-    },
-    "animation": {
-        "name": "动画组件",
-        "widgets": ["AnimatedContainer", "AnimatedOpacity", "AnimatedBuilder", "AnimatedPositioned", "AnimatedSwitcher", "Hero", "FadeTransition", "SlideTransition", "ScaleTransition", "RotationTransition"]
-    },
-    "painting": {
-        "name": "绘制组件",
-        "widgets": ["CustomPaint", "ClipRect", "ClipRRect", "ClipOval", "ClipPath", "DecoratedBox", "BackdropFilter", "Transform"]
-    },
-    "async": {
-        "name": "异步组件",
-        "widgets": ["FutureBuilder", "StreamBuilder", "RefreshIndicator"]
-    },
-    "gesture": {
-        "name": "手势组件",
-        "widgets": ["GestureDetector", "InkWell", "InkResponse", "Draggable", "LongPressDraggable", "DragTarget", "Dismissible"]
-    },
-    "accessibility": {
-        "name": "无障碍组件",
-        "widgets": ["Semantics", "MergeSemantics", "ExcludeSemantics"]
-    }
-}
+# Flutter API 文档基础 URL（可以通过环境变量覆盖，见 common.endpoints）
+FLUTTER_API_BASE = endpoint("FLUTTER_API_BASE")
 
 
-def translate_text(text: str, is_code: bool = False) -> str:
-    """使用 Deepseek API 翻译文本"""
-    if not text or not text.strip():
-        return text
-    
-    if is_code:
-        return text  # 代码不翻译
-    
-    headers = {
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    prompt = f"""请将以下 Flutter 文档内容翻译为中文，保持专业术语的准确性：
+def build_translate_prompt(text: str) -> str:
+    """文档翻译提示词"""
+    return f"""请将以下 Flutter 文档内容翻译为中文，保持专业术语的准确性：
     - 保留代码示例中的英文
     - 类名、方法名、属性名保持英文原样
     - 使用简洁专业的技术文档风格
@@ -107,188 +51,319 @@ def translate_text(text: str, is_code: bool = False) -> str:
 {text}
 
 中文翻译："""
+
+
+def request_translation(prompt: str, limiter=None) -> Optional[str]:
+    """向 Deepseek API 发送一次翻译请求，返回回复内容，失败时返回 None
+    
+    limiter 为 common.rate_limit.RateLimiter，在请求前限速。
+    """
+    headers = {
+        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
+        "Content-Type": "application/json"
+    }
     
     data = {
-        "model": "deepseek-chat",
+        "model": TRANSLATE_MODEL,
         "messages": [
-            {"role": "system", "content": "你是一位专业的 Flutter/Dart 技术文档翻译专家。"},
+            {"role": "system", "content": TRANSLATE_SYSTEM_PROMPT},
             {"role": "user", "content": prompt}
         ],
-        "temperature": 0.3,
+        "temperature": TRANSLATE_TEMPERATURE,
         "max_tokens": 2000
     }
     
     try:
-        response = requests.post(DEEPSEEK_API_URL, headers=headers, json=data, timeout=60)
+        if limiter is not None:
+            limiter.acquire()
+        response = transport.post(DEEPSEEK_API_URL, headers=headers, json=data, timeout=60, stage="translate")
         response.raise_for_status()
         result = response.json()
-        translated = result["choices"][0]["message"]["content"].strip()
-        return translated
+        content = result["choices"][0]["message"]["content"].strip()
+        # 接口没有返回 usage 时与 news_crawler 一样按文本估算
+        get_metrics().record_usage(
+            "translate", urlsplit(DEEPSEEK_API_URL).netloc,
+            result.get("usage"), TRANSLATE_SYSTEM_PROMPT + prompt, content
+        )
+        return content
     except Exception as e:
         print(f"翻译失败: {e}")
+        return None
+
+
+def translate_text(text: str, is_code: bool = False, limiter=None, offline: bool = False) -> str:
+    """使用 Deepseek API 翻译文本
+    
+    整段原文翻译过时直接使用缓存；否则按句子查翻译记忆，只把没有翻译过的句子合并为
+    一次请求发送，批量回复无法拆分时再整段翻译。
+    limiter 为 common.rate_limit.RateLimiter，仅在实际请求接口前限速，命中缓存时不等待。
+    offline=True 时只使用翻译缓存，未命中时返回原文。
+    """
+    if not text or not text.strip():
         return text
+    
+    if is_code:
+        return text  # 代码不翻译
+    
+    # 相同原文、提示词和模型参数已翻译过则直接使用缓存
+    cache = get_cache()
+    cache_prompt = TRANSLATE_SYSTEM_PROMPT + build_translate_prompt("{text}")
+    cached = cache.get(text, cache_prompt, TRANSLATE_MODEL, TRANSLATE_TEMPERATURE)
+    if cached is not None:
+        return cached
+    
+    translated = get_translation_memory().translate(
+        text, lambda prompt: request_translation(prompt, limiter), offline=offline
+    )
+    if translated is None:
+        if offline:
+            return text
+        translated = request_translation(build_translate_prompt(text), limiter)
+        if translated is None:
+            return text
+    
+    cache.set(text, cache_prompt, TRANSLATE_MODEL, TRANSLATE_TEMPERATURE, translated)
+    return translated
 
 
-def fetch_widget_info(widget_name: str, library: str = "widgets") -> Optional[Dict]:
-    """从 Flutter API 文档获取 Widget 信息"""
+_translation_memory: Optional[TranslationMemory] = None
+_translation_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> TranslationMemory:
+    """获取进程内共享的句子级翻译记忆"""
+    global _translation_memory
+    with _translation_memory_lock:
+        if _translation_memory is None:
+            _translation_memory = TranslationMemory(
+                TRANSLATE_MODEL, TRANSLATE_TEMPERATURE, TRANSLATE_SYSTEM_PROMPT
+            )
+        return _translation_memory
+
+
+def get_page(url: str, offline: bool = False, limiter=None) -> Tuple[int, bytes]:
+    """获取页面，返回 (状态码, 页面内容)
+    
+    有效期内的页面直接从页面缓存读取；offline=True 时只读缓存（忽略有效期），
+    未缓存视为 404。limiter 仅在实际发起请求前限速。
+    """
+    cache = get_page_cache()
+    content = cache.get(url, allow_stale=offline)
+    if content is not None:
+        return 200, content
+    if offline:
+        return 404, b""
+    
+    if limiter is not None:
+        limiter.acquire()
+    response = transport.get(url, timeout=30)
+    if response.status_code == 200:
+        cache.put(url, response.content)
+    return response.status_code, response.content
+
+
+def fetch_widget_page(
+    widget_name: str,
+    library: str = "widgets",
+    offline: bool = False,
+    limiter=None
+) -> Optional[Tuple[str, str, bytes]]:
+    """下载 Widget 的 API 文档页面，返回 (库名, URL, 页面内容)，找不到时返回 None
+    
+    优先使用库索引确定 Widget 所在的库，只需一次请求；索引中没有或索引过期导致
+    404 时才依次探测其他库，探测成功后记录到索引中。所有库都返回 404 时也记录下来，
+    有效期内不再探测。
+    """
+    index = get_library_index()
+    if index.is_missing(widget_name):
+        print(f"  未找到: {widget_name}（近期已确认所有库中都不存在，跳过）")
+        return None
+    library = index.lookup(widget_name) or library
     url = f"{FLUTTER_API_BASE}/{library}/{widget_name}-class.html"
     
+    print(f"正在获取: {widget_name}")
+    status, content = get_page(url, offline, limiter)
+    statuses = [status]
+    
+    if status == 404:
+        # 尝试其他库
+        for lib in LIBRARY_PRIORITY:
+            if lib != library:
+                alt_url = f"{FLUTTER_API_BASE}/{lib}/{widget_name}-class.html"
+                status, content = get_page(alt_url, offline, limiter)
+                statuses.append(status)
+                if status == 200:
+                    library = lib
+                    url = alt_url
+                    break
+    
+    if status != 200:
+        print(f"  未找到: {widget_name}")
+        # 离线模式下 404 只表示页面没有缓存；其他状态码可能是临时错误，下次仍然探测
+        if not offline and all(code == 404 for code in statuses):
+            index.record_missing(widget_name)
+        return None
+    
+    index.record(widget_name, library)
+    return library, url, content
+
+
+def parse_widget_page(
+    widget_name: str,
+    library: str,
+    url: str,
+    content: bytes,
+    parser: Optional[str] = None
+) -> Dict:
+    """解析 Widget 的 API 文档页面，parser 为 parsers.PARSERS 中的后端名称"""
+    return {
+        "name": widget_name,
+        "library": library,
+        "url": url,
+        **get_parser(parser)(content)
+    }
+
+
+def fetch_widget_info(
+    widget_name: str,
+    library: str = "widgets",
+    offline: bool = False,
+    parser: Optional[str] = None,
+    limiter=None
+) -> Optional[Dict]:
+    """从 Flutter API 文档获取 Widget 信息"""
     try:
-        print(f"正在获取: {widget_name}")
-        response = requests.get(url, timeout=30)
-        
-        if response.status_code == 404:
-            # 尝试其他库
-            for lib in ["material", "cupertino", "painting", "rendering"]:
-                if lib != library:
-                    alt_url = f"{FLUTTER_API_BASE}/{lib}/{widget_name}-class.html"
-                    response = requests.get(alt_url, timeout=30)
-                    if response.status_code == 200:
-                        library = lib
-                        break
-        
-        if response.status_code != 200:
-            print(f"  未找到: {widget_name}")
+        page = fetch_widget_page(widget_name, library, offline, limiter)
+        if page is None:
             return None
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # 获取描述
-        desc_section = soup.find('section', {'class': 'desc'})
-        description = ""
-        if desc_section:
-            paragraphs = desc_section.find_all('p')
-            description = '\n\n'.join([p.get_text(strip=True) for p in paragraphs[:3]])
-        
-        # 获取继承关系
-        inheritance = []
-        inheritance_section = soup.find('dt', string='Inheritance')
-        if inheritance_section:
-            inheritance_content = inheritance_section.find_next_sibling('dd')
-            if inheritance_content:
-                links = inheritance_content.find_all('a')
-                inheritance = [link.get_text(strip=True) for link in links]
-        
-        # 获取构造函数
-        constructors = []
-        constructors_section = soup.find('section', {'class': 'summary'})
-        if constructors_section:
-            constructor_list = constructors_section.find('dl', {'class': 'constructor-summary-list'})
-            if constructor_list:
-                items = constructor_list.find_all('dt')
-                for item in items[:5]:
-                    sig = item.get_text(strip=True)
-                    constructors.append(sig)
-        
-        # 获取属性
-        properties = []
-        props_section = soup.find('section', {'id': 'instance-properties'})
-        if props_section:
-            prop_list = props_section.find_all('dt')
-            for prop in prop_list[:10]:
-                prop_name = prop.find('span', {'class': 'name'})
-                if prop_name:
-                    properties.append(prop_name.get_text(strip=True))
-        
-        return {
-            "name": widget_name,
-            "library": library,
-            "url": url,
-            "description": description,
-            "inheritance": inheritance,
-            "constructors": constructors,
-            "properties": properties
-        }
+        with get_metrics().timed("parse", urlsplit(page[1]).netloc):
+            return parse_widget_page(widget_name, *page, parser=parser)
         
     except Exception as e:
         print(f"  获取失败: {widget_name} - {e}")
         return None
 
 
-def generate_widget_markdown(widget_info: Dict, translated_desc: str) -> str:
-    """生成 Widget 的 Markdown 文档"""
-    md = f"""# {widget_info['name']}
+# Widget 文档模板
+WIDGET_PAGE_HEADER = Template("""# {name}
 
-<Badge type="info" text="{widget_info['library']}" />
+<Badge type="info" text="{library}" />
 
 ## 简介
 
-{translated_desc}
+{description}
 
 ## 继承关系
 
 ```
-{' → '.join(widget_info.get('inheritance', ['Object']))}
+{inheritance}
 ```
 
 ## 构造函数
 
-"""
-    
-    for constructor in widget_info.get('constructors', []):
-        md += f"```dart\n{constructor}\n```\n\n"
-    
-    if widget_info.get('properties'):
-        md += "## 常用属性\n\n"
-        md += "| 属性 | 说明 |\n"
-        md += "|------|------|\n"
-        for prop in widget_info['properties']:
-            md += f"| `{prop}` | - |\n"
-    
-    md += f"""
+""")
+
+CONSTRUCTOR_BLOCK = Template("```dart\n{constructor}\n```\n\n")
+
+PROPERTY_TABLE_HEADER = Template("## 常用属性\n\n| 属性 | 说明 |\n|------|------|\n")
+
+PROPERTY_ROW = Template("| `{prop}` | - |\n")
+
+WIDGET_PAGE_FOOTER = Template("""
 ## 官方文档
 
-[Flutter API 文档]({widget_info['url']})
+[Flutter API 文档]({url})
 
 ## 示例代码
 
 ```dart
 // TODO: 添加示例代码
 ```
-"""
+""")
+
+
+def generate_widget_markdown(widget_info: Dict, translated_desc: str) -> str:
+    """生成 Widget 的 Markdown 文档"""
+    doc = Document()
+    doc.render(
+        WIDGET_PAGE_HEADER,
+        name=widget_info['name'],
+        library=widget_info['library'],
+        description=translated_desc,
+        inheritance=' → '.join(widget_info.get('inheritance', ['Object'])),
+    )
+    
+    for constructor in widget_info.get('constructors', []):
+        doc.render(CONSTRUCTOR_BLOCK, constructor=constructor)
+    
+    if widget_info.get('properties'):
+        doc.render(PROPERTY_TABLE_HEADER)
+        for prop in widget_info['properties']:
+            doc.render(PROPERTY_ROW, prop=prop)
     
-    return md
+    doc.render(WIDGET_PAGE_FOOTER, url=widget_info['url'])
+    return doc.getvalue()
 
 
-def crawl_all_widgets(output_dir: str = "../docs/widgets"):
-    """爬取所有 Widget 并生成文档"""
+def save_widget_markdown(output_path: Path, category_id: str, widget_name: str, md_content: str) -> Dict:
+    """保存单个 Widget 文档，返回索引条目"""
+    md_file = output_path / category_id / f"{widget_name.lower()}.md"
+    with get_metrics().timed("write"):
+        get_output_writer().write_text(md_file, md_content)
+    
+    return {
+        "name": widget_name,
+        "file": f"{category_id}/{widget_name.lower()}.md"
+    }
+
+
+def save_widgets_index(output_path: Path, all_widgets: List[Dict]):
+    """保存 index.json 并生成目录页"""
+    with get_metrics().timed("write"):
+        get_output_writer().write_json(output_path / "index.json", all_widgets)
+        generate_widgets_index(output_path, all_widgets)
+
+
+def crawl_all_widgets(
+    output_dir: str = "../docs/widgets",
+    offline: bool = False,
+    parser: Optional[str] = None
+):
+    """爬取所有 Widget 并生成文档（逐个处理）
+    
+    offline=True 时只使用页面缓存和翻译缓存，不发起任何网络请求。
+    """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
+    # 逐个处理时每秒最多请求 2 个页面，避免请求过快
+    fetch_limiter = RateLimiter(2)
+    
     all_widgets = []
     
     for category_id, category_info in WIDGET_CATEGORIES.items():
         print(f"\n=== 处理分类: {category_info['name']} ===")
         
-        category_dir = output_path / category_id
-        category_dir.mkdir(exist_ok=True)
-        
         category_widgets = []
         
         for widget_name in category_info['widgets']:
-            widget_info = fetch_widget_info(widget_name)
+            widget_info = fetch_widget_info(
+                widget_name, offline=offline, parser=parser, limiter=fetch_limiter
+            )
             
             if widget_info:
                 # 翻译描述
-                translated_desc = translate_text(widget_info['description'])
+                translated_desc = translate_text(widget_info['description'], offline=offline)
                 
                 # 生成 Markdown
                 md_content = generate_widget_markdown(widget_info, translated_desc)
                 
                 # 保存文件
-                md_file = category_dir / f"{widget_name.lower()}.md"
-                with open(md_file, 'w', encoding='utf-8') as f:
-                    f.write(md_content)
+                category_widgets.append(
+                    save_widget_markdown(output_path, category_id, widget_name, md_content)
+                )
                 
                 print(f"  ✅ {widget_name}")
-                
-                category_widgets.append({
-                    "name": widget_name,
-                    "file": f"{category_id}/{widget_name.lower()}.md"
-                })
-                
-                # 避免请求过快
-                time.sleep(0.5)
         
         all_widgets.append({
             "category_id": category_id,
@@ -296,36 +371,29 @@ def crawl_all_widgets(output_dir: str = "../docs/widgets"):
             "widgets": category_widgets
         })
     
-    # 保存索引文件
-    index_file = output_path / "index.json"
-    with open(index_file, 'w', encoding='utf-8') as f:
-        json.dump(all_widgets, f, ensure_ascii=False, indent=2)
-    
-    # 生成目录页
-    generate_widgets_index(output_path, all_widgets)
+    save_widgets_index(output_path, all_widgets)
     
     print(f"\n完成! 共处理 {sum(len(cat['widgets']) for cat in all_widgets)} 个 Widget")
+    get_output_writer().report()
+    get_cache().report()
+    get_translation_memory().report()
+    get_page_cache().report()
 
 
-def generate_widgets_index(output_path: Path, all_widgets: List[Dict]):
-    """生成 Widget 目录首页"""
-    md = """# Flutter Widget 目录
+# Widget 目录页模板
+WIDGETS_INDEX_HEADER = Template("""# Flutter Widget 目录
 
 Flutter 提供了丰富的 Widget 组件库，以下是按功能分类的 Widget 列表。
 
 ## Widget 分类
 
-"""
-    
-    for category in all_widgets:
-        md += f"### {category['category_name']}\n\n"
-        md += "| Widget | 说明 |\n"
-        md += "|--------|------|\n"
-        for widget in category['widgets']:
-            md += f"| [{widget['name']}](./{widget['file']}) | - |\n"
-        md += "\n"
-    
-    md += """
+""")
+
+CATEGORY_TABLE_HEADER = Template("### {category_name}\n\n| Widget | 说明 |\n|--------|------|\n")
+
+WIDGET_ROW = Template("| [{name}](./{file}) | - |\n")
+
+WIDGETS_INDEX_FOOTER = Template("""
 ## 如何使用
 
 每个 Widget 文档包含：
@@ -339,28 +407,62 @@ Flutter 提供了丰富的 Widget 组件库，以下是按功能分类的 Widget
 ## 贡献
 
 如果发现文档错误或想要补充内容，欢迎提交 PR。
-"""
+""")
+
+
+def generate_widgets_index(output_path: Path, all_widgets: List[Dict]):
+    """生成 Widget 目录首页"""
+    doc = Document()
+    doc.render(WIDGETS_INDEX_HEADER)
+    
+    for category in all_widgets:
+        doc.render(CATEGORY_TABLE_HEADER, category_name=category['category_name'])
+        for widget in category['widgets']:
+            doc.render(WIDGET_ROW, name=widget['name'], file=widget['file'])
+        doc.write("\n")
     
-    index_file = output_path / "index.md"
-    with open(index_file, 'w', encoding='utf-8') as f:
-        f.write(md)
+    doc.render(WIDGETS_INDEX_FOOTER)
+    get_output_writer().write_text(output_path / "index.md", doc.getvalue())
 
 
 if __name__ == "__main__":
+    # 作为脚本运行时模块名是 __main__，pipeline 中的 from crawler import ... 会再加载一份模块，
+    # 翻译记忆等全局状态各有一份。先把当前模块登记为 crawler，让它们共用同一份。
+    sys.modules.setdefault("crawler", sys.modules[__name__])
+
     import argparse
     
     parser = argparse.ArgumentParser(description="Flutter Widget 爬虫")
     parser.add_argument("--output", "-o", default="../docs/widgets", help="输出目录")
     parser.add_argument("--category", "-c", help="只爬取指定分类")
     parser.add_argument("--widget", "-w", help="只爬取指定 Widget")
+    parser.add_argument("--sequential", action="store_true", help="逐个处理，不使用并行流水线")
+    parser.add_argument("--refresh-index", action="store_true", help="从 index.json 重建 Widget 库索引")
+    parser.add_argument("--offline", action="store_true", help="离线模式：只从页面缓存重新解析和生成文档")
+    parser.add_argument("--page-ttl", type=float, default=7, help="页面缓存有效期（天）")
+    parser.add_argument("--parser", choices=list(PARSERS), default=DEFAULT_PARSER, help="页面解析后端")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="下载阶段线程数")
+    parser.add_argument("--parse-workers", type=int, default=4, help="解析阶段进程数")
+    parser.add_argument("--translate-workers", type=int, default=4, help="翻译阶段线程数")
+    parser.add_argument("--fetch-rate", type=float, default=10.0, help="每秒最多请求的页面数")
+    parser.add_argument("--translate-rate", type=float, default=2.0, help="每秒最多发起的翻译请求数")
+    parser.add_argument("--queue-size", type=int, default=16, help="阶段之间队列的容量")
+    parser.add_argument("--metrics-dir", default=str(DEFAULT_METRICS_DIR), help="运行指标的输出目录")
     
     args = parser.parse_args()
     
+    get_metrics().name = "widget_crawler"
+    get_page_cache().ttl_days = args.page_ttl
+    
+    # 库索引过期时自动重建（离线模式下只使用已有索引）
+    if not args.offline:
+        get_library_index().ensure_fresh(FLUTTER_API_BASE, force=args.refresh_index)
+    
     if args.widget:
         # 爬取单个 Widget
-        info = fetch_widget_info(args.widget)
+        info = fetch_widget_info(args.widget, offline=args.offline, parser=args.parser)
         if info:
-            translated = translate_text(info['description'])
+            translated = translate_text(info['description'], offline=args.offline)
             md = generate_widget_markdown(info, translated)
             print(md)
     elif args.category:
@@ -368,12 +470,32 @@ if __name__ == "__main__":
         if args.category in WIDGET_CATEGORIES:
             print(f"爬取分类: {WIDGET_CATEGORIES[args.category]['name']}")
             for widget in WIDGET_CATEGORIES[args.category]['widgets']:
-                info = fetch_widget_info(widget)
+                info = fetch_widget_info(widget, offline=args.offline, parser=args.parser)
                 if info:
                     print(f"✅ {widget}")
         else:
             print(f"未知分类: {args.category}")
             print(f"可用分类: {', '.join(WIDGET_CATEGORIES.keys())}")
+    elif args.sequential:
+        # 逐个爬取所有
+        crawl_all_widgets(args.output, offline=args.offline, parser=args.parser)
     else:
-        # 爬取所有
-        crawl_all_widgets(args.output)
+        # 使用流水线并行爬取所有
+        from pipeline import PipelineConfig, crawl_all_widgets_parallel
+        crawl_all_widgets_parallel(args.output, PipelineConfig(
+            fetch_workers=args.fetch_workers,
+            parse_workers=args.parse_workers,
+            translate_workers=args.translate_workers,
+            fetch_rate=args.fetch_rate,
+            translate_rate=args.translate_rate,
+            queue_size=args.queue_size,
+            offline=args.offline,
+            parser=args.parser,
+        ))
+    
+    get_library_index().save()
+    
+    metrics = get_metrics()
+    metrics.report()
+    json_path, prom_path = metrics.export(args.metrics_dir)
+    print(f"运行指标已写入: {json_path}, {prom_path}")
@@ -0,0 +1,159 @@
+"""
+Widget 类名 → 所在库的索引
+
+api.flutter.dev 的类页面地址为 {库}/{类名}-class.html。没有索引时只能依次尝试
+widgets、material、cupertino 等库，每次未命中都是一次完整的请求。
+
+索引来源：
+1. api.flutter.dev 的 index.json（dartdoc 生成的全站搜索数据）
+2. 之前成功获取过的 Widget（按库探测成功后记录下来）
+
+所有库都返回 404 的类名连同时间记录在 missing 中，MISSING_TTL_DAYS 天内不再探测，
+重建索引时清空。
+
+索引保存在 scripts/.cache/widget_library_index.json，超过 INDEX_MAX_AGE_DAYS 天
+自动从 index.json 重建，也可以通过 crawler.py --refresh-index 强制重建。
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from common import CACHE_DIR, transport
+
+DEFAULT_INDEX_PATH = CACHE_DIR / "widget_library_index.json"
+
+# 索引超过这个天数视为过期
+INDEX_MAX_AGE_DAYS = 30
+
+# 所有库都找不到的类在这个天数内不再重新探测
+MISSING_TTL_DAYS = 7
+
+# 同名类出现在多个库时的优先顺序（与探测顺序一致）
+LIBRARY_PRIORITY = ["widgets", "material", "cupertino", "painting", "rendering"]
+
+CLASS_HREF_PATTERN = re.compile(r'^([A-Za-z0-9_]+)/([A-Za-z0-9_$]+)-class\.html$')
+
+
+def library_rank(library: str) -> int:
+    """库的优先级，数字越小越优先"""
+    if library in LIBRARY_PRIORITY:
+        return LIBRARY_PRIORITY.index(library)
+    return len(LIBRARY_PRIORITY)
+
+
+class LibraryIndex:
+    """类名到库名的映射，线程安全"""
+
+    def __init__(self, path: Path = DEFAULT_INDEX_PATH):
+        self.path = Path(path)
+        self.built_at = 0.0
+        self.classes: Dict[str, str] = {}
+        # 所有库都返回 404 的类名 → 记录时间
+        self.missing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.built_at = data.get("built_at", 0.0)
+                self.classes = data.get("classes", {})
+                self.missing = data.get("missing", {})
+            except (OSError, ValueError) as e:
+                print(f"读取库索引失败，将重新构建: {e}")
+
+    def is_stale(self, max_age_days: float = INDEX_MAX_AGE_DAYS) -> bool:
+        """索引不存在或超过 max_age_days 天未从 index.json 重建"""
+        return time.time() - self.built_at > max_age_days * 86400
+
+    def lookup(self, class_name: str) -> Optional[str]:
+        with self._lock:
+            return self.classes.get(class_name)
+
+    def is_missing(self, class_name: str, ttl_days: float = MISSING_TTL_DAYS) -> bool:
+        """类在 ttl_days 天内确认过所有库中都不存在"""
+        with self._lock:
+            checked_at = self.missing.get(class_name)
+        return checked_at is not None and time.time() - checked_at <= ttl_days * 86400
+
+    def record(self, class_name: str, library: str):
+        """记录一次成功的获取结果"""
+        with self._lock:
+            if self.classes.get(class_name) != library:
+                self.classes[class_name] = library
+                self._dirty = True
+            if self.missing.pop(class_name, None) is not None:
+                self._dirty = True
+
+    def record_missing(self, class_name: str):
+        """记录所有库都返回 404 的类"""
+        with self._lock:
+            self.missing[class_name] = time.time()
+            self._dirty = True
+
+    def refresh(self, api_base: str) -> int:
+        """从 api.flutter.dev 的 index.json 重建索引，返回类的数量"""
+        print("正在构建 Widget 库索引...")
+        response = transport.get(f"{api_base}/index.json", timeout=60)
+        response.raise_for_status()
+
+        classes: Dict[str, str] = {}
+        for entry in response.json():
+            match = CLASS_HREF_PATTERN.match(entry.get("href", ""))
+            if not match:
+                continue
+            library, class_name = match.groups()
+            current = classes.get(class_name)
+            if current is None or library_rank(library) < library_rank(current):
+                classes[class_name] = library
+
+        with self._lock:
+            self.classes = classes
+            # 重建后重新探测之前没找到的类
+            self.missing = {}
+            self.built_at = time.time()
+            self._dirty = True
+        print(f"  ✅ 索引包含 {len(classes)} 个类")
+        return len(classes)
+
+    def ensure_fresh(self, api_base: str, force: bool = False):
+        """索引过期或 force 时重建；重建失败时继续使用已有索引和探测"""
+        if not force and not self.is_stale():
+            return
+        try:
+            self.refresh(api_base)
+            self.save()
+        except Exception as e:
+            print(f"  构建库索引失败，将按库依次探测: {e}")
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {"built_at": self.built_at, "classes": self.classes, "missing": self.missing},
+                    f, ensure_ascii=False, indent=2, sort_keys=True
+                )
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+_index: Optional[LibraryIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_library_index() -> LibraryIndex:
+    """获取进程内共享的库索引"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LibraryIndex()
+        return _index
@@ -0,0 +1,276 @@
+"""
+Widget 页面解析后端
+
+parse_widget_page 只用到 api.flutter.dev 类页面中的几个区域：
+section.desc、Inheritance 对应的 dd、constructor-summary-list 和 #instance-properties。
+
+提供两个后端，输出的字典完全一致：
+- html.parser：BeautifulSoup + 纯 Python 的 html.parser（原实现，作为参照）
+- lxml：直接用 lxml.html 构建树，再用 XPath 定位上述区域（默认，需要安装 lxml）
+
+命令行用法（默认使用页面缓存中保存的页面，也可以用 --pages 指定 .html 文件目录）：
+    python parsers.py parity
+    python parsers.py bench --repeat 5
+    python parsers.py parity --pages fixtures/pages
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+def parse_with_html_parser(content: bytes) -> Dict:
+    """BeautifulSoup + html.parser 后端"""
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # 获取描述
+    desc_section = soup.find('section', {'class': 'desc'})
+    description = ""
+    if desc_section:
+        paragraphs = desc_section.find_all('p')
+        description = '\n\n'.join([p.get_text(strip=True) for p in paragraphs[:3]])
+
+    # 获取继承关系
+    inheritance = []
+    inheritance_section = soup.find('dt', string='Inheritance')
+    if inheritance_section:
+        inheritance_content = inheritance_section.find_next_sibling('dd')
+        if inheritance_content:
+            links = inheritance_content.find_all('a')
+            inheritance = [link.get_text(strip=True) for link in links]
+
+    # 获取构造函数
+    constructors = []
+    constructors_section = soup.find('section', {'class': 'summary'})
+    if constructors_section:
+        constructor_list = constructors_section.find('dl', {'class': 'constructor-summary-list'})
+        if constructor_list:
+            items = constructor_list.find_all('dt')
+            for item in items[:5]:
+                sig = item.get_text(strip=True)
+                constructors.append(sig)
+
+    # 获取属性
+    properties = []
+    props_section = soup.find('section', {'id': 'instance-properties'})
+    if props_section:
+        prop_list = props_section.find_all('dt')
+        for prop in prop_list[:10]:
+            prop_name = prop.find('span', {'class': 'name'})
+            if prop_name:
+                properties.append(prop_name.get_text(strip=True))
+
+    return {
+        "description": description,
+        "inheritance": inheritance,
+        "constructors": constructors,
+        "properties": properties
+    }
+
+
+def _has_class(name: str) -> str:
+    """XPath 条件：class 属性中包含指定的类名（与 BeautifulSoup 的 class 匹配规则一致）"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# BeautifulSoup 的 get_text 不包含这些元素中的文本（Script / Stylesheet / TemplateString）
+_NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+def _strings(element) -> Iterator[str]:
+    """按文档顺序产出元素中的文本，跳过注释和 _NON_TEXT_TAGS 中的元素，但保留它们之后的文本"""
+    if element.text:
+        yield element.text
+    for child in element:
+        # 注释和处理指令的 tag 不是字符串
+        if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+            yield from _strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def _text(element) -> str:
+    """等价于 BeautifulSoup 的 get_text(strip=True)：逐段去除首尾空白后直接拼接"""
+    return ''.join(part.strip() for part in _strings(element))
+
+
+def _string(element) -> Optional[str]:
+    """等价于 BeautifulSoup 的 Tag.string：只有一个子节点时返回其文本"""
+    children = list(element)
+    if not children:
+        return element.text
+    if len(children) == 1 and not element.text and not children[0].tail:
+        child = children[0]
+        if isinstance(child.tag, str):
+            return _string(child)
+    return None
+
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_-]+)', re.I)
+
+
+def _decode(content: bytes) -> str:
+    """按页面声明的编码解码，未声明时使用 UTF-8"""
+    match = _META_CHARSET.search(content[:2048])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+_DESC_XPATH = f"//section[{_has_class('desc')}]"
+_SUMMARY_XPATH = f"//section[{_has_class('summary')}]"
+_CONSTRUCTOR_LIST_XPATH = f".//dl[{_has_class('constructor-summary-list')}]"
+_PROPS_XPATH = "//section[@id='instance-properties']"
+_PROP_NAME_XPATH = f".//span[{_has_class('name')}]"
+
+
+def parse_with_lxml(content: bytes) -> Dict:
+    """lxml 后端：只用 XPath 访问需要的区域"""
+    root = lxml.html.document_fromstring(_decode(content))
+
+    description = ""
+    desc_sections = root.xpath(_DESC_XPATH)
+    if desc_sections:
+        paragraphs = desc_sections[0].xpath(".//p")
+        description = '\n\n'.join([_text(p) for p in paragraphs[:3]])
+
+    inheritance = []
+    for dt in root.iter('dt'):
+        if _string(dt) == 'Inheritance':
+            dd = next(dt.itersiblings('dd'), None)
+            if dd is not None:
+                inheritance = [_text(link) for link in dd.iter('a')]
+            break
+
+    constructors = []
+    summary_sections = root.xpath(_SUMMARY_XPATH)
+    if summary_sections:
+        constructor_lists = summary_sections[0].xpath(_CONSTRUCTOR_LIST_XPATH)
+        if constructor_lists:
+            items = constructor_lists[0].xpath(".//dt")
+            constructors = [_text(item) for item in items[:5]]
+
+    properties = []
+    props_sections = root.xpath(_PROPS_XPATH)
+    if props_sections:
+        for prop in props_sections[0].xpath(".//dt")[:10]:
+            names = prop.xpath(_PROP_NAME_XPATH)
+            if names:
+                properties.append(_text(names[0]))
+
+    return {
+        "description": description,
+        "inheritance": inheritance,
+        "constructors": constructors,
+        "properties": properties
+    }
+
+
+PARSERS: Dict[str, Callable[[bytes], Dict]] = {
+    "html.parser": parse_with_html_parser,
+}
+if HAS_LXML:
+    PARSERS["lxml"] = parse_with_lxml
+
+DEFAULT_PARSER = "lxml" if HAS_LXML else "html.parser"
+
+
+def get_parser(name: Optional[str] = None) -> Callable[[bytes], Dict]:
+    """按名称获取解析后端，未指定时使用 DEFAULT_PARSER"""
+    name = name or DEFAULT_PARSER
+    if name not in PARSERS:
+        raise ValueError(f"未知的解析后端: {name}，可用: {', '.join(PARSERS)}")
+    return PARSERS[name]
+
+
+def load_pages(pages_dir: Optional[str] = None) -> Iterator[Tuple[str, bytes]]:
+    """读取用于对比和测速的页面：指定目录下的 .html 文件，或页面缓存中的全部页面"""
+    if pages_dir:
+        for path in sorted(Path(pages_dir).glob("*.html")):
+            yield path.name, path.read_bytes()
+        return
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from common.page_cache import get_page_cache
+    cache = get_page_cache()
+    for meta in sorted(cache.entries(), key=lambda m: m["url"]):
+        content = cache.get(meta["url"], allow_stale=True)
+        if content is not None:
+            yield meta["url"], content
+
+
+def check_parity(pages: List[Tuple[str, bytes]], reference: str = "html.parser") -> int:
+    """用各个后端解析同一批页面并与参照后端对比，返回不一致的页面数"""
+    expected_parser = get_parser(reference)
+    mismatches = 0
+    for name, content in pages:
+        expected = expected_parser(content)
+        for backend, parser in PARSERS.items():
+            if backend == reference:
+                continue
+            actual = parser(content)
+            if actual != expected:
+                mismatches += 1
+                print(f"❌ {backend} 与 {reference} 不一致: {name}")
+                for key in expected:
+                    if actual.get(key) != expected[key]:
+                        print(f"    {key}: {expected[key]!r}")
+                        print(f"    {' ' * len(key)}  {actual.get(key)!r}")
+    return mismatches
+
+
+def benchmark(pages: List[Tuple[str, bytes]], repeat: int = 3) -> Dict[str, float]:
+    """测量各后端每秒解析的页面数"""
+    results = {}
+    for backend, parser in PARSERS.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, content in pages:
+                parser(content)
+        elapsed = time.perf_counter() - start
+        results[backend] = len(pages) * repeat / elapsed if elapsed else 0.0
+    return results
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Widget 页面解析后端对比")
+    parser.add_argument("command", choices=["parity", "bench"], help="parity 对比输出，bench 测速")
+    parser.add_argument("--pages", help="保存的 .html 页面目录（默认使用页面缓存）")
+    parser.add_argument("--repeat", type=int, default=3, help="测速时每个页面解析的次数")
+    args = parser.parse_args()
+
+    pages = list(load_pages(args.pages))
+    if not pages:
+        print("没有可用的页面，请先运行 crawler.py 填充页面缓存或指定 --pages")
+        sys.exit(1)
+
+    if args.command == "parity":
+        mismatches = check_parity(pages)
+        if mismatches:
+            print(f"\n{mismatches} 个页面输出不一致")
+            sys.exit(1)
+        print(f"✅ {len(pages)} 个页面在 {', '.join(PARSERS)} 后端下输出一致")
+    else:
+        print(f"解析 {len(pages)} 个页面 × {args.repeat} 次：")
+        baseline = None
+        for backend, pages_per_second in benchmark(pages, args.repeat).items():
+            baseline = baseline or pages_per_second
+            print(f"  {backend:<12} {pages_per_second:8.1f} 页/秒  ({pages_per_second / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Widget 并行爬取流水线
+
+把 crawl_all_widgets 的逐个处理拆成四个阶段，阶段之间用有界队列连接：
+
+    下载（I/O 线程池）→ 解析（CPU 进程池）→ 翻译（限速线程池）→ 写入（单线程）
+
+每个阶段的并发数可以单独配置，队列满时上游阶段会阻塞等待，内存占用有上限。
+最终生成的文件和 index.json 与逐个处理的结果一致。
+
+使用方法（爬取全部 Widget 时默认使用流水线，--sequential 切换回逐个处理）：
+    python crawler.py
+    python crawler.py --fetch-workers 8 --parse-workers 4 --translate-workers 4 --translate-rate 2
+"""
+
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from crawler import (
+    WIDGET_CATEGORIES,
+    fetch_widget_page,
+    parse_widget_page,
+    translate_text,
+    generate_widget_markdown,
+    save_widget_markdown,
+    save_widgets_index,
+    get_cache,
+    get_page_cache,
+    get_translation_memory,
+)
+from common.metrics import get_metrics
+from common.output import get_output_writer
+from common.rate_limit import RateLimiter
+
+
+@dataclass
+class PipelineConfig:
+    """各阶段的并发配置"""
+    fetch_workers: int = 8
+    parse_workers: int = 4
+    translate_workers: int = 4
+    # 每秒最多发起的页面请求数和翻译请求数
+    fetch_rate: float = 10.0
+    translate_rate: float = 2.0
+    # 阶段之间队列的容量
+    queue_size: int = 16
+    # 只使用页面缓存和翻译缓存，不发起网络请求
+    offline: bool = False
+    # 页面解析后端，None 表示 parsers.DEFAULT_PARSER
+    parser: Optional[str] = None
+
+
+@dataclass
+class WidgetJob:
+    """在流水线中传递的任务"""
+    category_id: str
+    widget_name: str
+    library: str = ""
+    url: str = ""
+    content: bytes = b""
+    info: Optional[Dict] = None
+    translated_desc: str = ""
+
+
+# 通知下游阶段结束的哨兵
+_DONE = object()
+
+
+class Stage:
+    """一个流水线阶段：workers 个线程从 inbox 取任务，处理结果放入 outbox
+
+    处理函数返回 None 表示丢弃该任务。所有线程结束后向下游发送哨兵。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[WidgetJob], Optional[WidgetJob]],
+        inbox: queue.Queue,
+        outbox: Optional[queue.Queue],
+        workers: int,
+        downstream_workers: int = 1,
+    ):
+        self.name = name
+        self.func = func
+        self.inbox = inbox
+        self.outbox = outbox
+        self.downstream_workers = downstream_workers
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def join(self):
+        for thread in self.threads:
+            thread.join()
+
+    def _run(self):
+        while True:
+            job = self.inbox.get()
+            if job is _DONE:
+                break
+            try:
+                result = self.func(job)
+            except Exception as e:
+                print(f"  {self.name}失败: {job.widget_name} - {e}")
+                result = None
+            if result is not None and self.outbox is not None:
+                self.outbox.put(result)
+
+        with self._lock:
+            self._remaining -= 1
+            last = self._remaining == 0
+        if last and self.outbox is not None:
+            for _ in range(self.downstream_workers):
+                self.outbox.put(_DONE)
+
+
+def crawl_all_widgets_parallel(output_dir: str = "../docs/widgets", config: PipelineConfig = None):
+    """使用流水线爬取所有 Widget 并生成文档"""
+    config = config or PipelineConfig()
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    fetch_limiter = RateLimiter(config.fetch_rate)
+    translate_limiter = RateLimiter(config.translate_rate)
+    results: Dict[str, Dict[str, Dict]] = {category_id: {} for category_id in WIDGET_CATEGORIES}
+
+    fetch_queue: queue.Queue = queue.Queue()
+    parse_queue: queue.Queue = queue.Queue(config.queue_size)
+    translate_queue: queue.Queue = queue.Queue(config.queue_size)
+    write_queue: queue.Queue = queue.Queue(config.queue_size)
+
+    with ProcessPoolExecutor(max_workers=config.parse_workers) as parse_pool:
+
+        def fetch(job: WidgetJob) -> Optional[WidgetJob]:
+            page = fetch_widget_page(
+                job.widget_name, offline=config.offline, limiter=fetch_limiter
+            )
+            if page is None:
+                return None
+            job.library, job.url, job.content = page
+            return job
+
+        def parse(job: WidgetJob) -> WidgetJob:
+            # HTML 解析是 CPU 密集型，放到进程池中绕开 GIL
+            # 子进程中的指标不会传回，这里记录的耗时包含在进程池中排队的时间
+            with get_metrics().timed("parse", urlsplit(job.url).netloc):
+                job.info = parse_pool.submit(
+                    parse_widget_page, job.widget_name, job.library, job.url, job.content, config.parser
+                ).result()
+            job.content = b""
+            return job
+
+        def translate(job: WidgetJob) -> WidgetJob:
+            job.translated_desc = translate_text(
+                job.info['description'], limiter=translate_limiter, offline=config.offline
+            )
+            return job
+
+        def write(job: WidgetJob) -> None:
+            md_content = generate_widget_markdown(job.info, job.translated_desc)
+            results[job.category_id][job.widget_name] = save_widget_markdown(
+                output_path, job.category_id, job.widget_name, md_content
+            )
+            print(f"  ✅ {job.widget_name}")
+            return None
+
+        stages = [
+            Stage("下载", fetch, fetch_queue, parse_queue, config.fetch_workers, config.parse_workers),
+            Stage("解析", parse, parse_queue, translate_queue, config.parse_workers, config.translate_workers),
+            Stage("翻译", translate, translate_queue, write_queue, config.translate_workers, 1),
+            Stage("写入", write, write_queue, None, 1),
+        ]
+        for stage in stages:
+            stage.start()
+
+        for category_id, category_info in WIDGET_CATEGORIES.items():
+            for widget_name in category_info['widgets']:
+                fetch_queue.put(WidgetJob(category_id, widget_name))
+        for _ in range(config.fetch_workers):
+            fetch_queue.put(_DONE)
+
+        for stage in stages:
+            stage.join()
+
+    # 按 WIDGET_CATEGORIES 的顺序生成索引，与逐个处理的结果一致
+    all_widgets: List[Dict] = []
+    for category_id, category_info in WIDGET_CATEGORIES.items():
+        category_results = results[category_id]
+        all_widgets.append({
+            "category_id": category_id,
+            "category_name": category_info['name'],
+            "widgets": [
+                category_results[widget_name]
+                for widget_name in category_info['widgets']
+                if widget_name in category_results
+            ]
+        })
+
+    save_widgets_index(output_path, all_widgets)
+
+    print(f"\n完成! 共处理 {sum(len(cat['widgets']) for cat in all_widgets)} 个 Widget")
+    get_output_writer().report()
+    get_cache().report()
+    get_translation_memory().report()
+    get_page_cache().report()